@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import os
+import supervisor
+from synthesis_stats import parse_stat
+
+BEGIN_MARKER = "@@BATCH_BEGIN"
+END_MARKER = "@@BATCH_END"
+
+class BatchSynthesizer:
+    """Synthesize many designs in one Yosys session per chunk
+
+    Every design is read, synthesized and written between `design -reset`
+    commands, bracketed by `log` markers so the combined stdout can be
+    split back into one log per design. Yosys stops at the first error, so
+    when a chunk fails the design that was in flight is marked failed and
+    the designs after it are resubmitted as a new chunk.
+    """
+
+    def __init__(self, synthesis_dir="synthesis_results", chunk_size=16):
+        self.synthesis_dir = synthesis_dir
+        self.chunk_size = max(1, chunk_size)
+        os.makedirs(self.synthesis_dir, exist_ok=True)
+
+    def json_path(self, name):
+        return os.path.join(self.synthesis_dir, f"{name}.json")
+
+    def build_script(self, designs):
+        """Build one Yosys script for a list of (name, source_path, top)
+
+        source_path may also be a list: the design's file followed by the
+        files it instantiates modules from, which are read with it and
+        flattened into the top, as in VerilogVerifier.synthesis_script.
+        """
+        lines = []
+        for name, source_path, top in designs:
+            sources = [source_path] if isinstance(source_path, str) else source_path
+            top_arg = f"-top {top}" if top else "-auto-top"
+            flatten = " -flatten" if len(sources) > 1 else ""
+            lines.append("design -reset")
+            lines.append(f"log {BEGIN_MARKER} {name}")
+            lines.extend(f"read_verilog {path}" for path in sources)
+            lines.append(f"synth {top_arg}{flatten}")
+            lines.append(f"write_json {self.json_path(name)}")
+            lines.append("stat")
+            lines.append(f"log {END_MARKER} {name}")
+        return "; ".join(lines)
+
+    def split_output(self, stdout):
+        """Split combined Yosys stdout into {name: (log_text, finished)}"""
+        sections = {}
+        name = None
+        lines = []
+        for line in stdout.splitlines(keepends=True):
+            words = line.split()
+            if len(words) == 2 and words[0] == BEGIN_MARKER:
+                name = words[1]
+                lines = []
+            elif len(words) == 2 and words[0] == END_MARKER and words[1] == name:
+                sections[name] = ("".join(lines), True)
+                name = None
+            elif name is not None and END_MARKER not in line:
+                # Skip Yosys echoing the marker `log` commands themselves
+                lines.append(line)
+        if name is not None:
+            sections[name] = ("".join(lines), False)
+        return sections
+
+    def run(self, designs):
+        """Synthesize (name, source_path, top) designs chunk by chunk
+
+        Returns {name: {'ok', 'log', 'stat', 'json'}} for every design.
+        """
+        results = {}
+        pending = list(designs)
+        while pending:
+            chunk = pending[:self.chunk_size]
+            pending = pending[self.chunk_size:]
+            leftover = self._run_chunk(chunk, results)
+            pending = leftover + pending
+        return results
+
+    def _run_chunk(self, chunk, results):
+        script = self.build_script(chunk)
+        # The wall-clock budget of one design, for each design in the chunk
+        timeout = supervisor.limits_for("synthesize")["timeout"]
+        try:
+            result = supervisor.run_tool(['yosys', '-p', script], "synthesize_batch",
+                                         f"{len(chunk)} designs",
+                                         timeout=timeout and timeout * len(chunk))
+        except Exception as e:
+            for name, _, _ in chunk:
+                results[name] = {'ok': False, 'log': str(e), 'stat': None,
+                                 'json': None}
+            return []
+        if result.status == supervisor.CANCELLED:
+            for name, _, _ in chunk:
+                results[name] = {'ok': False, 'log': result.stdout, 'stat': None,
+                                 'json': None, 'status': result.status}
+            return []
+
+        sections = self.split_output(result.stdout)
+        leftover = []
+        for name, source_path, top in chunk:
+            if name not in sections:
+                if result.returncode == 0:
+                    results[name] = {'ok': False, 'log': result.stdout,
+                                     'stat': None, 'json': None}
+                else:
+                    leftover.append((name, source_path, top))
+                continue
+
+            log_text, finished = sections[name]
+            if finished:
+                results[name] = {'ok': True, 'log': log_text,
+                                 'stat': parse_stat(log_text),
+                                 'json': self.json_path(name)}
+            else:
+                results[name] = {'ok': False,
+                                 'log': log_text + result.stderr,
+                                 'stat': None, 'json': None,
+                                 'status': result.status}
+
+        if result.returncode != 0 and len(leftover) == len(chunk):
+            # Failed before the first marker; nothing to attribute it to
+            if len(chunk) == 1:
+                name = chunk[0][0]
+                results[name] = {'ok': False,
+                                 'log': result.stdout + result.stderr,
+                                 'stat': None, 'json': None,
+                                 'status': result.status}
+                return []
+            half = len(chunk) // 2
+            return (self._run_chunk(chunk[:half], results) +
+                    self._run_chunk(chunk[half:], results))
+        return leftover
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import itertools
+import contextlib
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+STAGES = ("generate", "parse_ports", "testbench", "compile", "simulate",
+          "synthesize", "llm")
+TOOL_STAGES = {"compile": "iverilog", "simulate": "vvp", "synthesize": "yosys"}
+
+# Stand-ins for the EDA tools, so the suite also runs where they are missing.
+# They do the file I/O the real tools would and exit quickly.
+FAKE_TOOLS = {
+    "iverilog": r'''
+import sys
+args = sys.argv[1:]
+out = args[args.index('-o') + 1] if '-o' in args else 'a.out'
+sources = [a for a in args if a.endswith('.v')]
+for path in sources:
+    open(path).read()
+if '-t' in args and args[args.index('-t') + 1] == 'null':
+    sys.exit(0)
+with open(out, 'w') as f:
+    f.write('#! fake vvp image\n' + '\n'.join(sources) + '\n')
+''',
+    "vvp": r'''
+import re, sys
+sources = open(sys.argv[1]).read().split('\n')[1:]
+for path in sources:
+    if not path.endswith('_tb.v'):
+        continue
+    text = open(path).read()
+    depth = re.search(r'parameter DEPTH = (\d+)', text)
+    report = re.search(r'\$fopen\("([^"]+)"', text)
+    if depth and report:
+        with open(report.group(1), 'w') as f:
+            f.write(f"DONE {depth.group(1)} 0\n")
+        print(f"CHECKED {depth.group(1)} MISMATCHES 0")
+    else:
+        print("Time=0 data_in=0 data_out=0")
+''',
+    "yosys": r'''
+import re, sys, json
+script = sys.argv[sys.argv.index('-p') + 1] if '-p' in sys.argv else sys.stdin.read()
+print("Yosys (fake)")
+top = None
+for command in re.split(r'[;\n]', script):
+    words = command.split()
+    if not words:
+        continue
+    print(f"-- Running command `{command.strip()}' --")
+    if words[0] == 'read_verilog':
+        match = re.search(r'module\s+(\w+)', open(words[-1]).read())
+        top = match.group(1) if match else top
+    elif words[0] == 'synth' and '-top' in words:
+        top = words[words.index('-top') + 1]
+    elif words[0] == 'write_json':
+        with open(words[-1], 'w') as f:
+            json.dump({"creator": "fake", "modules": {top: {
+                "attributes": {"top": 1}, "ports": {}, "cells": {}, "netnames": {}}}}, f)
+    elif words[0] == 'log':
+        print(' '.join(words[1:]))
+    elif words[0] == 'stat':
+        print(f"\n=== {top} ===\n\n   Number of wires:                  3\n"
+              f"   Number of wire bits:             17\n"
+              f"   Number of cells:                  0\n")
+print("End of script.")
+''',
+}
+
+def write_fake_tools(bin_dir):
+    """Write the stand-in tool executables into bin_dir"""
+    os.makedirs(bin_dir, exist_ok=True)
+    for name, body in FAKE_TOOLS.items():
+        path = os.path.join(bin_dir, name)
+        with open(path, 'w') as f:
+            f.write(f"#!{sys.executable}\n{body}")
+        os.chmod(path, 0o755)
+    return bin_dir
+
+def _snapshot(root):
+    state = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+def _quiet(func, *args):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return func(*args)
+
+def _designs(workdir):
+    return sorted(f for f in os.listdir(os.path.join(workdir, "verilog_files"))
+                  if f.endswith(".v"))
+
+def stage_generate(size, widths):
+    """Write `size` register variants, cycling through every configuration"""
+    from verilog_generator import VerilogGenerator
+    generator = _quiet(VerilogGenerator)
+    configurations = itertools.cycle(itertools.product(widths, (True, False), (True, False)))
+    for i, (width, use_reset, use_enable) in zip(range(size), configurations):
+        module_name, code = generator.generate_register_variant(width, use_reset, use_enable)
+        unique = f"{module_name}_v{i}"
+        with open(os.path.join(generator.output_dir, f"{unique}.v"), 'w') as f:
+            f.write(code.replace(module_name, unique, 1))
+    return size
+
+def stage_parse_ports(designs):
+    from verify_all import VerilogVerifier
+    verifier = VerilogVerifier()
+    for vfile in designs:
+        verifier.parse_module_ports(vfile)
+    return len(designs)
+
+def stage_testbench(designs, cycles):
+    from verify_all import VerilogVerifier
+    verifier = VerilogVerifier(cycles=cycles)
+    for vfile in designs:
+        verifier.generate_testbench(vfile)
+        if vfile in verifier.plans:
+            verifier.plans[vfile].write_vectors()
+    return len(designs)
+
+def stage_compile(designs):
+    for vfile in designs:
+        stem = os.path.splitext(vfile)[0]
+        subprocess.run(['iverilog', '-o', os.path.join("synthesis_results", f"{stem}.vvp"),
+                        os.path.join("verilog_files", vfile),
+                        os.path.join("testbenches", f"{stem}_tb.v")],
+                       capture_output=True, text=True)
+    return len(designs)
+
+def stage_simulate(designs):
+    for vfile in designs:
+        stem = os.path.splitext(vfile)[0]
+        subprocess.run(['vvp', os.path.join("synthesis_results", f"{stem}.vvp")],
+                       capture_output=True, text=True)
+    return len(designs)
+
+def stage_synthesize(designs):
+    from verify_all import VerilogVerifier
+    verifier = VerilogVerifier(keep_logs=False)
+    for vfile in designs:
+        _quiet(verifier.run_synthesis, vfile)
+    return len(designs)
+
+def stage_llm(requests, cache_path):
+    """LLM round trips, replayed from a prompt cache when cache_path is set"""
+    from llm_generator import VerilogGenerator
+    from llm_cache import PromptCache
+    cache = PromptCache(cache_path, mode="replay") if cache_path else None
+    generator = VerilogGenerator(cache=cache)
+    for i in range(requests):
+        generator._complete(generator._variation_prompt("8-bit register", i))
+    return requests
+
+def _measure(workdir, func, args):
+    """Run one stage in this (fresh) process and measure it"""
+    os.chdir(workdir)
+    before = _snapshot(workdir)
+    self_start = resource.getrusage(resource.RUSAGE_SELF)
+    children_start = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    items = func(*args)
+    wall = time.perf_counter() - start
+    self_end = resource.getrusage(resource.RUSAGE_SELF)
+    children_end = resource.getrusage(resource.RUSAGE_CHILDREN)
+    after = _snapshot(workdir)
+
+    cpu = ((self_end.ru_utime + self_end.ru_stime) - (self_start.ru_utime + self_start.ru_stime)
+           + (children_end.ru_utime + children_end.ru_stime)
+           - (children_start.ru_utime + children_start.ru_stime))
+    return {
+        'items': items,
+        'wall': wall,
+        'cpu': cpu,
+        'ms_per_item': 1000.0 * wall / items if items else None,
+        'peak_rss_mb': self_end.ru_maxrss / 1024.0,
+        'tool_peak_rss_mb': children_end.ru_maxrss / 1024.0,
+        'files_written': sum(1 for path, state in after.items() if before.get(path) != state),
+    }
+
+class BenchmarkSuite:
+    """Time every stage of the flow over synthetic corpora
+
+    Each corpus size gets a fresh scratch directory that is populated by
+    the generate stage and then used by the later stages. Every stage
+    runs in its own worker process, so peak RSS is that stage's own high
+    water mark; tool_peak_rss_mb is the largest tool process it started.
+    Tool stages only run on the first tool_sample designs.
+    """
+
+    def __init__(self, sizes=(10, 100), widths=(4, 8, 16, 32), tool_sample=20,
+                 cycles=1000, stages=STAGES, llm_requests=0, llm_cache=None,
+                 fake_tools=False, keep_workdir=False):
+        self.sizes = sizes
+        self.widths = widths
+        self.tool_sample = tool_sample
+        self.cycles = cycles
+        self.stages = stages
+        self.llm_requests = llm_requests
+        self.llm_cache = os.path.abspath(llm_cache) if llm_cache else None
+        self.fake_tools = fake_tools
+        self.keep_workdir = keep_workdir
+
+    def _stage_args(self, stage, workdir, size):
+        designs = _designs(workdir) if stage != "generate" else None
+        if stage == "generate":
+            return stage_generate, (size, self.widths)
+        if stage == "parse_ports":
+            return stage_parse_ports, (designs,)
+        if stage == "testbench":
+            return stage_testbench, (designs, self.cycles)
+        if stage == "llm":
+            return stage_llm, (self.llm_requests, self.llm_cache)
+        func = {"compile": stage_compile, "simulate": stage_simulate,
+                "synthesize": stage_synthesize}[stage]
+        return func, (designs[:self.tool_sample],)
+
+    def _skip_reason(self, stage):
+        if stage in TOOL_STAGES and not shutil.which(TOOL_STAGES[stage]):
+            return f"{TOOL_STAGES[stage]} not found (use --fake-tools)"
+        if stage == "llm" and not self.llm_requests:
+            return "no LLM requests requested"
+        return None
+
+    def run_size(self, size):
+        workdir = tempfile.mkdtemp(prefix=f"bench_{size}_")
+        results = {}
+        try:
+            for stage in self.stages:
+                reason = self._skip_reason(stage)
+                if reason:
+                    results[stage] = {'skipped': reason}
+                    self._print_stage(size, stage, results[stage])
+                    continue
+                func, args = self._stage_args(stage, workdir, size)
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    try:
+                        results[stage] = pool.submit(_measure, workdir, func, args).result()
+                    except Exception as e:
+                        results[stage] = {'skipped': f"failed: {e}"}
+                self._print_stage(size, stage, results[stage])
+        finally:
+            if self.keep_workdir:
+                print(f"Work directory kept at {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+        return results
+
+    def _print_stage(self, size, stage, result):
+        if 'skipped' in result:
+            print(f"{size:>7} {stage:<12} skipped: {result['skipped']}")
+            return
+        per_item = f"{result['ms_per_item']:.3f}" if result['ms_per_item'] is not None else "-"
+        print(f"{size:>7} {stage:<12} {result['items']:>7} {result['wall']:>9.3f} "
+              f"{result['cpu']:>9.3f} {per_item:>9} {result['peak_rss_mb']:>8.1f} "
+              f"{result['files_written']:>7}")
+
+    def run(self):
+        previous_path = os.environ.get("PATH", "")
+        fake_dir = None
+        if self.fake_tools:
+            fake_dir = write_fake_tools(tempfile.mkdtemp(prefix="bench_tools_"))
+            os.environ["PATH"] = fake_dir + os.pathsep + previous_path
+        cwd = os.getcwd()
+        try:
+            print(f"{'size':>7} {'stage':<12} {'items':>7} {'wall s':>9} {'cpu s':>9} "
+                  f"{'ms/item':>9} {'rss MB':>8} {'files':>7}")
+            runs = [{'size': size, 'stages': self.run_size(size)} for size in self.sizes]
+        finally:
+            os.chdir(cwd)
+            os.environ["PATH"] = previous_path
+            if fake_dir:
+                shutil.rmtree(fake_dir, ignore_errors=True)
+        return {
+            'meta': {
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'fake_tools': self.fake_tools,
+                'widths': list(self.widths),
+                'tool_sample': self.tool_sample,
+                'cycles': self.cycles,
+            },
+            'runs': runs,
+        }
+
+def compare(results, baseline, threshold=1.25, min_delta=0.05):
+    """Return [(size, stage, baseline_wall, wall, ratio)] for regressed stages
+
+    A stage regresses when its wall time exceeds the baseline by more than
+    threshold (as a ratio) and by more than min_delta seconds.
+    """
+    base = {(run['size'], stage): data for run in baseline['runs']
+            for stage, data in run['stages'].items() if 'wall' in data}
+    regressions = []
+    for run in results['runs']:
+        for stage, data in run['stages'].items():
+            old = base.get((run['size'], stage))
+            if old is None or 'wall' not in data:
+                continue
+            ratio = data['wall'] / old['wall'] if old['wall'] else float('inf')
+            if ratio > threshold and data['wall'] - old['wall'] > min_delta:
+                regressions.append((run['size'], stage, old['wall'], data['wall'], ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generation and verification flow")
+    parser.add_argument('--sizes', default="10,100",
+                        help="comma-separated corpus sizes")
+    parser.add_argument('--widths', default="4,8,16,32",
+                        help="comma-separated register widths to cycle through")
+    parser.add_argument('--stages', default=",".join(STAGES),
+                        help=f"comma-separated subset of {','.join(STAGES)}")
+    parser.add_argument('--tool-sample', type=int, default=20,
+                        help="designs per corpus sent through iverilog/vvp/yosys")
+    parser.add_argument('--cycles', type=int, default=1000,
+                        help="self-checking testbench cycles")
+    parser.add_argument('--llm-requests', type=int, default=0,
+                        help="LLM round trips to time (0 skips the stage)")
+    parser.add_argument('--llm-cache',
+                        help="replay LLM responses from this prompt cache")
+    parser.add_argument('--fake-tools', action='store_true',
+                        help="use stand-in iverilog/vvp/yosys executables")
+    parser.add_argument('--keep-workdir', action='store_true')
+    parser.add_argument('--output', default="benchmark_results.json")
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    stages = tuple(s for s in args.stages.split(",") if s)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    suite = BenchmarkSuite(sizes=[int(s) for s in args.sizes.split(",")],
+                           widths=[int(w) for w in args.widths.split(",")],
+                           tool_sample=args.tool_sample, cycles=args.cycles,
+                           stages=stages, llm_requests=args.llm_requests,
+                           llm_cache=args.llm_cache, fake_tools=args.fake_tools,
+                           keep_workdir=args.keep_workdir)
+    results = suite.run()
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for size, stage, old, new, ratio in regressions:
+            print(f"✗ Regression: {stage} at size {size}: {old:.3f}s -> {new:.3f}s ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print("✓ No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
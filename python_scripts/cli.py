@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import json
+import glob
+import argparse
+import importlib
+import contextlib
+
+_LOADED = time.perf_counter()
+_STARTUP_CPU = time.process_time()
+
+DEFAULT_FILES = os.path.join("verilog_files", "*.v")
+HEAVY_MODULES = ("numpy", "anthropic")
+
+_import_seconds = 0.0
+
+def _load(name):
+    """Import a framework module on first use, timing the import"""
+    global _import_seconds
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_seconds += time.perf_counter() - start
+    return module
+
+def expand(patterns):
+    """Files matching paths or globs, in order and without duplicates
+
+    Returns (files, unmatched patterns).
+    """
+    files = []
+    unmatched = []
+    for pattern in patterns or [DEFAULT_FILES]:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else \
+            [pattern] if os.path.isfile(pattern) else []
+        if not matches:
+            unmatched.append(pattern)
+        files.extend(path for path in matches if path not in files)
+    return files, unmatched
+
+def _jsonable(value):
+    """json.dumps fallback for numpy scalars, sets and other objects"""
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+def _mark(ok):
+    return {True: '✓', False: '✗', None: '-'}[ok]
+
+def cmd_generate(args):
+    if args.source == "template":
+        generator = _load("verilog_generator").VerilogGenerator()
+        variations = generator.generate_variations(num_variations=args.count)
+        results = [{'file': os.path.join(generator.output_dir, v['filename']),
+                    'parameters': v['parameters']} for v in variations]
+    else:
+        spec = args.spec
+        if spec.startswith("@"):
+            with open(spec[1:], 'r') as f:
+                spec = f.read()
+        generator = _load("llm_generator").VerilogGenerator()
+        results = [{'file': v['filename']}
+                   for v in generator.generate_variations(spec, args.count)]
+    lines = [f"{_mark(True)} {r['file']}" for r in results]
+    return results, bool(results), lines
+
+def cmd_lint(args, files):
+    Linter = _load("lint").Linter
+    checked = Linter(args.backend).check_files(files)
+    results = [{'file': path, 'ok': ok, 'messages': messages}
+               for path, (ok, messages) in checked.items()]
+    lines = []
+    for result in results:
+        lines.append(f"{_mark(result['ok'])} {result['file']}")
+        lines.extend(f"  {line}" for line in result['messages'].splitlines())
+    return results, all(r['ok'] for r in results), lines
+
+def _simulate_one(path, cache_dir, cycles, stimulus):
+    verify_file = _load("verify_all").verify_file
+    result = verify_file(os.path.basename(path), cache_dir, synthesize=False,
+                         cycles=cycles, stimulus=stimulus, gate_lanes=0,
+                         verilog_dir=os.path.dirname(path) or ".")
+    return {'file': path, 'module': result['module'], 'ok': bool(result['simulation_ok']),
+            'check': result['check'], 'waveform': result['waveform'],
+            'status': result['tool_status'], 'cache_hits': result['cache_hits'],
+            'elapsed': round(result['elapsed'], 3),
+            'log': None if result['simulation_ok'] else result['output']}
+
+def cmd_simulate(args, files):
+    if args.waveform:
+        _load("waveform").configure({'before': args.waveform_window,
+                                     'after': max(1, args.waveform_window // 4)})
+    if args.coverage_target is not None:
+        _load("sim_coverage").configure({'target': args.coverage_target})
+    verify_all = _load("verify_all")
+    for verilog_dir in sorted({os.path.dirname(path) or "." for path in files}):
+        verify_all.refresh_index(verilog_dir)
+    cache_dir = None if args.no_cache else args.cache_dir
+    job = (cache_dir, args.cycles, args.stimulus)
+    if args.workers > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(files))) as pool:
+            results = list(pool.map(_simulate_one, files, *([value] * len(files)
+                                                              for value in job)))
+    else:
+        results = [_simulate_one(path, *job) for path in files]
+    lines = []
+    for result in results:
+        coverage = (result['check'] or {}).get('coverage')
+        lines.append(f"{_mark(result['ok'])} {result['file']}"
+                     + (f", coverage {coverage['percent']:g}%" if coverage else "")
+                     + (f" <{result['status']}>" if result['status'] else "")
+                     + f" ({result['elapsed']:.2f}s)")
+        if result['log']:
+            lines.extend(f"  {line}" for line in result['log'].splitlines())
+    return results, all(r['ok'] for r in results), lines
+
+def cmd_synth(args, files):
+    synthesizer = _load("batch_synth").BatchSynthesizer(args.out_dir, args.chunk_size)
+    names = {path: os.path.splitext(os.path.basename(path))[0] for path in files}
+    if len(set(names.values())) != len(names):
+        raise ValueError("synth needs distinct file names, they name the netlists")
+    outcomes = synthesizer.run([(name, path, args.top) for path, name in names.items()])
+    results = []
+    for path, name in names.items():
+        outcome = outcomes[name]
+        results.append({'file': path, 'top': args.top, 'ok': outcome['ok'],
+                        'stat': outcome['stat'], 'json': outcome['json'],
+                        'status': outcome.get('status'),
+                        'log': None if outcome['ok'] else outcome['log']})
+    lines = [f"{_mark(r['ok'])} {r['file']}"
+             + (f" ({r['stat']['cells']} cells)" if r['stat'] else "")
+             + (f" <{r['status']}>" if r['status'] else "") for r in results]
+    return results, all(r['ok'] for r in results), lines
+
+def cmd_sweep(args):
+    sweep = _load("sweep")
+    source = args.source
+    if source is None:
+        source = _load("verilog_generator").VerilogGenerator().write_parameterized_register(
+            args.module)
+    configs = sweep.configurations(sweep.parse_widths(args.widths))
+    results = sweep.ParameterSweep(source, args.module, cycles=args.cycles,
+                                   seed=args.seed).run(configs, not args.no_sim,
+                                                       not args.no_synth, args.workers,
+                                                       args.gate_lanes)
+    failed = [r for r in results if False in (r['simulation_ok'], r['synthesis_ok'],
+                                              r['gate_ok'])]
+    lines = [f"{_mark(r not in failed)} {r['name']}: simulation {_mark(r['simulation_ok'])}, "
+             f"synthesis {_mark(r['synthesis_ok'])}, gates {_mark(r['gate_ok'])}"
+             for r in results]
+    return results, not failed, lines
+
+def cmd_report(args):
+    store = _load("qor_store").QoRStore(args.store)
+    try:
+        if args.query == "runs":
+            rows = store.runs(args.n)
+            fields = ('run_id', 'started', 'label', 'designs', 'failures')
+        elif args.query == "top":
+            rows = store.top(args.n, args.metric, args.run)
+            fields = ('module', args.metric, 'run_id')
+        elif args.query == "failures":
+            if not args.run:
+                raise ValueError("report failures needs --run")
+            rows = store.failures(args.run)
+            fields = ('id', 'module', 'file')
+        else:
+            if not args.module:
+                raise ValueError("report trend needs --module")
+            rows = store.trend(args.module, args.metric, args.n)
+            fields = ('run_id', 'created', args.metric)
+    finally:
+        store.close()
+    results = [dict(zip(fields, row)) for row in rows]
+    lines = ["  ".join(str(value) for value in row) for row in rows]
+    return results, True, lines
+
+COMMANDS = {
+    'generate': (cmd_generate, False),
+    'lint': (cmd_lint, True),
+    'simulate': (cmd_simulate, True),
+    'synth': (cmd_synth, True),
+    'sweep': (cmd_sweep, False),
+    'report': (cmd_report, False),
+}
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true',
+                        help="print one JSON document on stdout (tool output goes to stderr)")
+    common.add_argument('--timing', action='store_true',
+                        help="report startup, import and run time")
+    common.add_argument('--limit', action='append', default=[],
+                        metavar='[STAGE.]FIELD=VALUE', help="override a tool limit")
+    files = argparse.ArgumentParser(add_help=False)
+    files.add_argument('files', nargs='*', metavar='FILE',
+                       help=f"Verilog files or globs (default {DEFAULT_FILES})")
+
+    parser = argparse.ArgumentParser(description="Generate, check and synthesize Verilog designs")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    generate = sub.add_parser('generate', parents=[common], help="write new designs")
+    generate.add_argument('--source', choices=("template", "llm"), default="template")
+    generate.add_argument('-n', '--count', type=int, default=3)
+    generate.add_argument('--spec', default="An 8-bit register with clock, reset and enable",
+                          help="specification for --source llm (@FILE reads it from a file)")
+
+    lint = sub.add_parser('lint', parents=[common, files], help="syntax/elaboration check")
+    lint.add_argument('--backend', choices=("iverilog", "yosys"), default="iverilog")
+
+    simulate = sub.add_parser('simulate', parents=[common, files],
+                              help="self-checking simulation")
+    simulate.add_argument('--cycles', type=int, default=1000)
+    simulate.add_argument('--stimulus', choices=("memfile", "inline"), default="memfile")
+    simulate.add_argument('-j', '--workers', type=int, default=1)
+    simulate.add_argument('--cache-dir', default=".verify_cache")
+    simulate.add_argument('--no-cache', action='store_true')
+    simulate.add_argument('--coverage-target', type=float, metavar='PCT')
+    simulate.add_argument('--waveform', action='store_true')
+    simulate.add_argument('--waveform-window', type=int, default=200)
+
+    synth = sub.add_parser('synth', parents=[common, files], help="Yosys synthesis")
+    synth.add_argument('--top', help="top module of every file (default: auto-detect)")
+    synth.add_argument('--out-dir', default="synthesis_results")
+    synth.add_argument('--chunk-size', type=int, default=16,
+                       help="designs per Yosys process")
+
+    sweep = sub.add_parser('sweep', parents=[common], help="parameter sweep")
+    sweep.add_argument('--source', help="parameterized register source "
+                                        "(default: generate verilog_files/<module>.v)")
+    sweep.add_argument('--module', default="register_param")
+    sweep.add_argument('--widths', default="1-64")
+    sweep.add_argument('--cycles', type=int, default=1000)
+    sweep.add_argument('--seed', type=int, default=0)
+    sweep.add_argument('-j', '--workers', type=int, default=os.cpu_count())
+    sweep.add_argument('--gate-lanes', type=int, default=1024)
+    sweep.add_argument('--no-sim', action='store_true')
+    sweep.add_argument('--no-synth', action='store_true')
+
+    report = sub.add_parser('report', parents=[common], help="query the QoR store")
+    report.add_argument('query', choices=("runs", "top", "trend", "failures"),
+                        nargs='?', default="runs")
+    report.add_argument('--store', default=".qor_store.sqlite")
+    report.add_argument('--module')
+    report.add_argument('--metric', default="cells")
+    report.add_argument('--run')
+    report.add_argument('-n', type=int, default=20)
+    return parser
+
+def main(argv=None):
+    """One entry point for the framework: generate, lint, simulate, synth, sweep, report
+
+    Only the standard library is imported at startup; each subcommand imports
+    the modules it needs when it runs, so `lint` and `synth` never load
+    numpy or anthropic. Files are given as paths or globs (default
+    verilog_files/*.v). With --json the result is one JSON document on
+    stdout and all tool chatter goes to stderr; --timing adds where the
+    process spent its time. The exit status is 0 when everything passed,
+    1 when a design failed and 2 for usage errors.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    handler, takes_files = COMMANDS[args.command]
+    handler_args = [args]
+    unmatched = []
+    if takes_files:
+        files, unmatched = expand(args.files)
+        if not files:
+            parser.error(f"no Verilog files match {', '.join(args.files or [DEFAULT_FILES])}")
+        handler_args.append(files)
+
+    run_start = time.perf_counter()
+    output = sys.stderr if args.json else sys.stdout
+    error = None
+    try:
+        with contextlib.redirect_stdout(output):
+            if args.limit:
+                supervisor = _load("supervisor")
+                for text in args.limit:
+                    supervisor.configure(supervisor.parse_limit(text))
+            results, ok, lines = handler(*handler_args)
+    except (ValueError, OSError) as e:
+        results, ok, lines, error = [], False, [], str(e)
+    except KeyboardInterrupt:
+        if "supervisor" in sys.modules:
+            sys.modules["supervisor"].cancel()
+        sys.exit(130)
+    run_seconds = time.perf_counter() - run_start - _import_seconds
+    ok = ok and not unmatched
+
+    timing = {'startup_cpu_ms': round(_STARTUP_CPU * 1000, 1),
+              'import_ms': round(_import_seconds * 1000, 1),
+              'run_ms': round(run_seconds * 1000, 1),
+              'total_ms': round((time.perf_counter() - _LOADED) * 1000, 1),
+              'modules': len(sys.modules),
+              'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules]}
+    if args.json:
+        document = {'command': args.command, 'ok': ok, 'results': results}
+        if unmatched:
+            document['unmatched'] = unmatched
+        if error:
+            document['error'] = error
+        if args.timing:
+            document['timing'] = timing
+        json.dump(document, sys.stdout, default=_jsonable)
+        sys.stdout.write("\n")
+    else:
+        for line in lines:
+            print(line)
+        for pattern in unmatched:
+            print(f"✗ {pattern}: no such file")
+        if error:
+            print(f"Error: {error}", file=sys.stderr)
+        if args.timing:
+            print(f"startup {timing['startup_cpu_ms']}ms cpu, imports {timing['import_ms']}ms, "
+                  f"run {timing['run_ms']}ms, {timing['modules']} modules"
+                  + (f" (loaded {', '.join(timing['heavy_modules'])})"
+                     if timing['heavy_modules'] else ""))
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
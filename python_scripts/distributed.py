@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import gzip
+import time
+import uuid
+import base64
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.request
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import tracing
+import supervisor
+import sim_coverage
+
+LEASE_SECONDS = 60
+MAX_ATTEMPTS = 3
+STEAL_AFTER = 10.0
+
+def _pack(text):
+    return base64.b64encode(gzip.compress(text.encode())).decode()
+
+def _unpack(data):
+    return gzip.decompress(base64.b64decode(data)).decode()
+
+class Coordinator:
+    """HTTP job server that hands out verification jobs to workers
+
+    Workers POST /lease to get one job at a time, /heartbeat while it
+    runs, and /result with the verdict. A job whose lease expires (the
+    worker died or hung) or whose worker reports an error goes back on the
+    queue until it has failed max_attempts times. Once the queue is empty,
+    idle workers steal the oldest job still in flight after steal_after
+    seconds and run it in parallel; whichever copy finishes first is kept.
+    A steal is not a failure and does not count as an attempt.
+    """
+
+    def __init__(self, jobs, host="127.0.0.1", port=0, lease_seconds=LEASE_SECONDS,
+                 max_attempts=MAX_ATTEMPTS, steal_after=STEAL_AFTER, on_result=None):
+        self.jobs = {job['id']: job for job in jobs}
+        self.pending = deque(self.jobs)
+        self.leases = {}      # job id -> {worker: expiry}
+        self.started = {}     # job id -> time of its first lease
+        self.attempts = {job_id: 0 for job_id in self.jobs}   # failed runs
+        self.results = {}
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.steal_after = steal_after
+        self.on_result = on_result
+        self.workers = set()
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        if not self.jobs:
+            self.finished.set()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        coordinator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'] or 0)) or b"{}")
+                routes = {'/lease': coordinator.lease, '/heartbeat': coordinator.heartbeat,
+                          '/result': coordinator.submit}
+                if self.path not in routes:
+                    self.send_error(404)
+                    return
+                self._reply(routes[self.path](body))
+
+            def do_GET(self):
+                if self.path != '/status':
+                    self.send_error(404)
+                    return
+                self._reply(coordinator.status())
+
+            def _reply(self, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _expire(self, now):
+        """Requeue jobs whose every lease has run out"""
+        for job_id, holders in list(self.leases.items()):
+            for worker, expiry in list(holders.items()):
+                if expiry < now:
+                    del holders[worker]
+                    self.attempts[job_id] += 1
+                    print(f"Lease of {self.jobs[job_id]['file']} by {worker} expired")
+            if holders:
+                continue
+            del self.leases[job_id]
+            self._retry(job_id, {'file': self.jobs[job_id]['file'],
+                                 'error': f"lost {self.attempts[job_id]} workers"})
+
+    def _retry(self, job_id, result):
+        """Requeue a job nobody is running, or give up after max_attempts"""
+        if self.attempts[job_id] >= self.max_attempts:
+            self._finish(job_id, result)
+        else:
+            self.pending.appendleft(job_id)
+
+    def lease(self, request):
+        worker = request['worker']
+        now = time.time()
+        with self.lock:
+            self.workers.add(worker)
+            self._expire(now)
+            if self.finished.is_set():
+                return {'done': True}
+            job_id = None
+            while self.pending:
+                candidate = self.pending.popleft()
+                if candidate not in self.results:
+                    job_id = candidate
+                    break
+            if job_id is None:
+                # Queue drained: duplicate the oldest straggler this worker is not on
+                stragglers = [j for j in self.leases if worker not in self.leases[j]
+                              and now - self.started[j] >= self.steal_after]
+                if not stragglers:
+                    return {'wait': 1.0}
+                job_id = min(stragglers, key=self.started.get)
+                print(f"{worker} steals {self.jobs[job_id]['file']}")
+            self.started.setdefault(job_id, now)
+            self.leases.setdefault(job_id, {})[worker] = now + self.lease_seconds
+            return {'job': self.jobs[job_id], 'lease_seconds': self.lease_seconds}
+
+    def heartbeat(self, request):
+        """Extend the worker's leases; tells it which of its jobs are already done"""
+        now = time.time()
+        with self.lock:
+            done = []
+            for job_id in request.get('jobs', []):
+                if job_id in self.results:
+                    done.append(job_id)
+                elif worker_leases := self.leases.get(job_id):
+                    if request['worker'] in worker_leases:
+                        worker_leases[request['worker']] = now + self.lease_seconds
+            return {'ok': True, 'done': done}
+
+    def submit(self, request):
+        job_id = request['job']
+        with self.lock:
+            self.leases.get(job_id, {}).pop(request['worker'], None)
+            if job_id in self.results or job_id not in self.jobs:
+                return {'accepted': False}
+            running = bool(self.leases.get(job_id))
+            if not running:
+                self.leases.pop(job_id, None)
+            result = request['result']
+            result['worker'] = request['worker']
+            if 'error' in result:
+                self.attempts[job_id] += 1
+                print(f"{request['worker']} failed {self.jobs[job_id]['file']}: {result['error']}")
+                if not running:
+                    self._retry(job_id, result)
+                return {'accepted': False}
+            if request.get('netlist'):
+                result['netlist'] = _unpack(request['netlist'])
+            self._finish(job_id, result)
+        return {'accepted': True}
+
+    def _finish(self, job_id, result):
+        self.results[job_id] = result
+        self.leases.pop(job_id, None)
+        if self.on_result is not None:
+            self.on_result(self.jobs[job_id], result)
+        if len(self.results) == len(self.jobs):
+            self.finished.set()
+
+    def status(self):
+        with self.lock:
+            return {'jobs': len(self.jobs), 'done': len(self.results),
+                    'pending': len(self.pending), 'in_flight': len(self.leases),
+                    'workers': sorted(self.workers)}
+
+    def wait(self, poll=1.0):
+        """Block until every job has a result, reaping expired leases"""
+        while not self.finished.wait(poll):
+            with self.lock:
+                self._expire(time.time())
+        return self.results
+
+def _post(url, path, payload, timeout=30):
+    request = urllib.request.Request(url + path, data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+def _refused(error):
+    return isinstance(getattr(error, 'reason', error), ConnectionRefusedError)
+
+def make_jobs(verilog_files, verilog_dir="verilog_files", synthesize=True, simulate=True,
+              cycles=1000, stimulus="memfile", gate_lanes=1024):
+    """One job per file, carrying its source, its dependencies and the settings
+
+    Testbenches are generated from the source and these settings, so the
+    worker rebuilds exactly the testbench and vectors the local run would.
+    """
+    from verify_all import VerilogVerifier
+
+    verifier = VerilogVerifier()
+    jobs = []
+    for vfile in verilog_files:
+        dependencies = {}
+        for path in verifier.dependencies(vfile):
+            with open(path, 'r') as f:
+                dependencies[os.path.basename(path)] = f.read()
+        jobs.append({'id': uuid.uuid4().hex, 'file': vfile,
+                     'source': verifier._read_source(vfile),
+                     'dependencies': dependencies,
+                     'settings': {'synthesize': synthesize, 'simulate': simulate,
+                                  'cycles': cycles, 'stimulus': stimulus,
+                                  'gate_lanes': gate_lanes,
+                                  'coverage': sim_coverage.settings()}})
+    return jobs
+
+class Worker:
+    """Pulls jobs from a coordinator and verifies them in a scratch directory
+
+    Each job's files are written to <workdir>/verilog_files (cleared
+    first, so earlier jobs cannot satisfy its dependencies) and run with
+    verify_all.verify_file. A heartbeat thread keeps the lease alive and
+    cancels the tools once another worker has finished the same job.
+    """
+
+    def __init__(self, url, workdir=None, worker_id=None):
+        self.url = url.rstrip("/")
+        self.workdir = os.path.abspath(workdir or tempfile.mkdtemp(prefix="verify_worker_"))
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.current = None
+        self.interval = LEASE_SECONDS / 3
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+
+    def _heartbeat(self):
+        last = 0.0
+        while not self.stop.wait(1.0):
+            job_id = self.current
+            if job_id is None or time.time() - last < self.interval:
+                continue
+            last = time.time()
+            try:
+                reply = _post(self.url, '/heartbeat', {'worker': self.worker_id,
+                                                       'jobs': [job_id]})
+            except (OSError, ValueError) as e:
+                # A coordinator that shut down no longer needs the result
+                reply = {'done': [job_id] if _refused(e) else []}
+            with self.lock:
+                if job_id in reply['done'] and self.current == job_id:
+                    supervisor.cancel()
+
+    def materialize(self, job):
+        """Write the job's sources into the scratch verilog_files/
+
+        File names come from the coordinator; anything but a plain file
+        name could write outside the scratch directory and is refused.
+        """
+        files = dict(job['dependencies'], **{job['file']: job['source']})
+        for name in files:
+            if name != os.path.basename(name) or name in ("", ".", ".."):
+                raise ValueError(f"refusing unsafe file name {name!r}")
+        verilog_dir = os.path.join(self.workdir, "verilog_files")
+        shutil.rmtree(verilog_dir, ignore_errors=True)
+        os.makedirs(verilog_dir)
+        for name, text in files.items():
+            with open(os.path.join(verilog_dir, name), 'w') as f:
+                f.write(text)
+
+    def execute(self, job):
+        from verify_all import verify_file
+
+        self.materialize(job)
+        settings = job['settings']
+        sim_coverage.configure(settings.get('coverage'))
+        result = verify_file(job['file'], None, settings['synthesize'], settings['simulate'],
+                             settings['cycles'], settings['stimulus'], settings['gate_lanes'],
+                             keep_logs=False)
+        netlist = None
+        json_file = os.path.join("synthesis_results",
+                                 f"{os.path.splitext(job['file'])[0]}.json")
+        if result['synthesis_ok'] and os.path.exists(json_file):
+            with open(json_file, 'r') as f:
+                netlist = _pack(f.read())
+        return result, netlist
+
+    def run(self):
+        """Work until the coordinator reports done (or goes away)"""
+        os.makedirs(self.workdir, exist_ok=True)
+        os.chdir(self.workdir)
+        print(f"Worker {self.worker_id} in {self.workdir} serving {self.url}")
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+        failures = 0
+        contacted = False
+        completed = 0
+        try:
+            while True:
+                try:
+                    reply = _post(self.url, '/lease', {'worker': self.worker_id})
+                    failures = 0
+                    contacted = True
+                except (OSError, ValueError) as e:
+                    if contacted and _refused(e):
+                        break  # the coordinator finished and shut down
+                    failures += 1
+                    if failures >= 5:
+                        print("Coordinator unreachable, stopping")
+                        break
+                    time.sleep(1.0)
+                    continue
+                if reply.get('done'):
+                    break
+                if 'job' not in reply:
+                    time.sleep(reply.get('wait', 1.0))
+                    continue
+
+                job = reply['job']
+                self.interval = reply['lease_seconds'] / 3
+                self.current = job['id']
+                try:
+                    result, netlist = self.execute(job)
+                except Exception as e:
+                    result, netlist = {'file': job['file'], 'error': str(e),
+                                       'spans': tracing.drain()}, None
+                with self.lock:
+                    self.current = None
+                    supervisor.reset()
+                try:
+                    _post(self.url, '/result', {'worker': self.worker_id, 'job': job['id'],
+                                                'result': result, 'netlist': netlist})
+                except (OSError, ValueError) as e:
+                    print(f"Could not report {job['file']}: {e}")
+                completed += 1
+        finally:
+            self.stop.set()
+        print(f"Worker {self.worker_id} finished {completed} jobs")
+        return completed
+
+def spawn_workers(url, count, workdir_root=None):
+    """Start count worker processes on this host; returns the Popen objects"""
+    workdir_root = workdir_root or tempfile.mkdtemp(prefix="verify_workers_")
+    processes = []
+    for i in range(count):
+        processes.append(subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), 'worker', url,
+             '--workdir', os.path.join(workdir_root, f"worker{i}")],
+            stdout=subprocess.DEVNULL))
+    return processes
+
+def verify_distributed(verilog_files, address=None, local_workers=0, cycles=1000,
+                       stimulus="memfile", gate_lanes=1024, run_id=None,
+                       lease_seconds=LEASE_SECONDS, steal_after=STEAL_AFTER):
+    """Verify files through a coordinator; results come back in input order
+
+    Each verdict is printed as it streams in, and the returned netlist
+    JSON is written to synthesis_results/ so local tools can use it.
+    With a run_id the synthesis metrics go to the QoR store. address is
+    "host:port" to serve remote workers; local_workers spawns that many
+    worker processes on this machine.
+    """
+    from qor_store import QoRStore
+    from equivalence import source_hash
+
+    verilog_files = list(verilog_files)
+    jobs = make_jobs(verilog_files, cycles=cycles, stimulus=stimulus, gate_lanes=gate_lanes)
+    os.makedirs("synthesis_results", exist_ok=True)
+
+    def on_result(job, result):
+        print(result.get('output') or f"Error verifying {job['file']}: {result.get('error')}\n")
+        netlist = result.pop('netlist', None)
+        if netlist is not None:
+            json_file = os.path.join("synthesis_results",
+                                     f"{os.path.splitext(job['file'])[0]}.json")
+            with open(json_file, 'w') as f:
+                f.write(netlist)
+
+    host, _, port = (address or "127.0.0.1:0").rpartition(":")
+    coordinator = Coordinator(jobs, host or "127.0.0.1", int(port), lease_seconds,
+                              steal_after=steal_after, on_result=on_result).start()
+    print(f"Coordinator serving {len(jobs)} jobs at {coordinator.url}")
+    processes = spawn_workers(coordinator.url, local_workers) if local_workers else []
+    try:
+        results = coordinator.wait()
+    finally:
+        coordinator.stop()
+        for process in processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.terminate()  # workers kill their tools on SIGTERM
+                process.wait()
+
+    qor = QoRStore() if run_id else None
+    ordered = []
+    for job in jobs:
+        result = results[job['id']]
+        tracing.merge(result.pop('spans', []))
+        if qor is not None and result.get('synthesis_ok') is not None:
+            qor.record(run_id, os.path.splitext(job['file'])[0], job['file'],
+                       source_hash(job['source']), result['synthesis_ok'], result['stat'])
+        if 'error' in result:
+            result = {'file': job['file'], 'module': None, 'ports': [],
+                      'simulation_ok': False, 'check': None, 'synthesis_ok': False,
+                      'stat': None, 'gate_ok': None, 'gate_check': None,
+                      'netlist_hash': None, 'tool_status': result['error'],
+                      'cache_hits': 0, 'elapsed': 0.0, 'output': ""}
+        ordered.append(result)
+    if qor is not None:
+        qor.close()
+    return ordered
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed verification worker")
+    sub = parser.add_subparsers(dest='command', required=True)
+    worker = sub.add_parser('worker', help="pull and verify jobs from a coordinator")
+    worker.add_argument('url', help="coordinator URL, e.g. http://host:8765")
+    worker.add_argument('--workdir', help="scratch directory (default: a new temp dir)")
+    worker.add_argument('--id', help="worker name (default: host-pid)")
+    status = sub.add_parser('status', help="show a coordinator's progress")
+    status.add_argument('url')
+    args = parser.parse_args()
+
+    if args.command == 'worker':
+        supervisor.interrupt_on_sigterm()
+        try:
+            Worker(args.url, args.workdir, args.id).run()
+        except KeyboardInterrupt:
+            print("Worker stopped")
+            sys.exit(130)
+    else:
+        with urllib.request.urlopen(args.url.rstrip("/") + "/status", timeout=10) as response:
+            print(json.dumps(json.loads(response.read()), indent=2))
+
+if __name__ == "__main__":
+    main()
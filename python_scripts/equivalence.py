@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+import re
+import sys
+import hashlib
+import numpy as np
+from module_index import tokenize, parse_modules, KEYWORDS
+from netlist import load_netlist
+
+MAX_ROUNDS = 32
+
+# Gate inputs that can be swapped without changing the function
+COMMUTATIVE = {"$_AND_", "$_NAND_", "$_OR_", "$_NOR_", "$_XOR_", "$_XNOR_"}
+
+def _normalize_number(value):
+    """Spell a literal canonically, so 8'd10, 8'hA and 8'b1010 agree"""
+    match = re.fullmatch(r"(\d*)\s*'([sS]?)([bBoOdDhH])\s*([0-9a-fA-F_xXzZ?]+)", value)
+    if not match:
+        return value.replace("_", "")
+    width, signed, base, digits = match.groups()
+    digits = digits.replace("_", "").lower()
+    if re.search(r'[xz?]', digits):
+        return f"{width}'{signed.lower()}{base.lower()}{digits}"
+    number = int(digits, {"b": 2, "o": 8, "d": 10, "h": 16}[base.lower()])
+    return f"{width}'{signed.lower()}h{number:x}"
+
+def source_hash(text):
+    """Hash Verilog source, ignoring layout, comments and internal names
+
+    Module names and internal identifiers are renamed in order of first
+    appearance; port names are kept because they are the interface the
+    testbenches bind to, and so are the names of instantiated module
+    types, which decide what a hierarchical design contains. Literals are
+    compared by value. Pass the file together with its dependencies
+    (read_sources) so that their contents count as well.
+    """
+    modules = parse_modules(text)
+    kept = {port['name'] for module in modules for port in module['ports']}
+    kept.update(name for module in modules for name in module['instances'])
+    names = {}
+    parts = []
+    previous = None
+    for kind, value, _ in tokenize(text):
+        if (kind == "ident" and value not in KEYWORDS and value not in kept
+                and previous != "$"):
+            value = names.setdefault(value, f"id{len(names)}")
+        elif kind == "number":
+            value = _normalize_number(value)
+        parts.append(value)
+        previous = value
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+def _mix(x):
+    """splitmix64 finalizer over uint64 arrays (wraps modulo 2**64)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return x ^ (x >> np.uint64(31))
+
+def _string_hash(text):
+    return np.uint64(int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], 'little'))
+
+def netlist_hash(netlist):
+    """Canonical hash of a Netlist that does not depend on cell/wire names
+
+    Weisfeiler-Lehman style refinement: cells start from their type and
+    net bits from what anchors them (module port and bit position, or a
+    constant), then both repeatedly absorb the labels of their neighbours
+    through the pin that connects them. Neighbour labels are summed, so
+    the order in which cells appear in the file does not matter. Inputs
+    of commutative gates share one pin label. The result combines the
+    multiset of final cell labels with the labels of the port bits.
+    """
+    n_bits = netlist.n_bits
+    pin_bit = netlist.pin_bit.astype(np.int64)
+    pin_cell = netlist.pin_cell
+    live = pin_bit >= 0
+
+    # Pin role: port name (merged for commutative inputs), direction, bit position
+    port_names = list(netlist.port_names)
+    commutative = np.array([t in COMMUTATIVE for t in netlist.type_names] or [False])
+    port_keys = np.array([_string_hash(p) for p in port_names] or [np.uint64(0)], dtype=np.uint64)
+    pin_key = port_keys[netlist.pin_port]
+    if len(pin_key):
+        merged = commutative[netlist.cell_type[pin_cell]] & np.isin(
+            netlist.pin_port, [i for i, p in enumerate(port_names) if p in ("A", "B")])
+        pin_key = np.where(merged, _string_hash("A|B"), pin_key)
+        starts = np.r_[True, (np.diff(pin_cell) != 0) | (np.diff(netlist.pin_port) != 0)]
+        run_start = np.maximum.accumulate(np.where(starts, np.arange(len(pin_key)), 0))
+        position = (np.arange(len(pin_key)) - run_start).astype(np.uint64)
+        pin_key = _mix(pin_key + position * np.uint64(0x9e3779b97f4a7c15)
+                       + netlist.pin_output.astype(np.uint64))
+
+    type_keys = np.array([_string_hash(t) for t in netlist.type_names] or [np.uint64(0)],
+                         dtype=np.uint64)
+    cell_label = type_keys[netlist.cell_type] if netlist.n_cells else np.zeros(0, np.uint64)
+
+    bit_label = np.zeros(n_bits, dtype=np.uint64)
+    const_label = np.array([_string_hash(f"const{c}") for c in range(4)], dtype=np.uint64)
+    port_anchor = []
+    for name in sorted(netlist.ports):
+        direction, bits = netlist.ports[name]
+        for i, bit in enumerate(bits):
+            anchor = _string_hash(f"{direction} {name}[{i}]")
+            if bit >= 0:
+                bit_label[bit] = bit_label[bit] + anchor
+            port_anchor.append((int(bit), anchor))
+
+    def pin_bit_labels():
+        labels = const_label[np.clip(-pin_bit - 1, 0, 3)]
+        labels[live] = bit_label[pin_bit[live]]
+        return labels
+
+    nonempty = np.diff(netlist.pin_start) > 0
+    classes = -1
+    for _ in range(MAX_ROUNDS):
+        keys = _mix(pin_key + pin_bit_labels())
+        cell_sum = np.zeros(netlist.n_cells, dtype=np.uint64)
+        if len(keys):
+            sums = np.add.reduceat(keys, netlist.pin_start[:-1][nonempty])
+            cell_sum[nonempty] = sums
+        new_cells = _mix(cell_label + cell_sum)
+
+        bit_sum = np.zeros(n_bits, dtype=np.uint64)
+        np.add.at(bit_sum, pin_bit[live], _mix(cell_label[pin_cell[live]] ^ pin_key[live]))
+        bit_label = _mix(bit_label + bit_sum)
+        cell_label = new_cells
+
+        count = len(np.unique(cell_label)) + len(np.unique(bit_label))
+        if count == classes:
+            break
+        classes = count
+
+    digest = hashlib.sha256()
+    digest.update(np.sort(cell_label).tobytes())
+    for bit, anchor in port_anchor:
+        label = bit_label[bit] if bit >= 0 else const_label[min(-bit - 1, 3)]
+        digest.update(np.array([anchor, label], dtype=np.uint64).tobytes())
+    return digest.hexdigest()
+
+def netlist_file_hash(json_file, module=None):
+    """netlist_hash of the top (or named) module of a Yosys JSON file"""
+    netlist = load_netlist(json_file, module)
+    return netlist_hash(netlist) if netlist is not None else None
+
+def equivalence_classes(items, key):
+    """Group items by key(item); returns {representative: [members]}
+
+    The representative is the first member in input order. Items whose
+    key is None each form their own class.
+    """
+    classes = {}
+    representative = {}
+    for item in items:
+        k = key(item)
+        if k is None:
+            classes[item] = [item]
+            continue
+        if k not in representative:
+            representative[k] = item
+            classes[item] = []
+        classes[representative[k]].append(item)
+    return classes
+
+def main():
+    for path in sys.argv[1:]:
+        if path.endswith(".json"):
+            print(f"{path}: netlist {netlist_file_hash(path)[:16]}")
+        else:
+            with open(path, 'r') as f:
+                print(f"{path}: source {source_hash(f.read())[:16]}")
+
+if __name__ == "__main__":
+    main()
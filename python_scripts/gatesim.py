@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import glob
+import numpy as np
+from netlist import load_netlist
+from module_index import ModuleIndex
+from selfcheck import make_stimulus, reference_model, supports as selfcheck_supports
+
+LANE_BITS = 64
+# Value rows are bit ID + CONST_ROWS; constant bits (-1..-4) land in rows 3..0
+CONST_ROWS = 4
+ONE_ROW = 2
+
+GATES = {
+    "$_BUF_": (("A",), lambda a: a),
+    "$_NOT_": (("A",), lambda a: ~a),
+    "$_AND_": (("A", "B"), lambda a, b: a & b),
+    "$_NAND_": (("A", "B"), lambda a, b: ~(a & b)),
+    "$_OR_": (("A", "B"), lambda a, b: a | b),
+    "$_NOR_": (("A", "B"), lambda a, b: ~(a | b)),
+    "$_XOR_": (("A", "B"), lambda a, b: a ^ b),
+    "$_XNOR_": (("A", "B"), lambda a, b: ~(a ^ b)),
+    "$_ANDNOT_": (("A", "B"), lambda a, b: a & ~b),
+    "$_ORNOT_": (("A", "B"), lambda a, b: a | ~b),
+    "$_MUX_": (("A", "B", "S"), lambda a, b, s: (a & ~s) | (b & s)),
+    "$_NMUX_": (("A", "B", "S"), lambda a, b, s: ~((a & ~s) | (b & s))),
+    "$_AOI3_": (("A", "B", "C"), lambda a, b, c: ~((a & b) | c)),
+    "$_OAI3_": (("A", "B", "C"), lambda a, b, c: ~((a | b) & c)),
+    "$_AOI4_": (("A", "B", "C", "D"), lambda a, b, c, d: ~((a & b) | (c & d))),
+    "$_OAI4_": (("A", "B", "C", "D"), lambda a, b, c, d: ~((a | b) & (c | d))),
+}
+
+# $_DFF_P_, $_DFF_PN0_, $_DFFE_PP_, $_DFFE_PN0P_, $_SDFF_PN0_, $_SDFFE_PN0P_, ...
+# Cells without logic function, e.g. the scope markers `flatten` leaves behind
+ANNOTATIONS = {"$scopeinfo"}
+
+REGISTER_RE = re.compile(r'^\$_(DFF|DFFE|SDFF|SDFFE|SDFFCE)_([NP])(?:([NP])([01]))?([NP])?_$')
+
+def pack(values, width):
+    """Pack per-lane values (lanes,) into bit-plane words (width, words)"""
+    values = np.asarray(values, dtype=np.uint64)
+    words = (len(values) + LANE_BITS - 1) // LANE_BITS
+    padded = np.zeros(words * LANE_BITS, dtype=np.uint64)
+    padded[:len(values)] = values
+    bits = (padded[None, :] >> np.arange(width, dtype=np.uint64)[:, None]) & np.uint64(1)
+    bits = bits.reshape(width, words, LANE_BITS) << np.arange(LANE_BITS, dtype=np.uint64)
+    return np.bitwise_or.reduce(bits, axis=2)
+
+def unpack(planes, lanes):
+    """Inverse of pack: bit-plane words (width, words) to per-lane values"""
+    width = planes.shape[0]
+    bits = (planes[:, :, None] >> np.arange(LANE_BITS, dtype=np.uint64)) & np.uint64(1)
+    bits = bits.reshape(width, -1)[:, :lanes]
+    return np.bitwise_or.reduce(bits << np.arange(width, dtype=np.uint64)[:, None], axis=0)
+
+class GateSimulator:
+    """Cycle-based, two-valued simulator for fine-grained Yosys netlists
+
+    Every net bit holds one uint64 word per 64 lanes, so each gate is
+    evaluated for all lanes with a single NumPy operation, and cells of
+    the same type on the same level are evaluated together. Flip-flops
+    share one implicit clock: each step() settles the combinational
+    logic, clocks every register and settles again. Asynchronous resets
+    are sampled at the clock edge like synchronous ones, and registers
+    start at 0 instead of X.
+    """
+
+    def __init__(self, netlist, lanes=1024):
+        self.netlist = netlist
+        self.lanes = lanes
+        self.words = (lanes + LANE_BITS - 1) // LANE_BITS
+        self.values = np.zeros((netlist.n_bits + CONST_ROWS, self.words), dtype=np.uint64)
+        self.values[ONE_ROW] = ~np.uint64(0)
+
+        port_rows = {}
+        for code, port in enumerate(netlist.port_names):
+            rows = np.full(netlist.n_cells, -1, dtype=np.int64)
+            mask = netlist.pin_port == code
+            rows[netlist.pin_cell[mask]] = netlist.pin_bit[mask].astype(np.int64) + CONST_ROWS
+            port_rows[port] = rows
+        self._port_rows = port_rows
+
+        level = netlist.levelize()
+        registers = netlist.register_mask()
+        if np.any(~registers & (level < 0)):
+            raise ValueError(f"{netlist.name}: combinational loop, cannot levelize")
+
+        self.groups = []
+        comb = np.flatnonzero(~registers)
+        order = comb[np.lexsort((netlist.cell_type[comb], level[comb]))]
+        keys = np.stack([level[order], netlist.cell_type[order]]) if len(order) else None
+        if keys is not None:
+            bounds = np.flatnonzero(np.any(np.diff(keys, axis=1) != 0, axis=0)) + 1
+            for cells in np.split(order, bounds):
+                type_name = netlist.type_names[netlist.cell_type[cells[0]]]
+                if type_name in ANNOTATIONS:
+                    continue
+                if type_name not in GATES:
+                    raise ValueError(f"{netlist.name}: unsupported cell type {type_name}")
+                inputs, func = GATES[type_name]
+                self.groups.append((func, [self._rows(p, cells, type_name) for p in inputs],
+                                    self._rows("Y", cells, type_name)))
+
+        self.registers = []
+        for code in np.unique(netlist.cell_type[registers]):
+            type_name = netlist.type_names[code]
+            match = REGISTER_RE.match(type_name)
+            if not match:
+                raise ValueError(f"{netlist.name}: unsupported register type {type_name}")
+            kind, _, reset_pol, reset_val, enable_pol = match.groups()
+            cells = np.flatnonzero(netlist.cell_type == code)
+            self.registers.append({
+                'd': self._rows("D", cells, type_name),
+                'q': self._rows("Q", cells, type_name),
+                'e': self._rows("E", cells, type_name) if enable_pol else None,
+                'enable_high': enable_pol == "P",
+                'r': self._rows("R", cells, type_name) if reset_pol else None,
+                'reset_high': reset_pol == "P",
+                'reset_value': reset_val == "1",
+                'reset_needs_enable': kind == "SDFFCE",
+            })
+
+    def _rows(self, port, cells, type_name):
+        rows = self._port_rows.get(port)
+        if rows is None or np.any(rows[cells] < 0):
+            raise ValueError(f"{self.netlist.name}: {type_name} cell without port {port}")
+        return rows[cells]
+
+    def reset_state(self):
+        self.values[CONST_ROWS:] = 0
+
+    def set_input(self, port, values):
+        """Drive an input port with one value per lane"""
+        bits = self.netlist.ports[port][1]
+        live = bits >= 0
+        planes = pack(values, len(bits))
+        self.values[bits[live].astype(np.int64) + CONST_ROWS] = planes[live]
+
+    def get_output(self, port):
+        """Read a port as one value per lane"""
+        bits = self.netlist.ports[port][1].astype(np.int64)
+        return unpack(self.values[bits + CONST_ROWS], self.lanes)
+
+    def evaluate(self):
+        """Settle the combinational logic, one level/type group at a time"""
+        values = self.values
+        for func, inputs, output in self.groups:
+            values[output] = func(*(values[rows] for rows in inputs))
+
+    def clock(self):
+        """Load every register from its D input (all at once)"""
+        values = self.values
+        updates = []
+        for reg in self.registers:
+            q = values[reg['q']]
+            d = values[reg['d']]
+            if reg['r'] is not None:
+                reset = values[reg['r']] if reg['reset_high'] else ~values[reg['r']]
+                fill = ~np.uint64(0) if reg['reset_value'] else np.uint64(0)
+                d_reset = (d & ~reset) | (fill & reset)
+            else:
+                d_reset = d
+            if reg['e'] is not None:
+                enable = values[reg['e']] if reg['enable_high'] else ~values[reg['e']]
+                if reg['reset_needs_enable'] or reg['r'] is None:
+                    nxt = (q & ~enable) | (d_reset & enable)
+                else:
+                    # Reset wins over enable
+                    nxt = (q & ~enable) | (d & enable)
+                    nxt = (nxt & ~reset) | (fill & reset)
+            else:
+                nxt = d_reset
+            updates.append((reg['q'], nxt))
+        for rows, nxt in updates:
+            values[rows] = nxt
+
+    def step(self, inputs):
+        """Apply inputs ({port: per-lane values}), clock once and settle"""
+        for port, values in inputs.items():
+            self.set_input(port, values)
+        self.evaluate()
+        self.clock()
+        self.evaluate()
+
+    def run(self, stimulus, outputs):
+        """Run every cycle of stimulus ({port: (cycles, lanes)} arrays)
+
+        Returns {port: (cycles, lanes)} sampled after each clock edge.
+        """
+        cycles = len(next(iter(stimulus.values())))
+        result = {port: np.zeros((cycles, self.lanes), dtype=np.uint64) for port in outputs}
+        for t in range(cycles):
+            self.step({port: values[t] for port, values in stimulus.items()})
+            for port in outputs:
+                result[port][t] = self.get_output(port)
+        return result
+
+def spot_check(netlist, width, has_reset, has_enable, cycles=1000, lanes=1024, seed=0):
+    """Compare a synthesized register against the selfcheck reference model
+
+    Runs lanes independent random stimulus streams of cycles each through
+    the gate-level netlist and returns a report shaped like
+    selfcheck.compare(), plus the lane of the first mismatch. Raises
+    ValueError if the netlist lacks a clk, data_in or data_out port.
+    """
+    missing = [port for port in ('clk', 'data_in', 'data_out') if port not in netlist.ports]
+    if missing:
+        raise ValueError(f"{netlist.name}: no {'/'.join(missing)} port")
+    stimulus = make_stimulus(cycles * lanes, width, has_reset, has_enable, seed)
+    stimulus = {name: values.reshape(lanes, cycles) for name, values in stimulus.items()}
+    if has_reset and cycles:
+        stimulus['rst_n'][:, 0] = False
+    expected, valid = reference_model(stimulus, has_reset, has_enable)
+
+    inputs = {'data_in': stimulus['data_in'].T}
+    if has_reset:
+        inputs['rst_n'] = stimulus['rst_n'].T.astype(np.uint64)
+    if has_enable:
+        inputs['en'] = stimulus['en'].T.astype(np.uint64)
+    inputs = {port: values for port, values in inputs.items() if port in netlist.ports}
+
+    simulator = GateSimulator(netlist, lanes)
+    actual = simulator.run(inputs, ['data_out'])['data_out'].T
+
+    bad = valid & (actual != expected)
+    report = {'cycles': cycles, 'lanes': lanes, 'checked': int(valid.sum()),
+              'mismatches': int(bad.sum()), 'first_mismatch': None}
+    if report['mismatches']:
+        bad_lanes, bad_cycles = np.nonzero(bad)
+        first = np.argmin(bad_cycles)
+        lane, cycle = bad_lanes[first], bad_cycles[first]
+        report['first_mismatch'] = {'lane': int(lane), 'cycle': int(cycle),
+                                    'expected': f"{int(expected[lane, cycle]):x}",
+                                    'actual': f"{int(actual[lane, cycle]):x}"}
+    return report
+
+def main():
+    lanes = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    index = ModuleIndex()
+
+    print("=== Gate-Level Spot Checks ===")
+    for json_file in sorted(glob.glob(os.path.join("synthesis_results", "*.json"))):
+        stem = os.path.splitext(os.path.basename(json_file))[0]
+        verilog_file = os.path.join("verilog_files", f"{stem}.v")
+        module = index.top_module(verilog_file) if os.path.exists(verilog_file) else None
+        if module is None:
+            continue
+        ports = {port['name']: port for port in module['ports']}
+        width = (ports.get('data_in') or {}).get('width')
+        if not selfcheck_supports(ports, width):
+            print(f"{stem}: skipped (not a register)")
+            continue
+        try:
+            report = spot_check(load_netlist(json_file), width, 'rst_n' in ports,
+                                'en' in ports, lanes=lanes)
+        except ValueError as e:
+            print(f"{stem}: skipped ({e})")
+            continue
+        status = '✓' if not report['mismatches'] else '✗'
+        print(f"{stem}: {status} {report['checked']} checks over {report['lanes']} lanes"
+              + (f", first mismatch: {report['first_mismatch']}" if report['mismatches'] else ""))
+
+if __name__ == "__main__":
+    main()
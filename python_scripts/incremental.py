@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import sqlite3
+
+class IncrementalState:
+    """SQLite record of the inputs each stage of each design last ran on
+
+    A stage is up to date when the hash of its current inputs (sources of
+    the design and of every file it instantiates from, generated
+    testbench, tool script and binaries) equals the stored one; its
+    stored result is then reused instead of rerunning it.
+    """
+
+    def __init__(self, path=".incremental_state.sqlite"):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS stages (
+                file TEXT,
+                stage TEXT,
+                input_hash TEXT,
+                result TEXT,
+                updated REAL,
+                PRIMARY KEY (file, stage)
+            )""")
+        self.db.commit()
+
+    def lookup(self, file, stage, digest):
+        """Stored result of a stage if it last ran on these inputs, else None"""
+        row = self.db.execute("SELECT input_hash, result FROM stages "
+                              "WHERE file = ? AND stage = ?", (file, stage)).fetchone()
+        if row is None or row[0] != digest:
+            return None
+        return json.loads(row[1])
+
+    def store(self, file, stage, digest, result):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO stages VALUES (?, ?, ?, ?, ?)",
+                            (file, stage, digest, json.dumps(result), time.time()))
+
+    def prune(self, files):
+        """Forget designs that are no longer in files"""
+        keep = set(files)
+        stale = [(file,) for (file,) in self.db.execute("SELECT DISTINCT file FROM stages")
+                 if file not in keep]
+        with self.db:
+            self.db.executemany("DELETE FROM stages WHERE file = ?", stale)
+
+    def close(self):
+        self.db.close()
+
+def read_sources(index, path):
+    """Source of path followed by every file it instantiates modules from"""
+    parts = []
+    for source in [path] + index.dependencies(path):
+        with open(source, 'r') as f:
+            parts.append(f"// ---- {source} ----\n{f.read()}")
+    return "\n".join(parts)
+
+def snapshot(directory, suffix=".v"):
+    """{name: (mtime, size)} of the matching files in directory"""
+    files = {}
+    for entry in os.scandir(directory):
+        if entry.name.endswith(suffix):
+            st = entry.stat()
+            files[entry.name] = (st.st_mtime_ns, st.st_size)
+    return files
+
+def watch(directory, interval=1.0, suffix=".v"):
+    """Poll directory and yield the sorted names that changed since last time
+
+    Added, modified and deleted files all count. A change is reported
+    once the directory has been quiet for one interval, so an editor
+    saving several files produces a single round.
+    """
+    previous = snapshot(directory, suffix)
+    while True:
+        time.sleep(interval)
+        current = snapshot(directory, suffix)
+        if current == previous:
+            continue
+        while True:
+            time.sleep(interval)
+            settled = snapshot(directory, suffix)
+            if settled == current:
+                break
+            current = settled
+        changed = sorted(name for name in set(previous) | set(current)
+                         if previous.get(name) != current.get(name))
+        previous = current
+        yield changed
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import tempfile
+import supervisor
+from module_index import parse_modules
+
+class Linter:
+    """Syntax/elaboration-only checks that never write a simulation image
+
+    The iverilog backend compiles with `-t null`; the yosys backend only
+    runs the `read_verilog` front end. Every invocation runs in its own
+    scratch directory, so concurrent checks never share files. Many files
+    are checked in one invocation; errors are attributed to files from the
+    tool's `file:line:` messages, and a failing group with no attributable
+    error is bisected until the broken files are found. Files declaring
+    the same module name (e.g. LLM variants of one `register`) would
+    clash in one compilation unit, so they go to separate invocations.
+    """
+
+    BACKENDS = ("iverilog", "yosys")
+
+    def __init__(self, backend="iverilog"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown lint backend {backend!r}")
+        self.backend = backend
+
+    def command(self, paths):
+        if self.backend == "iverilog":
+            return ['iverilog', '-t', 'null'] + paths
+        script = "; ".join(f"read_verilog {path}" for path in paths)
+        return ['yosys', '-q', '-p', script]
+
+    def _invoke(self, paths):
+        with tempfile.TemporaryDirectory(prefix="lint_") as scratch:
+            result = supervisor.run_tool(self.command(paths), "lint",
+                                         paths[0] if len(paths) == 1 else f"{len(paths)} files",
+                                         cwd=scratch)
+        if result.killed:
+            return False, f"{' '.join(self.command(paths)[:1])} {result.describe()}\n"
+        return result.returncode == 0, result.stdout + result.stderr
+
+    def _attribute(self, paths, output):
+        """Map error lines in the tool output to the paths they name"""
+        errors = {}
+        for line in output.splitlines():
+            match = re.match(r'^(?:ERROR: )?(.+?):(\d+):', line)
+            if 'warning' in line.lower():
+                continue
+            if match and match.group(1) in paths:
+                errors.setdefault(match.group(1), []).append(line)
+        return errors
+
+    def check_file(self, path):
+        """Check one file; returns (ok, messages)"""
+        return self.check_files([path])[path]
+
+    def check_files(self, paths):
+        """Check many files; returns {path: (ok, messages)}
+
+        Paths are given to the tools as absolute paths and reported back
+        exactly as passed in.
+        """
+        absolute = {os.path.abspath(p): p for p in paths}
+        results = {}
+        for group in self._separate(list(absolute)):
+            self._check_group(group, results)
+        return {absolute[p]: results[p] for p in absolute}
+
+    def _separate(self, paths):
+        """Split paths into groups in which no module name is declared twice"""
+        groups = []
+        for path in paths:
+            try:
+                with open(path, 'r', errors='replace') as f:
+                    names = {module['name'] for module in parse_modules(f.read())}
+            except OSError:
+                names = set()
+            for group, declared in groups:
+                if not names & declared:
+                    group.append(path)
+                    declared |= names
+                    break
+            else:
+                groups.append(([path], set(names)))
+        return [group for group, _ in groups]
+
+    def _check_group(self, paths, results):
+        if not paths:
+            return
+        try:
+            ok, output = self._invoke(paths)
+        except Exception as e:
+            for path in paths:
+                results[path] = (False, str(e))
+            return
+        if ok:
+            for path in paths:
+                results[path] = (True, "")
+            return
+        if len(paths) == 1:
+            results[paths[0]] = (False, output)
+            return
+
+        errors = self._attribute(paths, output)
+        for path, lines in errors.items():
+            results[path] = (False, "\n".join(lines))
+        remaining = [p for p in paths if p not in errors]
+        if errors:
+            self._check_group(remaining, results)
+        else:
+            half = len(remaining) // 2
+            self._check_group(remaining[:half], results)
+            self._check_group(remaining[half:], results)
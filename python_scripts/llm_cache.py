@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+class CacheMissError(Exception):
+    """Raised in replay mode when a prompt has no cached response"""
+
+class PromptCache:
+    """SQLite cache of LLM responses keyed by prompt and sampling settings
+
+    Modes:
+      read-write  serve hits, call the API on a miss and store the result
+      replay      serve hits only; a miss raises CacheMissError, so reruns
+                  are deterministic and never touch the network
+      refresh     always call the API and overwrite the stored response
+    """
+
+    MODES = ("read-write", "replay", "refresh")
+
+    def __init__(self, path=".llm_cache.sqlite", mode="read-write",
+                 max_entries=10000, max_bytes=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}, expected one of {self.MODES}")
+        self.path = path
+        self.mode = mode
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                size INTEGER,
+                created REAL,
+                last_used REAL,
+                hit_count INTEGER DEFAULT 0
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_last_used "
+                        "ON responses(last_used)")
+        self.db.commit()
+
+    def key(self, prompt, model, temperature, max_tokens):
+        """Hash the rendered prompt together with the sampling settings"""
+        data = json.dumps([prompt, model, temperature, max_tokens])
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get(self, key):
+        """Return the cached response text for key, or None"""
+        if self.mode == "refresh":
+            self.misses += 1
+            return None
+        with self.lock:
+            row = self.db.execute("SELECT response FROM responses WHERE key = ?",
+                                  (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                if self.mode == "replay":
+                    raise CacheMissError(f"No cached response for {key[:12]} in replay mode")
+                return None
+            self.db.execute("UPDATE responses SET last_used = ?, hit_count = hit_count + 1 "
+                            "WHERE key = ?", (time.time(), key))
+            self.db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, model, response):
+        """Store a response and evict old entries if over the limits"""
+        if self.mode == "replay":
+            return
+        now = time.time()
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO responses "
+                            "(key, model, response, size, created, last_used) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (key, model, response, len(response.encode()), now, now))
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        count, size = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        excess = count - self.max_entries if self.max_entries else 0
+        if excess > 0:
+            self.db.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                            "ORDER BY last_used LIMIT ?)", (excess,))
+        if self.max_bytes and size > self.max_bytes:
+            rows = self.db.execute("SELECT key, size FROM responses ORDER BY last_used")
+            victims = []
+            for key, entry_size in rows:
+                if size <= self.max_bytes:
+                    break
+                victims.append((key,))
+                size -= entry_size
+            self.db.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def stats(self):
+        """Return session hit/miss counters and the stored totals"""
+        with self.lock:
+            count, size = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': count, 'bytes': size}
+
+    def close(self):
+        self.db.close()
@@ -6,6 +6,25 @@ LLM_SETTINGS = {
     "model": "claude-3-opus-20240229"  # or your chosen model
 }
 
+# Limits for the concurrent (asyncio) generation path
+ASYNC_SETTINGS = {
+    "max_concurrency": 4,        # requests in flight at once
+    "requests_per_second": 1.0,  # token bucket refill rate
+    "burst": 4,                  # token bucket capacity
+    "max_retries": 5,
+    "backoff_base": 1.0,         # seconds, doubled on every retry
+    "backoff_max": 30.0
+}
+
+# Opt-in on-disk cache of responses (see llm_cache.PromptCache)
+LLM_CACHE = {
+    "enabled": False,
+    "path": ".llm_cache.sqlite",
+    "mode": "read-write",        # or "replay" / "refresh"
+    "max_entries": 10000,
+    "max_bytes": None
+}
+
 VERILOG_CONSTRAINTS = {
     "use_posedge": True,
     "require_registers": True,
@@ -13,6 +32,13 @@ VERILOG_CONSTRAINTS = {
     "max_width": 32
 }
 
+# Static screening of responses against VERILOG_CONSTRAINTS before they
+# are saved (see screening.py); rejected responses never reach the tools
+SCREENING = {
+    "enabled": True,
+    "auto_repair": True          # drop delays and $display-style calls
+}
+
 # Template for prompting LLM
 VERILOG_PROMPT_TEMPLATE = """
 Create a Verilog module that meets these requirements:
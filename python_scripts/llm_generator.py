@@ -2,80 +2,256 @@
 
 import os
 import json
-import anthropic
+import time
+import random
+import asyncio
 from datetime import datetime
-from llm_config import LLM_SETTINGS, VERILOG_PROMPT_TEMPLATE  # Changed this line
+from llm_config import LLM_SETTINGS, VERILOG_PROMPT_TEMPLATE, ASYNC_SETTINGS, LLM_CACHE  # Changed this line
+from llm_config import VERILOG_CONSTRAINTS, SCREENING
+from llm_cache import PromptCache
+from screening import screen
+import tracing
+
+TRANSIENT_ERRORS = ("APIConnectionError", "APITimeoutError", "RateLimitError",
+                    "InternalServerError", "OverloadedError")
+
+def is_transient_error(error):
+    """Return True for API errors that are worth retrying"""
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    return type(error).__name__ in TRANSIENT_ERRORS
+
+class TokenBucket:
+    """Asyncio token bucket limiting the request start rate"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class RequestLimiter:
+    """Concurrency cap plus token bucket shared by one batch of requests"""
+
+    def __init__(self, settings=ASYNC_SETTINGS):
+        self.settings = settings
+        self.semaphore = asyncio.Semaphore(settings["max_concurrency"])
+        self.bucket = TokenBucket(settings["requests_per_second"], settings["burst"])
 
 class VerilogGenerator:
-    def __init__(self):
-        self.client = anthropic.Anthropic()
+    def __init__(self, client=None, async_client=None, cache=None):
+        """Create a generator
+
+        Both clients are injectable; anything with a compatible
+        `messages.create` works, so tests can pass a stub. When no async
+        client is given, the async path runs the sync client in a thread.
+        The response cache defaults to llm_config.LLM_CACHE; in replay
+        mode no client is created at all.
+        """
+        if cache is None and LLM_CACHE["enabled"]:
+            cache = PromptCache(LLM_CACHE["path"], LLM_CACHE["mode"],
+                                LLM_CACHE["max_entries"], LLM_CACHE["max_bytes"])
+        self.cache = cache
+        replay = cache is not None and cache.mode == "replay"
+        if client is None and async_client is None and not replay:
+            import anthropic
+            client = anthropic.Anthropic()
+        self.client = client
+        self.async_client = async_client
         self.output_dir = "verilog_files"
         os.makedirs(self.output_dir, exist_ok=True)
 
+    def _variation_prompt(self, base_specification, i):
+        return VERILOG_PROMPT_TEMPLATE.format(
+            specification=base_specification + f"\nCreate variation {i+1} with unique implementation."
+        )
+
+    def _constraints_prompt(self, specification, constraints):
+        constraint_str = "\n".join([f"- {c}" for c in constraints])
+        return VERILOG_PROMPT_TEMPLATE.format(
+            specification=specification + f"\nAdditional constraints:\n{constraint_str}"
+        )
+
+    def _request(self, prompt):
+        return dict(
+            model=LLM_SETTINGS["model"],
+            max_tokens=LLM_SETTINGS["max_tokens"],
+            temperature=LLM_SETTINGS["temperature"],
+            messages=[{"role": "user", "content": prompt}]
+        )
+
+    def _cache_key(self, prompt):
+        return self.cache.key(prompt, LLM_SETTINGS["model"],
+                              LLM_SETTINGS["temperature"], LLM_SETTINGS["max_tokens"])
+
+    def _complete(self, prompt):
+        if self.cache is not None:
+            text = self.cache.get(self._cache_key(prompt))
+            if text is not None:
+                return text
+        response = self.client.messages.create(**self._request(prompt))
+        text = response.content[0].text
+        if self.cache is not None:
+            self.cache.put(self._cache_key(prompt), LLM_SETTINGS["model"], text)
+        return text
+
+    async def _acomplete(self, prompt, limiter):
+        if self.cache is not None:
+            text = self.cache.get(self._cache_key(prompt))
+            if text is not None:
+                return text
+        text = await self._asend(prompt, limiter)
+        if self.cache is not None:
+            self.cache.put(self._cache_key(prompt), LLM_SETTINGS["model"], text)
+        return text
+
+    async def _asend(self, prompt, limiter):
+        """Send one request under the limiter, retrying transient errors"""
+        settings = limiter.settings
+        for attempt in range(settings["max_retries"] + 1):
+            async with limiter.semaphore:
+                await limiter.bucket.acquire()
+                try:
+                    if self.async_client is not None:
+                        response = await self.async_client.messages.create(
+                            **self._request(prompt))
+                    else:
+                        response = await asyncio.to_thread(
+                            self.client.messages.create, **self._request(prompt))
+                    return response.content[0].text
+                except Exception as e:
+                    if attempt == settings["max_retries"] or not is_transient_error(e):
+                        raise
+            # Back off outside the semaphore so other requests can proceed
+            delay = min(settings["backoff_max"], settings["backoff_base"] * 2 ** attempt)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    def _screen(self, verilog_code, design):
+        """Screened code ready to save, or None if the response is rejected"""
+        if not SCREENING["enabled"]:
+            return verilog_code
+        with tracing.span("screen", design) as s:
+            result = screen(verilog_code, VERILOG_CONSTRAINTS, SCREENING["auto_repair"])
+            s.set(ok=result.ok, errors=len(result.errors), repairs=len(result.repairs))
+        if not result.ok:
+            print(f"✗ Rejected {design}: {result.describe()}")
+            return None
+        return result.code
+
+    def _save_variation(self, i, verilog_code):
+        """Screen and write variation i; returns its record, or None if rejected"""
+        verilog_code = self._screen(verilog_code, f"variation {i+1}")
+        if verilog_code is None:
+            return None
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{self.output_dir}/variant_{i+1}_{timestamp}.v"
+
+        tracing.write_file(filename, verilog_code, "generate", os.path.basename(filename))
+
+        print(f"✓ Generated variation {i+1}, saved to {filename}")
+        return {
+            'filename': filename,
+            'code': verilog_code
+        }
+
     def generate_variations(self, base_specification, num_variations=5):
         """Generate multiple variations of a Verilog design"""
         variations = []
-        
+
         for i in range(num_variations):
             try:
                 # Create prompt for this variation
-                prompt = VERILOG_PROMPT_TEMPLATE.format(
-                    specification=base_specification + f"\nCreate variation {i+1} with unique implementation."
-                )
-                
+                prompt = self._variation_prompt(base_specification, i)
+
                 # Generate using Claude
-                response = self.client.messages.create(
-                    model=LLM_SETTINGS["model"],
-                    max_tokens=LLM_SETTINGS["max_tokens"],
-                    temperature=LLM_SETTINGS["temperature"],
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                
-                verilog_code = response.content[0].text
-                
-                # Save variation to file
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{self.output_dir}/variant_{i+1}_{timestamp}.v"
-                
-                with open(filename, 'w') as f:
-                    f.write(verilog_code)
-                
-                variations.append({
-                    'filename': filename,
-                    'code': verilog_code
-                })
-                
-                print(f"✓ Generated variation {i+1}, saved to {filename}")
-                
+                verilog_code = self._complete(prompt)
+
+                # Screen and save variation to file
+                variation = self._save_variation(i, verilog_code)
+                if variation is not None:
+                    variations.append(variation)
+
             except Exception as e:
                 print(f"Error generating variation {i+1}: {e}")
                 continue
-        
+
         return variations
 
+    async def agenerate_variations(self, base_specification, num_variations=5,
+                                   limiter=None):
+        """Generate variations concurrently; results keep variation order"""
+        limiter = limiter or RequestLimiter()
+        results = await asyncio.gather(
+            *(self.agenerate_variation(base_specification, i, limiter)
+              for i in range(num_variations)))
+        return [r for r in results if r is not None]
+
+    async def agenerate_variation(self, base_specification, i, limiter):
+        """Generate and save variation i; returns its record or None"""
+        try:
+            verilog_code = await self._acomplete(
+                self._variation_prompt(base_specification, i), limiter)
+        except Exception as e:
+            print(f"Error generating variation {i+1}: {e}")
+            return None
+        return self._save_variation(i, verilog_code)
+
     def generate_with_constraints(self, specification, constraints):
         """Generate Verilog with specific constraints"""
-        constraint_str = "\n".join([f"- {c}" for c in constraints])
-        prompt = VERILOG_PROMPT_TEMPLATE.format(
-            specification=specification + f"\nAdditional constraints:\n{constraint_str}"
-        )
-        
+        prompt = self._constraints_prompt(specification, constraints)
+
+        try:
+            return self._complete(prompt)
+        except Exception as e:
+            print(f"Error in generation: {e}")
+            return None
+
+    async def agenerate_with_constraints(self, specification, constraints,
+                                         limiter=None):
+        """Generate Verilog with specific constraints on the async path"""
+        prompt = self._constraints_prompt(specification, constraints)
         try:
-            response = self.client.messages.create(
-                model=LLM_SETTINGS["model"],
-                max_tokens=LLM_SETTINGS["max_tokens"],
-                temperature=LLM_SETTINGS["temperature"],
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            return response.content[0].text
+            return await self._acomplete(prompt, limiter or RequestLimiter())
         except Exception as e:
             print(f"Error in generation: {e}")
             return None
 
+    def generate_concurrently(self, specification, num_variations=5,
+                              constraints=None):
+        """Run variation and constrained generation together on one event loop
+
+        Returns (variations, constrained_design).
+        """
+        async def run():
+            limiter = RequestLimiter()
+            tasks = [self.agenerate_variations(specification, num_variations, limiter)]
+            if constraints:
+                tasks.append(self.agenerate_with_constraints(
+                    specification, constraints, limiter))
+            results = await asyncio.gather(*tasks)
+            return results[0], (results[1] if constraints else None)
+
+        return asyncio.run(run())
+
 def main():
     generator = VerilogGenerator()
-    
+
     # Example usage
     specification = """
     Create an 8-bit register with:
@@ -85,22 +261,22 @@ def main():
     - 8-bit data input
     - 8-bit data output
     """
-    
-    print("Generating Verilog variations...")
-    variations = generator.generate_variations(specification, num_variations=3)
-    
-    print(f"\nGenerated {len(variations)} variations")
-    
+
     # Additional constraints example
     constraints = [
         "Maximum fan-out of 4",
         "Use synchronous reset",
         "Include output buffering"
     ]
-    
-    print("\nGenerating with specific constraints...")
-    constrained_design = generator.generate_with_constraints(specification, constraints)
-    
+
+    print("Generating Verilog variations and constrained design...")
+    variations, constrained_design = generator.generate_concurrently(
+        specification, num_variations=3, constraints=constraints)
+
+    print(f"\nGenerated {len(variations)} variations")
+
+    if constrained_design:
+        constrained_design = generator._screen(constrained_design, "constrained design")
     if constrained_design:
         filename = f"{generator.output_dir}/constrained_design_{datetime.now().strftime('%Y%m%d_%H%M%S')}.v"
         with open(filename, 'w') as f:
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import ast
+import json
+import sqlite3
+import hashlib
+
+TOKEN_RE = re.compile(r"""
+      (?P<space>\s+)
+    | (?P<comment>//[^\n]*|/\*.*?\*/)
+    | (?P<string>"(?:\\.|[^"\\])*")
+    | (?P<directive>`\w+)
+    | (?P<number>\d*\s*'[sS]?[bBoOdDhH]\s*[0-9a-fA-F_xXzZ?]+|\d[\d_]*(?:\.\d+)?)
+    | (?P<ident>[A-Za-z_][\w$]*|\\\S+)
+    | (?P<symbol>\*\*|<<|>>|.)
+""", re.S | re.X)
+
+DIRECTIONS = ("input", "output", "inout")
+NET_TYPES = ("wire", "reg", "logic", "tri", "integer", "signed", "unsigned", "var")
+KEYWORDS = set(DIRECTIONS + NET_TYPES + (
+    "module", "macromodule", "endmodule", "parameter", "localparam", "assign",
+    "always", "initial", "begin", "end", "if", "else", "case", "casez", "casex",
+    "endcase", "for", "while", "repeat", "forever", "function", "endfunction",
+    "task", "endtask", "generate", "endgenerate", "genvar", "default", "posedge",
+    "negedge", "or", "and", "not", "nand", "nor", "xor", "xnor", "buf", "bufif0",
+    "bufif1", "notif0", "notif1", "supply0", "supply1", "defparam", "specify",
+    "endspecify", "real", "time", "event", "always_ff", "always_comb"))
+
+def tokenize(text):
+    """Yield (kind, value, line) for every token, skipping comments"""
+    line = 1
+    for match in TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind not in ("space", "comment"):
+            yield kind, value, line
+        line += value.count("\n")
+
+# Bounds for constant expressions from untrusted (e.g. LLM written) sources
+MAX_SHIFT = 64
+MAX_MAGNITUDE = 1 << 64
+BINARY_OPS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b,
+    ast.LShift: lambda a, b: a << b,
+    ast.RShift: lambda a, b: a >> b,
+}
+
+def _fold(node):
+    """Value of an integer expression tree of BINARY_OPS and unary +/-
+
+    Raises ValueError for anything else (including `**`), shifts by more
+    than MAX_SHIFT and values beyond MAX_MAGNITUDE, so no expression can
+    take long or use much memory.
+    """
+    if isinstance(node, ast.Expression):
+        return _fold(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        value = node.value
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        value = _fold(node.operand)
+        value = -value if isinstance(node.op, ast.USub) else value
+    elif isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPS:
+        left, right = _fold(node.left), _fold(node.right)
+        if isinstance(node.op, (ast.LShift, ast.RShift)) and not 0 <= right <= MAX_SHIFT:
+            raise ValueError("shift count out of range")
+        value = BINARY_OPS[type(node.op)](left, right)
+    else:
+        raise ValueError("unsupported constant expression")
+    if abs(value) > MAX_MAGNITUDE:
+        raise ValueError("constant out of range")
+    return value
+
+def evaluate(expr, params):
+    """Evaluate a constant integer expression over known parameters, or None"""
+    def substitute(match):
+        name = match.group()
+        value = params.get(name)
+        return str(value) if isinstance(value, int) else name
+    text = re.sub(r'[A-Za-z_]\w*', substitute, expr)
+    text = re.sub(r"\d*'[dD](\d+)", r"\1", text).replace("_", "")
+    if not re.fullmatch(r'[\d\s+\-*/%()<>]+', text):
+        return None
+    try:
+        return _fold(ast.parse(text.replace("/", "//").strip(), mode="eval"))
+    except (SyntaxError, ValueError, ZeroDivisionError, RecursionError):
+        return None
+
+class HeaderParser:
+    """Single-pass parser for module headers, port and parameter declarations
+
+    Handles ANSI and non-ANSI port lists, `#(...)` parameter lists, body
+    `parameter`/`localparam` and port declarations, module instantiations,
+    and any number of modules per file. Bodies are otherwise skipped.
+    """
+
+    def __init__(self, text):
+        self.tokens = list(tokenize(text))
+        self.pos = 0
+
+    def peek(self, offset=0):
+        i = self.pos + offset
+        return self.tokens[i][1] if i < len(self.tokens) else None
+
+    def next(self):
+        token = self.tokens[self.pos][1] if self.pos < len(self.tokens) else None
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        if self.peek() == value:
+            self.pos += 1
+            return True
+        return False
+
+    def until(self, stops):
+        """Collect tokens up to (not including) a stop at bracket depth 0"""
+        depth = 0
+        collected = []
+        while self.peek() is not None:
+            token = self.peek()
+            if depth == 0 and token in stops:
+                break
+            if token in ("(", "[", "{"):
+                depth += 1
+            elif token in (")", "]", "}"):
+                if depth == 0:
+                    break
+                depth -= 1
+            collected.append(self.next())
+        return collected
+
+    def parse(self):
+        modules = []
+        while self.peek() is not None:
+            if self.peek() in ("module", "macromodule"):
+                line = self.tokens[self.pos][2]
+                self.next()
+                modules.append(self.parse_module(line))
+            else:
+                self.next()
+        return modules
+
+    def parse_range(self):
+        if not self.expect("["):
+            return None
+        text = " ".join(self.until(("]",)))
+        self.expect("]")
+        return text
+
+    def parse_module(self, line):
+        module = {'name': self.next(), 'line': line, 'parameters': {},
+                  'ports': [], 'instances': []}
+        param_exprs = {}
+
+        if self.expect("#"):
+            self.expect("(")
+            self.parse_parameters(param_exprs, (")",))
+            self.expect(")")
+
+        declared = {}
+        order = []
+        if self.expect("("):
+            self.parse_port_list(declared, order)
+            self.expect(")")
+        self.expect(";")
+
+        # Body: only declarations and instantiations are of interest
+        while self.peek() is not None and self.peek() != "endmodule":
+            token = self.peek()
+            if token in ("parameter", "localparam"):
+                self.next()
+                self.parse_parameters(param_exprs, (";",))
+            elif token in DIRECTIONS:
+                self.parse_port_declaration(declared)
+            elif (self.tokens[self.pos][0] == "ident" and token not in KEYWORDS
+                  and self.is_instantiation()):
+                module['instances'].append(self.next())
+                self.until((";",))
+            else:
+                self.next()
+                continue
+            self.expect(";")
+        self.expect("endmodule")
+
+        params = self.resolve_parameters(param_exprs)
+        module['parameters'] = params
+        for name in order:
+            port = declared.get(name, {'name': name, 'direction': None,
+                                       'net_type': None, 'range': None})
+            module['ports'].append(self.finish_port(port, params))
+        return module
+
+    def is_instantiation(self):
+        """Check for `type [#(...)] name (` starting at the current token"""
+        i = self.pos + 1
+        if i < len(self.tokens) and self.tokens[i][1] == "#":
+            depth = 0
+            i += 1
+            while i < len(self.tokens):
+                value = self.tokens[i][1]
+                depth += value == "("
+                depth -= value == ")"
+                i += 1
+                if depth == 0:
+                    break
+        return (i + 1 < len(self.tokens) and self.tokens[i][0] == "ident"
+                and self.tokens[i + 1][1] in ("(", "["))
+
+    def parse_parameters(self, param_exprs, stops):
+        while self.peek() is not None and self.peek() not in stops:
+            if self.peek() in ("parameter", "localparam", ",") or self.peek() in NET_TYPES:
+                self.next()
+                continue
+            if self.peek() == "[":
+                self.parse_range()
+                continue
+            name = self.next()
+            if self.expect("="):
+                param_exprs[name] = " ".join(self.until(stops + (",",)))
+
+    def parse_port_list(self, declared, order):
+        direction = net_type = rng = None
+        while self.peek() is not None and self.peek() != ")":
+            token = self.peek()
+            if token == ",":
+                self.next()
+            elif token in DIRECTIONS:
+                direction = self.next()
+                net_type = None
+                rng = None
+            elif token in NET_TYPES:
+                net_type = self.next() if net_type is None else net_type + " " + self.next()
+            elif token == "[":
+                rng = self.parse_range()
+            elif token == ".":
+                # Named port expression .name(expr)
+                self.next()
+                order.append(self.next())
+                self.until((",",))
+            else:
+                name = self.next()
+                order.append(name)
+                if direction is not None:
+                    declared[name] = {'name': name, 'direction': direction,
+                                      'net_type': net_type, 'range': rng}
+
+    def parse_port_declaration(self, declared):
+        direction = self.next()
+        net_type = None
+        rng = None
+        while self.peek() is not None and self.peek() != ";":
+            token = self.peek()
+            if token in NET_TYPES:
+                net_type = self.next() if net_type is None else net_type + " " + self.next()
+            elif token == "[":
+                rng = self.parse_range()
+            elif token == ",":
+                self.next()
+            elif token == "=":
+                self.next()
+                self.until((",", ";"))
+            else:
+                name = self.next()
+                declared[name] = {'name': name, 'direction': direction,
+                                  'net_type': net_type, 'range': rng}
+
+    def resolve_parameters(self, param_exprs):
+        params = {}
+        for _ in range(len(param_exprs) + 1):
+            for name, expr in param_exprs.items():
+                value = evaluate(expr, params)
+                params[name] = value if value is not None else expr
+        return params
+
+    def finish_port(self, port, params):
+        port = dict(port, msb=None, lsb=None, width=1 if port['range'] is None else None)
+        if port['range'] is not None and ":" in port['range']:
+            msb_text, lsb_text = port['range'].split(":", 1)
+            port['msb'] = evaluate(msb_text, params)
+            port['lsb'] = evaluate(lsb_text, params)
+            if port['msb'] is not None and port['lsb'] is not None:
+                port['width'] = abs(port['msb'] - port['lsb']) + 1
+        return port
+
+def parse_modules(text):
+    """Parse every module header in Verilog source text"""
+    return HeaderParser(text).parse()
+
+class ModuleIndex:
+    """Persistent SQLite index of the modules declared in Verilog files
+
+    Entries are keyed by file path and revalidated on access: an unchanged
+    size and mtime is trusted, otherwise the content hash decides whether
+    the file has to be reparsed. Module lookups by name hit an index, so
+    they stay cheap as the corpus grows.
+    """
+
+    def __init__(self, path=".module_index.sqlite"):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime REAL,
+                size INTEGER,
+                sha256 TEXT
+            )""")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS modules (
+                name TEXT,
+                path TEXT,
+                position INTEGER,
+                data TEXT
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS modules_name ON modules(name)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS modules_path ON modules(path)")
+        self.db.commit()
+
+    def _update(self, path):
+        """Reparse path if it changed since it was indexed"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+            self.db.execute("DELETE FROM modules WHERE path = ?", (path,))
+            self.db.commit()
+            return
+        row = self.db.execute("SELECT mtime, size, sha256 FROM files WHERE path = ?",
+                              (path,)).fetchone()
+        if row and row[0] == st.st_mtime and row[1] == st.st_size:
+            return
+
+        with open(path, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                            (path, st.st_mtime, st.st_size, digest))
+            if row and row[2] == digest:
+                return
+            self.db.execute("DELETE FROM modules WHERE path = ?", (path,))
+            modules = parse_modules(content.decode(errors='replace'))
+            self.db.executemany("INSERT INTO modules VALUES (?, ?, ?, ?)",
+                                [(m['name'], path, i, json.dumps(m))
+                                 for i, m in enumerate(modules)])
+
+    def refresh(self, directory, suffix=".v"):
+        """Bring every file under directory up to date and drop deleted ones"""
+        present = set()
+        for entry in os.scandir(directory):
+            if entry.name.endswith(suffix):
+                present.add(entry.path)
+                self._update(entry.path)
+        prefix = os.path.join(directory, "")
+        for (path,) in self.db.execute("SELECT path FROM files").fetchall():
+            if path.startswith(prefix) and path not in present:
+                self._update(path)
+
+    def modules_in(self, path):
+        """Return the modules declared in a file, in source order"""
+        self._update(path)
+        rows = self.db.execute("SELECT data FROM modules WHERE path = ? ORDER BY position",
+                               (path,))
+        return [json.loads(data) for (data,) in rows]
+
+    def top_module(self, path):
+        """Return the first module declared in a file, or None"""
+        modules = self.modules_in(path)
+        return modules[0] if modules else None
+
+    def find(self, name):
+        """Return [(path, module)] for every indexed module called name"""
+        rows = self.db.execute("SELECT path, data FROM modules WHERE name = ?", (name,))
+        return [(path, json.loads(data)) for path, data in rows]
+
+    def dependencies(self, path):
+        """Files declaring the modules instantiated from path, transitively
+
+        Only indexed files are searched, so refresh() the directory first.
+        When several files declare a module, the one named after it wins.
+        Unresolved names (primitives, missing files) are skipped.
+        """
+        found = []
+        seen = {path}
+        pending = [path]
+        while pending:
+            modules = self.modules_in(pending.pop())
+            local = {module['name'] for module in modules}
+            for module in modules:
+                for name in module['instances']:
+                    if name in local:
+                        continue
+                    paths = sorted(p for p, _ in self.find(name))
+                    named = [p for p in paths
+                             if os.path.splitext(os.path.basename(p))[0] == name]
+                    for dependency in (named or paths)[:1]:
+                        if dependency not in seen:
+                            seen.add(dependency)
+                            found.append(dependency)
+                            pending.append(dependency)
+        return found
+
+    def all_modules(self):
+        """Yield (path, module) for every indexed module"""
+        for path, data in self.db.execute("SELECT path, data FROM modules "
+                                          "ORDER BY path, position"):
+            yield path, json.loads(data)
+
+    def close(self):
+        self.db.close()
+
+def main():
+    index = ModuleIndex()
+    index.refresh("verilog_files")
+
+    print("=== Module Index ===")
+    for path, module in index.all_modules():
+        ports = ", ".join(f"{p['direction'] or '?'} {p['name']}[{p['width'] or '?'}]"
+                          for p in module['ports'])
+        print(f"{path}: {module['name']}({ports})")
+        if module['instances']:
+            print(f"  instantiates: {', '.join(module['instances'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import json
+import glob
+from array import array
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
+
+# Constant bits in Yosys JSON are strings; they get negative bit IDs
+CONST_BITS = {"0": -1, "1": -2, "x": -3, "z": -4}
+
+REGISTER_MARKERS = ("DFF", "DLATCH", "$_SR_")
+OUTPUT_PORTS = ("Y", "Q")
+
+_DECODER = json.JSONDecoder()
+_SKIP_RE = re.compile(r'[\[\]{}"]')
+_STRING_TAIL_RE = re.compile(r'(?:[^"\\]|\\.)*"', re.S)
+
+def is_register_type(type_name):
+    """True for flip-flop and latch cell types, fine-grained or word-level"""
+    upper = type_name.upper()
+    return any(marker.upper() in upper for marker in REGISTER_MARKERS)
+
+class JsonStream:
+    """Pull parser over a JSON file that never holds more than one value
+
+    Objects can be walked key by key with keys(); each key's value must
+    then be consumed with read_value(), skip_value() or a nested keys().
+    Only the values actually read are decoded, and skipped sections are
+    scanned without building any Python objects.
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+
+    def _fill(self):
+        """Append more input, dropping what was consumed; False at EOF"""
+        data = self.f.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return None
+
+    def _expect(self, ch):
+        if self._peek() != ch:
+            raise ValueError(f"Expected {ch!r} in JSON stream, got {self._peek()!r}")
+        self.pos += 1
+
+    def read_value(self):
+        """Decode the next value in full"""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        """Step over the next value without decoding it"""
+        if self._peek() not in ("{", "["):
+            self.read_value()
+            return
+        depth = 0
+        while True:
+            match = _SKIP_RE.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise ValueError("Unexpected end of JSON stream")
+                continue
+            ch = match.group()
+            if ch == '"':
+                tail = _STRING_TAIL_RE.match(self.buf, match.end())
+                if tail is None:
+                    self.pos = match.start()
+                    if not self._fill():
+                        raise ValueError("Unterminated string in JSON stream")
+                    continue
+                self.pos = tail.end()
+                continue
+            self.pos = match.end()
+            depth += 1 if ch in "{[" else -1
+            if depth == 0:
+                return
+
+    def keys(self):
+        """Yield the keys of the next object; the caller consumes each value"""
+        self._expect("{")
+        while True:
+            ch = self._peek()
+            if ch == "}":
+                self.pos += 1
+                return
+            if ch == ",":
+                self.pos += 1
+                continue
+            key = self.read_value()
+            self._expect(":")
+            yield key
+
+def _ranges(start, items):
+    """Concatenate the CSR slices start[i]:start[i+1] for every i in items"""
+    counts = start[items + 1] - start[items]
+    total = int(counts.sum())
+    offsets = np.cumsum(counts) - counts
+    return np.arange(total) - np.repeat(offsets, counts) + np.repeat(start[items], counts)
+
+class Netlist:
+    """One module of a Yosys JSON netlist in flat arrays
+
+    Cells are rows: cell_type holds a code into type_names and the pins
+    of cell i are pin_start[i]:pin_start[i+1] in the pin arrays (CSR).
+    Each pin is a single bit: pin_bit is the net bit ID (negative for
+    constants, see CONST_BITS), pin_port a code into port_names and
+    pin_output whether the cell drives it.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.top = False
+        self.ports = {}
+        self.type_names = []
+        self.port_names = []
+        self._type_codes = {}
+        self._port_codes = {}
+        self._cell_type = array('H')
+        self._pin_start = array('q', [0])
+        self._pin_bit = array('i')
+        self._pin_port = array('H')
+        self._pin_output = array('b')
+
+    def _code(self, names, codes, name):
+        if name not in codes:
+            codes[name] = len(names)
+            names.append(name)
+        return codes[name]
+
+    def add_cell(self, cell):
+        self._cell_type.append(self._code(self.type_names, self._type_codes, cell['type']))
+        directions = cell.get('port_directions', {})
+        for port, bits in cell.get('connections', {}).items():
+            code = self._code(self.port_names, self._port_codes, port)
+            output = directions.get(port, "output" if port in OUTPUT_PORTS else "input") != "input"
+            for bit in bits:
+                self._pin_bit.append(bit if isinstance(bit, int) else CONST_BITS.get(bit, -3))
+                self._pin_port.append(code)
+                self._pin_output.append(output)
+        self._pin_start.append(len(self._pin_bit))
+
+    def add_port(self, name, port):
+        bits = [b if isinstance(b, int) else CONST_BITS.get(b, -3) for b in port.get('bits', [])]
+        self.ports[name] = (port.get('direction', "input"), np.array(bits, dtype=np.int32))
+
+    def finish(self):
+        """Freeze the growable buffers into NumPy arrays"""
+        self.cell_type = np.frombuffer(self._cell_type, dtype=np.uint16)
+        self.pin_start = np.frombuffer(self._pin_start, dtype=np.int64)
+        self.pin_bit = np.frombuffer(self._pin_bit, dtype=np.int32)
+        self.pin_port = np.frombuffer(self._pin_port, dtype=np.uint16)
+        self.pin_output = np.frombuffer(self._pin_output, dtype=np.int8).astype(bool)
+        port_bits = [bits for _, bits in self.ports.values()]
+        top_bit = max([int(self.pin_bit.max()) if len(self.pin_bit) else -1] +
+                      [int(b.max()) for b in port_bits if len(b)])
+        self.n_bits = max(top_bit + 1, 0)
+        self.pin_cell = np.repeat(np.arange(self.n_cells),
+                                  np.diff(self.pin_start)).astype(np.int64)
+        return self
+
+    @property
+    def n_cells(self):
+        return len(self.cell_type)
+
+    def register_mask(self):
+        """Per-cell bool: True for flip-flops and latches"""
+        codes = np.array([is_register_type(t) for t in self.type_names] or [False])
+        return codes[self.cell_type] if self.n_cells else np.zeros(0, dtype=bool)
+
+    def histogram(self):
+        """Cell count per cell type"""
+        counts = np.bincount(self.cell_type, minlength=len(self.type_names))
+        return {name: int(counts[code]) for code, name in enumerate(self.type_names)}
+
+    def register_bits(self):
+        """Number of stored bits (Q pins of register cells)"""
+        if "Q" not in self._port_codes:
+            return 0
+        regs = self.register_mask()[self.pin_cell]
+        return int(np.count_nonzero(regs & (self.pin_port == self._port_codes["Q"])))
+
+    def fanout(self):
+        """Sinks per net bit: cell input pins plus output port bits"""
+        sinks = self.pin_bit[~self.pin_output]
+        sinks = [sinks[sinks >= 0]]
+        for direction, bits in self.ports.values():
+            if direction != "input":
+                sinks.append(bits[bits >= 0])
+        return np.bincount(np.concatenate(sinks).astype(np.int64), minlength=self.n_bits)
+
+    def max_fanout(self):
+        """Return (bit, fanout) of the most loaded net bit"""
+        fanout = self.fanout()
+        if not len(fanout):
+            return None, 0
+        bit = int(fanout.argmax())
+        return bit, int(fanout[bit])
+
+    def levelize(self):
+        """Topological level of every combinational cell
+
+        Registers, primary inputs and constants are level sources. Runs
+        Kahn's algorithm a whole frontier at a time, so each level costs
+        a few vectorized operations. Registers and cells on combinational
+        loops get level -1.
+        """
+        n = self.n_cells
+        comb = ~self.register_mask()
+        pin_comb = comb[self.pin_cell]
+        valid = self.pin_bit >= 0
+
+        driver = np.full(self.n_bits, -1, dtype=np.int64)
+        drives = self.pin_output & valid & pin_comb
+        driver[self.pin_bit[drives]] = self.pin_cell[drives]
+
+        reads = ~self.pin_output & valid & pin_comb
+        src = driver[self.pin_bit[reads]]
+        dst = self.pin_cell[reads]
+        edge = src >= 0
+        src, dst = src[edge], dst[edge]
+
+        indegree = np.bincount(dst, minlength=n)
+        order = np.argsort(src, kind='stable')
+        succ = dst[order]
+        succ_start = np.searchsorted(src[order], np.arange(n + 1))
+
+        level = np.full(n, -1, dtype=np.int64)
+        frontier = np.flatnonzero(comb & (indegree == 0))
+        depth = 0
+        while len(frontier):
+            level[frontier] = depth
+            targets, counts = np.unique(succ[_ranges(succ_start, frontier)],
+                                        return_counts=True)
+            indegree[targets] -= counts
+            frontier = targets[indegree[targets] == 0]
+            depth += 1
+        return level
+
+    def logic_depth(self):
+        """Longest register-to-register/port path in gates, and loop cells"""
+        level = self.levelize()
+        comb = ~self.register_mask()
+        loops = int(np.count_nonzero(comb & (level < 0)))
+        return (int(level.max()) + 1 if len(level) and level.max() >= 0 else 0), loops
+
+    def summary(self):
+        depth, loops = self.logic_depth()
+        bit, fanout = self.max_fanout()
+        return {'module': self.name, 'cells': self.n_cells, 'pins': len(self.pin_bit),
+                'bits': self.n_bits, 'cell_types': self.histogram(),
+                'register_bits': self.register_bits(), 'max_fanout': fanout,
+                'max_fanout_bit': bit, 'logic_depth': depth, 'loop_cells': loops}
+
+def load_netlists(path, chunk_size=CHUNK_SIZE):
+    """Stream a Yosys `write_json` file into {module name: Netlist}
+
+    Memory stays proportional to the array storage: cells are decoded one
+    at a time, and netnames, attributes and other sections are skipped.
+    """
+    netlists = {}
+    with open(path, 'r') as f:
+        stream = JsonStream(f, chunk_size)
+        for key in stream.keys():
+            if key != "modules":
+                stream.skip_value()
+                continue
+            for name in stream.keys():
+                netlist = Netlist(name)
+                for section in stream.keys():
+                    if section == "attributes":
+                        attributes = stream.read_value()
+                        netlist.top = str(attributes.get('top', 0)) not in ("0", "")
+                    elif section == "ports":
+                        for port in stream.keys():
+                            netlist.add_port(port, stream.read_value())
+                    elif section == "cells":
+                        for _ in stream.keys():
+                            netlist.add_cell(stream.read_value())
+                    else:
+                        stream.skip_value()
+                netlists[name] = netlist.finish()
+    return netlists
+
+def load_netlist(path, module=None):
+    """Load the named module, else the top module, else the last one"""
+    netlists = load_netlists(path)
+    if module is not None:
+        return netlists[module]
+    tops = [n for n in netlists.values() if n.top]
+    if tops:
+        return tops[0]
+    return list(netlists.values())[-1] if netlists else None
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join("synthesis_results", "*.json")))
+
+    print("=== Netlist Analysis ===")
+    for path in paths:
+        netlist = load_netlist(path)
+        if netlist is None:
+            print(f"{path}: no modules")
+            continue
+        s = netlist.summary()
+        types = ", ".join(f"{t} {c}" for t, c in sorted(s['cell_types'].items()))
+        print(f"{os.path.basename(path)}: {s['module']}: {s['cells']} cells ({types})")
+        print(f"  registers: {s['register_bits']} bits, max fanout: {s['max_fanout']}, "
+              f"logic depth: {s['logic_depth']}"
+              + (f", {s['loop_cells']} cells on loops" if s['loop_cells'] else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import queue
+import asyncio
+import threading
+from llm_config import ASYNC_SETTINGS
+from llm_generator import RequestLimiter
+
+_DONE = object()
+
+class VerificationPipeline:
+    """Stream variants through generation, syntax check and synthesis
+
+    Each stage runs its own workers and hands records to the next stage
+    through a bounded queue, so a slow stage blocks the one before it
+    instead of letting work pile up. Generation runs on an asyncio loop
+    (bounded by gen_workers concurrent requests); the checking stages are
+    thread pools. Every finished record is written as one JSON line as
+    soon as it leaves the pipeline.
+    """
+
+    def __init__(self, generator, verifier, gen_workers=4, check_workers=2,
+                 synth_workers=2, queue_size=8, output=None):
+        self.generator = generator
+        self.verifier = verifier
+        self.gen_workers = gen_workers
+        self.check_workers = check_workers
+        self.synth_workers = synth_workers
+        self.queue_size = queue_size
+        self.output = output
+
+    def _generate(self, specification, num_variations, out_q, done_q):
+        settings = dict(ASYNC_SETTINGS, max_concurrency=self.gen_workers)
+
+        async def produce(i, limiter):
+            start = time.time()
+            variation = await self.generator.agenerate_variation(specification, i, limiter)
+            record = {'index': i + 1, 'generated': variation is not None,
+                      'file': None, 'syntax_ok': None, 'synthesis_ok': None,
+                      'generate_time': time.time() - start}
+            if variation is None:
+                await asyncio.to_thread(done_q.put, record)
+            else:
+                record['file'] = os.path.basename(variation['filename'])
+                # Blocks while the checking stage is behind
+                await asyncio.to_thread(out_q.put, record)
+
+        async def run():
+            limiter = RequestLimiter(settings)
+            await asyncio.gather(*(produce(i, limiter) for i in range(num_variations)))
+
+        asyncio.run(run())
+
+    def _check(self, in_q, out_q, done_q):
+        while True:
+            record = in_q.get()
+            if record is _DONE:
+                return
+            start = time.time()
+            record['syntax_ok'] = self.verifier.verify_syntax(record['file'])
+            record['syntax_time'] = time.time() - start
+            (out_q if record['syntax_ok'] else done_q).put(record)
+
+    def _synthesize(self, in_q, done_q):
+        while True:
+            record = in_q.get()
+            if record is _DONE:
+                return
+            start = time.time()
+            record['synthesis_ok'] = self.verifier.verify_synthesis(record['file'], top=None)
+            record['synthesis_time'] = time.time() - start
+            done_q.put(record)
+
+    def _stage(self, target, count, args, downstream):
+        """Start count workers; once all exit, close the downstream queue"""
+        workers = [threading.Thread(target=target, args=args, daemon=True)
+                   for _ in range(count)]
+        for worker in workers:
+            worker.start()
+
+        def close():
+            for worker in workers:
+                worker.join()
+            for _ in range(downstream[1]):
+                downstream[0].put(_DONE)
+
+        closer = threading.Thread(target=close, daemon=True)
+        closer.start()
+        return closer
+
+    def run(self, specification, num_variations=5):
+        """Run the pipeline, yielding each finished record as it completes"""
+        check_q = queue.Queue(self.queue_size)
+        synth_q = queue.Queue(self.queue_size)
+        done_q = queue.Queue()
+
+        self._stage(self._generate, 1,
+                    (specification, num_variations, check_q, done_q),
+                    (check_q, self.check_workers))
+        self._stage(self._check, self.check_workers,
+                    (check_q, synth_q, done_q), (synth_q, self.synth_workers))
+        self._stage(self._synthesize, self.synth_workers,
+                    (synth_q, done_q), (done_q, 1))
+
+        out = self.output if self.output is not None else sys.stdout
+        while True:
+            record = done_q.get()
+            if record is _DONE:
+                return
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            yield record
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+import sys
+import gzip
+import time
+import uuid
+import sqlite3
+import argparse
+from synthesis_stats import COUNT_FIELDS
+
+METRICS = tuple(COUNT_FIELDS.values())
+
+class QoRStore:
+    """Indexed SQLite store of synthesis quality-of-results records
+
+    One row per synthesized design per run, keyed by module, source hash
+    and run ID, with every `stat` count as a column and the per-type cell
+    counts in a side table. Raw Yosys logs are only kept (gzip-compressed)
+    for failed runs. Trend and top-N queries hit indexes instead of
+    rescanning log files.
+    """
+
+    def __init__(self, path=".qor_store.sqlite"):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                started REAL,
+                label TEXT
+            )""")
+        columns = ", ".join(f"{metric} INTEGER" for metric in METRICS)
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS synth (
+                id INTEGER PRIMARY KEY,
+                run_id TEXT,
+                module TEXT,
+                file TEXT,
+                source_hash TEXT,
+                ok INTEGER,
+                cached INTEGER,
+                created REAL,
+                {columns},
+                log BLOB
+            )""")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS cell_types (
+                synth_id INTEGER,
+                type TEXT,
+                count INTEGER
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS synth_module ON synth(module, created)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS synth_run ON synth(run_id)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS synth_cells ON synth(cells)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS synth_source ON synth(source_hash)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS cell_types_synth ON cell_types(synth_id)")
+        self.db.commit()
+
+    def start_run(self, label=None):
+        """Register a new run and return its ID"""
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        with self.db:
+            self.db.execute("INSERT INTO runs VALUES (?, ?, ?)", (run_id, time.time(), label))
+        return run_id
+
+    def record(self, run_id, module, file, source_hash, ok, stat, log_text=None,
+               cached=False):
+        """Store one synthesis result; the log is kept only if it failed"""
+        stat = stat or {}
+        log = gzip.compress(log_text.encode()) if log_text and not ok else None
+        values = [stat.get(metric) for metric in METRICS]
+        with self.db:
+            cursor = self.db.execute(
+                f"INSERT INTO synth (run_id, module, file, source_hash, ok, cached, created, "
+                f"{', '.join(METRICS)}, log) VALUES ({', '.join('?' * (len(METRICS) + 8))})",
+                [run_id, module, file, source_hash, int(bool(ok)), int(cached), time.time()]
+                + values + [log])
+            synth_id = cursor.lastrowid
+            self.db.executemany("INSERT INTO cell_types VALUES (?, ?, ?)",
+                                [(synth_id, cell_type, count)
+                                 for cell_type, count in stat.get('cell_types', {}).items()])
+        return synth_id
+
+    def _metric(self, metric):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+        return metric
+
+    def trend(self, module, metric="cells", limit=100):
+        """[(run_id, created, value)] for the last `limit` runs, oldest first"""
+        rows = self.db.execute(
+            f"SELECT run_id, created, {self._metric(metric)} FROM synth "
+            "WHERE module = ? AND ok = 1 ORDER BY created DESC LIMIT ?",
+            (module, limit)).fetchall()
+        return rows[::-1]
+
+    def cell_type_trend(self, module, cell_type, limit=100):
+        """[(run_id, created, count)] of one cell type, oldest first"""
+        rows = self.db.execute(
+            "SELECT s.run_id, s.created, COALESCE(c.count, 0) FROM synth s "
+            "LEFT JOIN cell_types c ON c.synth_id = s.id AND c.type = ? "
+            "WHERE s.module = ? AND s.ok = 1 ORDER BY s.created DESC LIMIT ?",
+            (cell_type, module, limit)).fetchall()
+        return rows[::-1]
+
+    def top(self, n=20, metric="cells", run_id=None):
+        """Largest designs by metric: [(module, value, run_id)]
+
+        Uses each module's latest successful result, or the results of
+        one run when run_id is given.
+        """
+        metric = self._metric(metric)
+        if run_id is not None:
+            return self.db.execute(
+                f"SELECT module, {metric}, run_id FROM synth WHERE run_id = ? AND ok = 1 "
+                f"ORDER BY {metric} DESC LIMIT ?", (run_id, n)).fetchall()
+        return self.db.execute(
+            f"SELECT module, {metric}, run_id FROM synth WHERE id IN "
+            "(SELECT MAX(id) FROM synth WHERE ok = 1 GROUP BY module) "
+            f"ORDER BY {metric} DESC LIMIT ?", (n,)).fetchall()
+
+    def runs(self, limit=20):
+        """[(run_id, started, label, designs, failures)] newest first"""
+        return self.db.execute(
+            "SELECT r.run_id, r.started, r.label, COUNT(s.id), "
+            "COALESCE(SUM(1 - s.ok), 0) FROM runs r LEFT JOIN synth s ON s.run_id = r.run_id "
+            "GROUP BY r.run_id ORDER BY r.started DESC LIMIT ?", (limit,)).fetchall()
+
+    def failures(self, run_id):
+        """[(id, module, file)] of the failed designs in a run"""
+        return self.db.execute("SELECT id, module, file FROM synth "
+                               "WHERE run_id = ? AND ok = 0", (run_id,)).fetchall()
+
+    def log(self, synth_id):
+        """Decompressed Yosys log of a failed result, or None"""
+        row = self.db.execute("SELECT log FROM synth WHERE id = ?", (synth_id,)).fetchone()
+        return gzip.decompress(row[0]).decode() if row and row[0] else None
+
+    def close(self):
+        self.db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the synthesis QoR store")
+    parser.add_argument('--store', default=".qor_store.sqlite")
+    sub = parser.add_subparsers(dest='command', required=True)
+    trend = sub.add_parser('trend', help="metric history of one module")
+    trend.add_argument('module')
+    trend.add_argument('--metric', default="cells")
+    trend.add_argument('--cell-type', help="track one cell type instead of a metric")
+    trend.add_argument('--limit', type=int, default=100)
+    top = sub.add_parser('top', help="largest designs")
+    top.add_argument('-n', type=int, default=20)
+    top.add_argument('--metric', default="cells")
+    top.add_argument('--run')
+    sub.add_parser('runs', help="recent runs")
+    log = sub.add_parser('log', help="print the stored log of a failed result")
+    log.add_argument('id', type=int)
+    args = parser.parse_args()
+
+    store = QoRStore(args.store)
+    if args.command == 'trend':
+        rows = (store.cell_type_trend(args.module, args.cell_type, args.limit)
+                if args.cell_type else store.trend(args.module, args.metric, args.limit))
+        for run_id, created, value in rows:
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created))}  "
+                  f"{run_id}  {value}")
+    elif args.command == 'top':
+        for module, value, run_id in store.top(args.n, args.metric, args.run):
+            print(f"{value:>10}  {module}  ({run_id})")
+    elif args.command == 'runs':
+        for run_id, started, label, designs, failures in store.runs():
+            print(f"{run_id}  {designs} designs, {failures} failed"
+                  + (f"  {label}" if label else ""))
+    elif args.command == 'log':
+        text = store.log(args.id)
+        if text is None:
+            print(f"No log stored for result {args.id}")
+            sys.exit(1)
+        print(text)
+
+if __name__ == "__main__":
+    main()
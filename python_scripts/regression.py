@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import tracing
+import supervisor
+import sim_coverage
+
+class RegressionRunner:
+    """Simulate many designs with one iverilog compile and one vvp run
+
+    Each design's modules are renamed with a per-design prefix (r0_, r1_,
+    ...) so files that declare the same module name can share a compile.
+    Every testbench tags its output with [rN] and raises `done` instead of
+    calling $finish; a wrapper top finishes once all of them are done, and
+    the tagged stdout is split back into per-design results.
+    """
+
+    def __init__(self, verifier, output_name="regression"):
+        self.verifier = verifier
+        self.output_name = output_name
+
+    def rename_modules(self, source, prefix, names):
+        """Prefix every module in names throughout source, including uses"""
+        if not names:
+            return source
+        pattern = r'\b(' + '|'.join(sorted(names, key=len, reverse=True)) + r')\b'
+        return re.sub(pattern, lambda m: prefix + m.group(1), source)
+
+    def build(self, verilog_files):
+        """Build the combined source; returns (text, {tag: verilog_file})"""
+        parts = ["`timescale 1ns/1ps\n"]
+        tags = {}
+        for i, vfile in enumerate(verilog_files):
+            tag = f"r{i}"
+            prefix = f"{tag}_"
+            module_name, testbench = self.verifier.build_testbench(
+                vfile, prefix=prefix, tag=tag)
+            if not module_name:
+                continue
+
+            # The design's own modules and those of its dependencies all
+            # get the prefix, so shared submodules do not clash either
+            sources = []
+            names = set()
+            for path in ([os.path.join(self.verifier.verilog_dir, vfile)]
+                         + self.verifier.dependencies(vfile)):
+                with open(path, 'r') as f:
+                    sources.append(f.read())
+                names.update(m['name'] for m in self.verifier.index.modules_in(path))
+            parts.append(f"// ---- {vfile} ----")
+            parts.append(self.rename_modules("\n".join(sources), prefix, names))
+            parts.append(testbench)
+            if vfile in self.verifier.plans:
+                self.verifier.plans[vfile].write_vectors()
+            tags[tag] = (vfile, f"{prefix}{module_name}_tb")
+
+        instances = [f"    {tb} {tag} ();" for tag, (_, tb) in tags.items()]
+        done = " && ".join(f"{tag}.done" for tag in tags) or "1"
+        parts.append(f"""
+module {self.output_name}_top;
+{chr(10).join(instances)}
+
+    initial begin
+        wait ({done});
+        $finish;
+    end
+endmodule
+""")
+        return "\n".join(parts), {tag: vfile for tag, (vfile, _) in tags.items()}
+
+    def demux(self, stdout, tags):
+        """Split tagged simulator output into {verilog_file: lines}"""
+        lines = {vfile: [] for vfile in tags.values()}
+        for line in stdout.splitlines():
+            match = re.match(r'^\[(r\d+)\] (.*)$', line)
+            if match and match.group(1) in tags:
+                lines[tags[match.group(1)]].append(match.group(2))
+        return lines
+
+    def run(self, verilog_files):
+        """Simulate all files together; returns {verilog_file: passed}
+
+        If the combined source fails to compile, every file is rerun on its
+        own with verify_with_icarus so the broken ones can be identified.
+        If the simulation is stopped by a supervisor limit, the designs that
+        had not finished are rerun the same way.
+        """
+        verilog_files = list(verilog_files)
+        text, tags = self.build(verilog_files)
+        passed = {vfile: False for vfile in verilog_files}
+        for vfile in verilog_files:
+            if vfile not in tags.values():
+                print(f"Failed to generate testbench for {vfile}")
+
+        source_path = os.path.join(self.verifier.testbench_dir,
+                                   f"{self.output_name}_tb.v")
+        output_path = os.path.join(self.verifier.synthesis_dir,
+                                   f"{self.output_name}.vvp")
+        tracing.write_file(source_path, text, "testbench", self.output_name)
+
+        cmd = ['iverilog', '-o', output_path, source_path]
+        print(f"Running command: {' '.join(cmd)}")
+        try:
+            result = supervisor.run_tool(cmd, "compile", self.output_name)
+        except Exception as e:
+            print(f"Error compiling regression: {e}")
+            return passed
+
+        if result.returncode != 0:
+            print("Combined compilation failed, falling back to per-file runs")
+            print(result.stderr)
+            for vfile in tags.values():
+                passed[vfile] = self.verifier.verify_with_icarus(vfile)
+            return passed
+
+        result = supervisor.run_tool(['vvp', output_path], "simulate", self.output_name)
+        lines = self.demux(result.stdout, tags)
+        if result.killed:
+            # One hung design stalls everything; rerun the unfinished ones alone
+            print(f"Combined simulation {result.describe()}, "
+                  "rerunning unfinished designs on their own")
+        for vfile, output in lines.items():
+            finished = "DONE" in output
+            if result.killed and not finished:
+                passed[vfile] = self.verifier.verify_with_icarus(vfile)
+                continue
+            report = self.verifier.check_trace(vfile, "\n".join(output)) if finished else None
+            matched = report is None or report['mismatches'] == 0
+            passed[vfile] = (result.returncode == 0 or result.killed) and finished and matched
+            if passed[vfile]:
+                print(f"✓ Verification passed for {vfile}")
+                if report and report.get('coverage'):
+                    print(f"  {sim_coverage.describe(report['coverage'])}")
+            else:
+                print(f"Simulation failed for {vfile}")
+        if result.returncode != 0:
+            print(result.stderr)
+        return passed
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def tool_fingerprint(*tools):
+    """Identify the installed tool binaries without running them
+
+    The resolved path, size and mtime of each executable stand in for its
+    version string, so upgrading a tool invalidates its cached results but
+    computing the key never starts a subprocess.
+    """
+    parts = []
+    for tool in tools:
+        path = shutil.which(tool)
+        if path is None:
+            parts.append(f"{tool}:missing")
+            continue
+        path = os.path.realpath(path)
+        st = os.stat(path)
+        parts.append(f"{tool}:{path}:{st.st_size}:{int(st.st_mtime)}")
+    return "|".join(parts)
+
+def content_key(stage, *parts, tools=()):
+    """Hash a stage name, its inputs and the tool fingerprint"""
+    h = hashlib.sha256()
+    for part in (stage, tool_fingerprint(*tools)) + parts:
+        data = part.encode() if isinstance(part, str) else part
+        h.update(len(data).to_bytes(8, 'little'))
+        h.update(data)
+    return h.hexdigest()
+
+def file_hash(path):
+    """sha256 of a file's contents, or None if it cannot be read"""
+    h = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+class ResultCache:
+    """Content-addressed on-disk cache of verification results
+
+    Each entry lives in <cache_dir>/<key[:2]>/<key>/ and holds entry.json
+    plus copies of the artifacts the stage produced, so a hit can restore
+    a deleted .vvp or netlist without rerunning the tools; an artifact
+    whose contents differ from the stored copy (e.g. a netlist left over
+    from an earlier source version) is overwritten as well. The least
+    recently used entries are evicted once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=".verify_cache", max_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, stage, *parts, tools=()):
+        """Hash a stage name, its inputs and the tool fingerprint"""
+        return content_key(stage, *parts, tools=tools)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key):
+        """Return the cached entry for key, restoring its artifacts, or None"""
+        entry_dir = self._entry_dir(key)
+        entry_file = os.path.join(entry_dir, "entry.json")
+        try:
+            with open(entry_file, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        hashes = entry.get('artifact_hashes') or []
+        for i, path in enumerate(entry.get('artifacts', [])):
+            if i < len(hashes) and file_hash(path) == hashes[i]:
+                continue
+            blob = os.path.join(entry_dir, f"artifact_{i}")
+            if not os.path.exists(blob):
+                self.misses += 1
+                return None
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            shutil.copyfile(blob, path)
+
+        os.utime(entry_file)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry, artifacts=()):
+        """Store entry and copies of its artifacts under key"""
+        entry = dict(entry, artifacts=list(artifacts),
+                     artifact_hashes=[file_hash(path) for path in artifacts])
+        parent = os.path.dirname(self._entry_dir(key))
+        os.makedirs(parent, exist_ok=True)
+
+        staging = tempfile.mkdtemp(dir=parent, prefix=".tmp_")
+        try:
+            for i, path in enumerate(artifacts):
+                shutil.copyfile(path, os.path.join(staging, f"artifact_{i}"))
+            with open(os.path.join(staging, "entry.json"), 'w') as f:
+                json.dump(entry, f)
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            os.replace(staging, self._entry_dir(key))
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        entries = []
+        total = 0
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith(".tmp_"):
+                    continue
+                try:
+                    files = list(os.scandir(entry.path))
+                    size = sum(f.stat().st_size for f in files)
+                    used = os.stat(os.path.join(entry.path, "entry.json")).st_mtime
+                except OSError:
+                    continue
+                entries.append((used, size, entry.path))
+                total += size
+
+        entries.sort()
+        for used, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
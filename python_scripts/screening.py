@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+import re
+import sys
+from llm_config import VERILOG_CONSTRAINTS
+from module_index import tokenize, parse_modules, evaluate, DIRECTIONS, NET_TYPES, KEYWORDS
+
+FENCE_RE = re.compile(r"```[ \t]*([\w+-]*)[^\n]*\n(.*?)(?:```|\Z)", re.S)
+VERILOG_TAGS = ("", "verilog", "v", "systemverilog", "sv")
+
+# Constructs no synthesis flow accepts; a design using them is rejected
+NON_SYNTHESIZABLE = {
+    "fork": "fork/join block", "wait": "wait statement", "forever": "forever loop",
+    "force": "force statement", "release": "release statement",
+    "deassign": "deassign statement", "real": "real variable", "realtime": "realtime variable",
+    "event": "named event", "$finish": "$finish", "$stop": "$stop",
+    "$random": "$random", "$urandom": "$urandom", "$time": "$time", "$realtime": "$realtime",
+}
+# Simulation-only system tasks; repaired by turning the call into a null statement
+SIMULATION_TASKS = ("$display", "$write", "$monitor", "$strobe", "$dumpfile", "$dumpvars")
+DELAY_RE = re.compile(r"#\s*(?:\d[\d_]*(?:\.\d+)?|\(\s*\d[\d_]*(?:\.\d+)?\s*\))(?:\s*[munpf]?s\b)?")
+# What may precede a delay control: an assignment, the end of a previous
+# statement or event control, or a keyword that starts a statement.
+# `mod #(16) u0 (...)` and `module m #(...)` follow an identifier instead.
+DELAY_AFTER = "=;:)"
+DELAY_AFTER_KEYWORDS = ("assign", "begin", "end", "else", "initial", "always")
+
+class ScreenResult:
+    """Outcome of screening one response
+
+    `code` is the extracted (and possibly repaired) source, `errors` the
+    violations that reject it and `repairs` what was fixed on the way.
+    """
+
+    def __init__(self, code, errors, repairs):
+        self.code = code
+        self.errors = errors
+        self.repairs = repairs
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def describe(self):
+        return "; ".join(self.errors) if self.errors else "ok"
+
+def extract_code(text):
+    """Verilog source from an LLM response: fenced block, else module..endmodule
+
+    Prose around the code is dropped. Of several fenced blocks the first
+    one tagged as Verilog (or untagged) that declares a module wins.
+    """
+    blocks = [(tag.lower(), body) for tag, body in FENCE_RE.findall(text)]
+    for tag, body in blocks:
+        if tag in VERILOG_TAGS and re.search(r"\bmodule\b", body):
+            return body.strip() + "\n"
+    start = re.search(r"^[ \t]*(?:`\w+[^\n]*\n\s*)*(?:macro)?module\b", text, re.M)
+    end = None
+    for end in re.finditer(r"\bendmodule\b", text):
+        pass
+    if start is None or end is None or end.end() < start.start():
+        return text.strip() + "\n"
+    return text[start.start():end.end()].strip() + "\n"
+
+def _strip_simulation_tasks(code):
+    """Replace `$display(...);` style calls with a null statement"""
+    repaired = 0
+    for task in SIMULATION_TASKS:
+        pattern = re.compile(re.escape(task) + r"\b\s*(?:\((?:[^;\"]|\"(?:\\.|[^\"\\])*\")*?\))?\s*;")
+        code, count = pattern.subn(";", code)
+        repaired += count
+    return code, repaired
+
+def _strip_delays(code):
+    """Remove delay controls in statement or assignment position
+
+    A `#(...)` after an identifier is a parameter override (or a module's
+    parameter list) and is kept.
+    """
+    removed = 0
+    def strip(match):
+        nonlocal removed
+        end = match.start()
+        while end > 0 and code[end - 1].isspace():
+            end -= 1
+        start = end
+        while start > 0 and (code[start - 1].isalnum() or code[start - 1] in "_$"):
+            start -= 1
+        if end and code[end - 1] not in DELAY_AFTER and \
+                code[start:end] not in DELAY_AFTER_KEYWORDS:
+            return match.group()
+        removed += 1
+        return ""
+    return DELAY_RE.sub(strip, code), removed
+
+def repair(code):
+    """Remove simulation-only constructs; returns (code, [repairs])"""
+    repairs = []
+    code, count = _strip_simulation_tasks(code)
+    if count:
+        repairs.append(f"removed {count} simulation-only system task call(s)")
+    code, count = _strip_delays(code)
+    if count:
+        repairs.append(f"removed {count} delay control(s)")
+    return code, repairs
+
+def _tokens(code):
+    """tokenize() with system task names ($display, ...) joined into one token"""
+    tokens = []
+    for kind, value, line in tokenize(code):
+        if tokens and tokens[-1][1] == "$" and kind == "ident":
+            tokens[-1] = ("ident", "$" + value, line)
+        else:
+            tokens.append((kind, value, line))
+    return tokens
+
+def _sensitivity_lists(tokens):
+    """(line, [tokens]) of every `always @(...)` event list"""
+    lists = []
+    for i, (kind, value, line) in enumerate(tokens):
+        if value not in ("always", "always_ff", "always_latch") or i + 2 >= len(tokens):
+            continue
+        if tokens[i + 1][1] != "@":
+            continue
+        if tokens[i + 2][1] != "(":
+            lists.append((line, [tokens[i + 2][1]]))
+            continue
+        depth = 0
+        events = []
+        for _, token, _ in tokens[i + 2:]:
+            depth += token == "("
+            depth -= token == ")"
+            if depth == 0:
+                break
+            events.append(token)
+        lists.append((line, events[1:]))
+    return lists
+
+def _assignment_target(tokens, k):
+    """Variable assigned by the `=` (or `<=`) at tokens[k], or None
+
+    tokenize() splits `<=` into two symbols, so `<` before `=` marks a
+    nonblocking assignment; `==`, `!=` and `>=` are comparisons.
+    """
+    before = tokens[k - 1][1]
+    if before in ("=", "!", ">") or (k + 1 < len(tokens) and tokens[k + 1][1] == "="):
+        return None
+    m = k - 2 if before == "<" else k - 1
+    if tokens[m][1] == "]":
+        while m > 0 and tokens[m][1] != "[":
+            m -= 1
+        m -= 1
+    return tokens[m][1] if tokens[m][0] == "ident" else None
+
+def _clocked_targets(tokens):
+    """Names assigned inside always blocks triggered by a clock edge"""
+    targets = set()
+    i = 0
+    while i < len(tokens):
+        if tokens[i][1] in ("always", "always_ff") and i + 2 < len(tokens) \
+                and tokens[i + 1][1] == "@" and tokens[i + 2][1] == "(":
+            j = i + 2
+            depth = 0
+            edge = False
+            while j < len(tokens):
+                depth += tokens[j][1] == "("
+                depth -= tokens[j][1] == ")"
+                edge = edge or tokens[j][1] in ("posedge", "negedge")
+                j += 1
+                if depth == 0:
+                    break
+            # The block runs to the matching `end`, or is one statement
+            nesting = 0
+            k = j
+            while k < len(tokens):
+                token = tokens[k][1]
+                if token in ("begin", "case", "casez", "casex", "fork"):
+                    nesting += 1
+                elif token in ("end", "endcase", "join"):
+                    nesting -= 1
+                elif token == "=" and edge:
+                    target = _assignment_target(tokens, k)
+                    if target is not None:
+                        targets.add(target)
+                k += 1
+                # A statement ends there unless an `else` branch follows
+                if nesting == 0 and token in (";", "end", "endcase") and \
+                        (k >= len(tokens) or tokens[k][1] != "else"):
+                    break
+            i = k
+            continue
+        i += 1
+    return targets
+
+def _registered_names(tokens):
+    """_clocked_targets plus nets continuously assigned from one of them
+
+    `assign q = r;` with a clocked `r` is the usual registered-output
+    style; chains of such assigns are followed as well.
+    """
+    registered = _clocked_targets(tokens)
+    aliases = []
+    for i, (kind, value, line) in enumerate(tokens):
+        if value == "assign" and i + 4 < len(tokens) and tokens[i + 1][0] == "ident" \
+                and tokens[i + 2][1] == "=" and tokens[i + 3][0] == "ident" \
+                and tokens[i + 4][1] == ";":
+            aliases.append((tokens[i + 1][1], tokens[i + 3][1]))
+    changed = True
+    while changed:
+        changed = False
+        for target, source in aliases:
+            if source in registered and target not in registered:
+                registered.add(target)
+                changed = True
+    return registered
+
+def _declared_widths(tokens, params):
+    """(name, width, line) for every vector declared with a constant range"""
+    widths = []
+    for i, (kind, value, line) in enumerate(tokens):
+        if value not in DIRECTIONS + NET_TYPES or i + 1 >= len(tokens):
+            continue
+        if i > 0 and tokens[i - 1][1] in DIRECTIONS + NET_TYPES:
+            continue  # `input wire [..]` is one declaration
+        j = i + 1
+        while j < len(tokens) and tokens[j][1] in NET_TYPES:
+            j += 1
+        if j >= len(tokens) or tokens[j][1] != "[":
+            continue
+        k = j
+        while k < len(tokens) and tokens[k][1] != "]":
+            k += 1
+        text = " ".join(token for _, token, _ in tokens[j + 1:k])
+        if ":" not in text or k + 1 >= len(tokens):
+            continue
+        msb, lsb = (evaluate(part, params) for part in text.split(":", 1))
+        if msb is not None and lsb is not None:
+            widths.append((tokens[k + 1][1], abs(msb - lsb) + 1, line))
+    return widths
+
+def check(code, constraints=VERILOG_CONSTRAINTS):
+    """Rule violations of code against the constraints, as messages"""
+    errors = []
+    tokens = _tokens(code)
+    values = [value for _, value, _ in tokens]
+    modules = parse_modules(code)
+    if not modules:
+        return ["no module declaration found"]
+    if values.count("endmodule") != len(modules):
+        errors.append("unterminated module (missing endmodule)")
+    for opening, closing in (("(", ")"), ("[", "]"), ("begin", "end")):
+        if values.count(opening) != values.count(closing):
+            errors.append(f"unbalanced {opening}/{closing}")
+
+    for i, (kind, value, line) in enumerate(tokens):
+        if value in NON_SYNTHESIZABLE:
+            errors.append(f"line {line}: {NON_SYNTHESIZABLE[value]} is not synthesizable")
+        elif value in SIMULATION_TASKS:
+            errors.append(f"line {line}: {value} is simulation-only")
+        elif value == "#" and i + 1 < len(tokens) and tokens[i + 1][0] == "number" \
+                and not (i > 0 and tokens[i - 1][0] == "ident"
+                         and tokens[i - 1][1] not in KEYWORDS):
+            # `mod #8 inst (...)` overrides a parameter; only delays are rejected
+            errors.append(f"line {line}: delay control is not synthesizable")
+
+    for line, events in _sensitivity_lists(tokens):
+        edges = [token for token in events if token in ("posedge", "negedge")]
+        if constraints.get("use_posedge") and "negedge" in edges:
+            errors.append(f"line {line}: negedge clocking (only posedge is allowed)")
+        if constraints.get("synchronous_design") and len(edges) > 1:
+            errors.append(f"line {line}: several edges in one event list "
+                          f"(asynchronous reset/set is not allowed)")
+
+    params = {}
+    for module in modules:
+        params.update({k: v for k, v in module['parameters'].items() if isinstance(v, int)})
+    if constraints.get("max_width"):
+        for name, width, line in _declared_widths(tokens, params):
+            if width > constraints["max_width"]:
+                errors.append(f"line {line}: {name} is {width} bits wide "
+                              f"(max_width {constraints['max_width']})")
+
+    if constraints.get("require_registers"):
+        registered = _registered_names(tokens)
+        for module in modules:
+            for port in module['ports']:
+                if port['direction'] == "output" and port['name'] not in registered:
+                    errors.append(f"output {port['name']} of {module['name']} "
+                                  f"is not driven by a clocked register")
+    return errors
+
+def screen(text, constraints=VERILOG_CONSTRAINTS, auto_repair=True):
+    """Extract the code from an LLM response, repair it and check it"""
+    code = extract_code(text)
+    repairs = []
+    if code.strip() != text.strip():
+        repairs.append("extracted code from the response")
+    if auto_repair:
+        code, fixed = repair(code)
+        repairs.extend(fixed)
+    return ScreenResult(code, check(code, constraints), repairs)
+
+def main():
+    """Screen the given files (or stdin) and report; exit 1 on any rejection"""
+    paths = sys.argv[1:] or ["-"]
+    rejected = 0
+    for path in paths:
+        if path == "-":
+            text = sys.stdin.read()
+        else:
+            with open(path, 'r') as f:
+                text = f.read()
+        result = screen(text)
+        if result.ok:
+            print(f"✓ {path}" + (f" ({', '.join(result.repairs)})" if result.repairs else ""))
+        else:
+            rejected += 1
+            print(f"✗ {path}:")
+            for error in result.errors:
+                print(f"  {error}")
+    sys.exit(1 if rejected else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+
+import os
+import numpy as np
+import sim_coverage
+
+MAX_WIDTH = 64
+TRACE_CHUNK = 1 << 18
+MAX_REPORTED_MISMATCHES = 1000
+
+HEX_CHARS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+HEX_LUT = np.full(256, 255, dtype=np.uint8)
+for _digit in "0123456789abcdef":
+    HEX_LUT[ord(_digit)] = int(_digit, 16)
+    HEX_LUT[ord(_digit.upper())] = int(_digit, 16)
+
+def supports(ports, width):
+    """True if a module looks like a register the reference model covers"""
+    return ('clk' in ports and 'data_in' in ports and 'data_out' in ports
+            and width is not None and 1 <= width <= MAX_WIDTH)
+
+def make_stimulus(n_cycles, width, has_reset, has_enable, seed=0):
+    """Random per-cycle stimulus as NumPy arrays
+
+    Reset is asserted in the first cycle (when present) and then on
+    roughly 5% of cycles; enable is high about half the time.
+    """
+    rng = np.random.default_rng(seed)
+    data_in = rng.integers(0, 1 << width, size=n_cycles, dtype=np.uint64)
+    rst_n = rng.random(n_cycles) >= 0.05
+    en = rng.random(n_cycles) < 0.5
+    if has_reset and n_cycles:
+        rst_n[0] = False
+    if not has_reset:
+        rst_n[:] = True
+    if not has_enable:
+        en[:] = True
+    return {'rst_n': rst_n, 'en': en, 'data_in': data_in}
+
+def reference_model(stimulus, has_reset, has_enable):
+    """Expected data_out after every clock edge, computed without a loop
+
+    Mirrors verilog_generator.generate_register_variant: a synchronous
+    active-low reset wins over enable, and with enable low the register
+    holds. Each cycle's output is the value loaded at the most recent
+    reset/load cycle, found with a running maximum over load indices.
+    Returns (expected, valid); cycles before the first load are invalid
+    because the register still holds X. Stimulus arrays may also be 2-D
+    (lanes, cycles), with each lane an independent run.
+    """
+    data_in = stimulus['data_in']
+    n = data_in.shape[-1]
+    load = (np.asarray(stimulus['en'], dtype=bool) if has_enable
+            else np.ones(data_in.shape, dtype=bool))
+    value = data_in.copy()
+    if has_reset:
+        reset = ~np.asarray(stimulus['rst_n'], dtype=bool)
+        load = load | reset
+        value[reset] = 0
+
+    last = np.maximum.accumulate(np.where(load, np.arange(n), -1), axis=-1)
+    valid = last >= 0
+    loaded = np.take_along_axis(value, np.maximum(last, 0), axis=-1)
+    expected = np.where(valid, loaded, 0).astype(np.uint64)
+    return expected, valid
+
+def build_testbench(module_name, width, has_reset, has_enable, stimulus,
+                    trace_path, prefix="", tag=None, coverage=None):
+    """Build a testbench that applies the stimulus and traces data_out
+
+    Each cycle sets the inputs, waits for the rising edge and writes
+    data_out to trace_path in fixed-width hex, one line per cycle. With
+    coverage settings, the remaining steps are skipped once coverage
+    reaches its target or saturates (see sim_coverage).
+    """
+    digits = (width + 3) // 4
+    label = f"[{tag}] " if tag else ""
+    cover_decl = cover_step = ""
+    skip = ""
+    if coverage:
+        cover_decl = (sim_coverage.declarations(width, has_reset, has_enable, coverage)
+                      + "\n    integer cover_cycles = 0;")
+        cover_step = ("\n        cover_cycles = cover_cycles + 1;\n"
+                      + sim_coverage.sample(has_reset, has_enable, "cover_cycles",
+                                            len(stimulus['data_in']), label, " " * 8))
+        skip = "if (!cover_stop) "
+    finish = f'$display("{label}DONE");\n        done = 1;' if tag else "$finish;"
+    steps = "\n".join(
+        f"        step(1'b{int(r)}, 1'b{int(e)}, {width}'h{int(d):0{digits}x});"
+        for r, e, d in zip(stimulus['rst_n'], stimulus['en'], stimulus['data_in']))
+
+    return f"""
+`timescale 1ns/1ps
+
+module {prefix}{module_name}_tb;
+    parameter WIDTH = {width};
+
+    reg clk;
+    reg rst_n;
+    reg en;
+    reg [WIDTH-1:0] data_in;
+    wire [WIDTH-1:0] data_out;
+    integer trace;{chr(10) + "    reg done = 0;" if tag else ""}{cover_decl}
+
+    {prefix}{module_name} uut (
+        .clk(clk),
+        {".rst_n(rst_n)," if has_reset else ""}
+        {".en(en)," if has_enable else ""}
+        .data_in(data_in),
+        .data_out(data_out)
+    );
+
+    initial begin
+        clk = 0;
+        forever #5 clk = ~clk;
+    end
+
+    task step(input r, input e, input [WIDTH-1:0] d);
+    {skip}begin
+        rst_n = r;
+        en = e;
+        data_in = d;
+        @(posedge clk);
+        #1 $fdisplay(trace, "%h", data_out);{cover_step}
+    end
+    endtask
+
+    initial begin
+        trace = $fopen("{trace_path}", "w");
+{steps}
+        $fclose(trace);
+        {finish}
+    end
+endmodule
+"""
+
+def build_memfile_testbench(module_name, width, has_reset, has_enable, depth,
+                            paths, seed, prefix="", tag=None, coverage=None):
+    """Build a testbench that streams $readmemh vectors and checks in place
+
+    The text only depends on the vector count through the DEPTH parameter,
+    so compile time does not grow with the number of cycles. Mismatches
+    (up to MAX_REPORTED_MISMATCHES) are written with $fwrite, followed by
+    a DONE line with the totals; stdout gets a single summary line. With
+    coverage settings, the loop also prints COVER lines and ends early
+    once coverage reaches its target or saturates; the DONE line then
+    counts the cycles actually run.
+    """
+    label = f"[{tag}] " if tag else ""
+    finish = f'$display("{label}DONE");\n        done = 1;' if tag else "$finish;"
+    cover_decl = cover_step = ""
+    condition, ran = "i < DEPTH", "DEPTH"
+    if coverage:
+        cover_decl = sim_coverage.declarations(width, has_reset, has_enable, coverage)
+        cover_step = "\n" + sim_coverage.sample(has_reset, has_enable, "i + 1", "DEPTH", label)
+        condition, ran = "i < DEPTH && !cover_stop", "i"
+
+    return f"""
+`timescale 1ns/1ps
+
+module {prefix}{module_name}_tb;
+    parameter WIDTH = {width};
+    parameter DEPTH = {depth};  // stimulus seed {seed}
+
+    reg clk;
+    reg rst_n;
+    reg en;
+    reg [WIDTH-1:0] data_in;
+    wire [WIDTH-1:0] data_out;{chr(10) + "    reg done = 0;" if tag else ""}
+
+    // ctrl = {{valid, rst_n, en}} per cycle
+    reg [2:0] ctrl [0:DEPTH-1];
+    reg [WIDTH-1:0] data [0:DEPTH-1];
+    reg [WIDTH-1:0] expected [0:DEPTH-1];
+    integer i;
+    integer mismatches;
+    integer report;{cover_decl}
+
+    {prefix}{module_name} uut (
+        .clk(clk),
+        {".rst_n(rst_n)," if has_reset else ""}
+        {".en(en)," if has_enable else ""}
+        .data_in(data_in),
+        .data_out(data_out)
+    );
+
+    initial begin
+        clk = 0;
+        forever #5 clk = ~clk;
+    end
+
+    initial begin
+        $readmemh("{paths['ctrl']}", ctrl);
+        $readmemh("{paths['data']}", data);
+        $readmemh("{paths['expected']}", expected);
+        report = $fopen("{paths['mismatch']}", "w");
+        mismatches = 0;
+
+        for (i = 0; {condition}; i = i + 1) begin
+            rst_n = ctrl[i][1];
+            en = ctrl[i][0];
+            data_in = data[i];
+            @(posedge clk);
+            #1;
+            if (ctrl[i][2] && data_out !== expected[i]) begin
+                mismatches = mismatches + 1;
+                if (mismatches <= {MAX_REPORTED_MISMATCHES})
+                    $fwrite(report, "%0d %h %h\n", i, expected[i], data_out);
+            end{cover_step}
+        end
+
+        $fwrite(report, "DONE %0d %0d\n", {ran}, mismatches);
+        $fclose(report);
+        $display("{label}CHECKED %0d MISMATCHES %0d", {ran}, mismatches);
+        {finish}
+    end
+endmodule
+"""
+
+def write_hex(path, values, width):
+    """Write values as fixed-width hex lines for $readmemh, vectorized"""
+    digits = (width + 3) // 4
+    shifts = (4 * np.arange(digits - 1, -1, -1)).astype(np.uint64)
+    values = np.asarray(values, dtype=np.uint64)
+    with open(path, 'wb') as f:
+        for start in range(0, len(values), TRACE_CHUNK):
+            chunk = values[start:start + TRACE_CHUNK]
+            nibbles = ((chunk[:, None] >> shifts) & np.uint64(0xF)).astype(np.uint8)
+            lines = np.empty((len(chunk), digits + 1), dtype=np.uint8)
+            lines[:, :digits] = HEX_CHARS[nibbles]
+            lines[:, digits] = ord("\n")
+            f.write(lines.tobytes())
+
+def load_mismatches(path, expected, valid, partial=False):
+    """Turn a mismatch report written by the memfile testbench into a report
+
+    With partial, a run that stopped early (coverage-guided) is accepted
+    and only the cycles it ran count as checked.
+    """
+    result = {'cycles': len(expected), 'checked': int(valid.sum()),
+              'mismatches': 0, 'first_mismatch': None}
+    first = None
+    done = None
+    with open(path, 'r') as f:
+        for line in f:
+            fields = line.split()
+            if fields and fields[0] == "DONE":
+                done = fields
+            elif first is None and len(fields) == 3:
+                first = fields
+
+    ran = None if done is None else int(done[1])
+    if partial and ran is not None and 0 < ran < len(expected):
+        result['cycles'] = ran
+        result['checked'] = int(valid[:ran].sum())
+    elif ran != len(expected):
+        result['mismatches'] = max(1, len(expected))
+        result['first_mismatch'] = {'cycle': 0, 'reason': "simulation did not finish"}
+        return result
+    result['mismatches'] = int(done[2])
+    if first is not None:
+        result['first_mismatch'] = {'cycle': int(first[0]),
+                                    'expected': first[1].lstrip("0") or "0",
+                                    'actual': first[2].lstrip("0") or "0"}
+    return result
+
+def load_trace(trace_path, width):
+    """Parse a fixed-width hex trace into (values, unknown) arrays
+
+    Every line has the same length, so the file is viewed as a 2-D byte
+    array and decoded with a lookup table, in bounded-size chunks.
+    """
+    digits = (width + 3) // 4
+    record = digits + 1
+    raw = np.fromfile(trace_path, dtype=np.uint8)
+    if raw.size % record:
+        raise ValueError(f"Malformed trace {trace_path}: size {raw.size} "
+                         f"is not a multiple of {record}")
+    rows = raw.reshape(-1, record)[:, :digits]
+    shifts = (4 * np.arange(digits - 1, -1, -1)).astype(np.uint64)
+
+    values = np.empty(len(rows), dtype=np.uint64)
+    unknown = np.empty(len(rows), dtype=bool)
+    for start in range(0, len(rows), TRACE_CHUNK):
+        nibbles = HEX_LUT[rows[start:start + TRACE_CHUNK]]
+        bad = nibbles == 255
+        unknown[start:start + TRACE_CHUNK] = bad.any(axis=1)
+        nibbles = np.where(bad, 0, nibbles).astype(np.uint64)
+        values[start:start + TRACE_CHUNK] = np.bitwise_or.reduce(nibbles << shifts, axis=1)
+    return values, unknown
+
+def compare(expected, valid, actual, unknown, partial=False):
+    """Compare a simulated trace against the reference in bulk
+
+    With partial, a trace shorter than expected (a run stopped early) is
+    compared over the cycles it covers.
+    """
+    if partial and 0 < len(actual) < len(expected):
+        expected = expected[:len(actual)]
+        valid = valid[:len(actual)]
+    result = {'cycles': len(expected), 'checked': int(valid.sum()),
+              'mismatches': 0, 'first_mismatch': None}
+    if len(actual) != len(expected):
+        result['mismatches'] = abs(len(expected) - len(actual))
+        result['first_mismatch'] = {'cycle': min(len(expected), len(actual)),
+                                    'reason': f"trace has {len(actual)} of "
+                                              f"{len(expected)} cycles"}
+        return result
+
+    bad = valid & (unknown | (actual != expected))
+    result['mismatches'] = int(bad.sum())
+    if result['mismatches']:
+        cycle = int(np.argmax(bad))
+        result['first_mismatch'] = {
+            'cycle': cycle,
+            'expected': f"{int(expected[cycle]):x}",
+            'actual': 'x' if unknown[cycle] else f"{int(actual[cycle]):x}"
+        }
+    return result
+
+class SelfCheckPlan:
+    """Stimulus, expected output and file locations for one design
+
+    In "inline" mode the stimulus is unrolled into the testbench and the
+    full data_out trace is compared in Python. In "memfile" mode the
+    vectors go to hex files read with $readmemh, the testbench compares
+    in place and only mismatches come back. With coverage settings the
+    testbench measures toggle/branch coverage, may stop before n_cycles,
+    and check() adds a 'coverage' report parsed from its output.
+    """
+
+    MODES = ("inline", "memfile")
+
+    def __init__(self, module_name, width, has_reset, has_enable, n_cycles,
+                 base_path, seed=0, mode="memfile", coverage=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown stimulus mode {mode!r}")
+        self.module_name = module_name
+        self.width = width
+        self.has_reset = has_reset
+        self.has_enable = has_enable
+        self.seed = seed
+        self.mode = mode
+        self.coverage = coverage
+        self.paths = {
+            'trace': f"{base_path}_trace.txt",
+            'ctrl': f"{base_path}_ctrl.hex",
+            'data': f"{base_path}_data.hex",
+            'expected': f"{base_path}_exp.hex",
+            'mismatch': f"{base_path}_mismatch.txt",
+        }
+        self.stimulus = make_stimulus(n_cycles, width, has_reset, has_enable, seed)
+        self.expected, self.valid = reference_model(self.stimulus, has_reset, has_enable)
+
+    def testbench(self, prefix="", tag=None):
+        if self.mode == "inline":
+            return build_testbench(self.module_name, self.width, self.has_reset,
+                                   self.has_enable, self.stimulus,
+                                   self.paths['trace'], prefix, tag, self.coverage)
+        return build_memfile_testbench(self.module_name, self.width, self.has_reset,
+                                       self.has_enable, len(self.expected),
+                                       self.paths, self.seed, prefix, tag, self.coverage)
+
+    def write_vectors(self):
+        """Write the $readmemh files (memfile mode only)"""
+        if self.mode != "memfile":
+            return
+        ctrl = ((self.valid.astype(np.uint64) << np.uint64(2)) |
+                (self.stimulus['rst_n'].astype(np.uint64) << np.uint64(1)) |
+                self.stimulus['en'].astype(np.uint64))
+        write_hex(self.paths['ctrl'], ctrl, 3)
+        write_hex(self.paths['data'], self.stimulus['data_in'], self.width)
+        write_hex(self.paths['expected'], self.expected, self.width)
+
+    def check(self, stdout=None):
+        """Read back what the simulation wrote and compare it
+
+        stdout is the simulator output, searched for COVER lines when
+        coverage is enabled.
+        """
+        path = self.paths['trace' if self.mode == "inline" else 'mismatch']
+        if not os.path.exists(path):
+            return {'cycles': len(self.expected), 'checked': 0, 'mismatches': 1,
+                    'first_mismatch': {'cycle': 0, 'reason': "no trace written"}}
+        coverage = None
+        if self.coverage:
+            coverage = sim_coverage.parse(stdout, self.width, self.has_reset,
+                                          self.has_enable, self.coverage, len(self.expected))
+        # A short run is only fine if the testbench itself ended it
+        partial = coverage is not None and coverage['stopped'] is not None
+        if self.mode == "memfile":
+            report = load_mismatches(path, self.expected, self.valid, partial)
+        else:
+            actual, unknown = load_trace(path, self.width)
+            report = compare(self.expected, self.valid, actual, unknown, partial)
+        if self.coverage:
+            report['coverage'] = coverage
+        return report
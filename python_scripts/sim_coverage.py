@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+
+ENV_VAR = "VERILOG_COVERAGE"
+
+# target: percent of bins that ends the run; stall: windows without a
+# new bin that count as saturated (0 never stops on saturation);
+# window: cycles between coverage samples printed by the testbench
+DEFAULTS = {"target": 100.0, "stall": 8, "window": 64}
+
+COVER_RE = re.compile(r"COVER (\d+) (\d+) ([0-9a-fA-FxXzZ]+) ([0-9a-fA-FxXzZ]+) ([01xz]{3})")
+
+_settings = json.loads(os.environ.get(ENV_VAR) or "null")
+
+def configure(settings):
+    """Enable coverage-guided termination (None disables it)
+
+    settings override DEFAULTS; exported through the environment so pool
+    workers and local distributed workers inherit it.
+    """
+    global _settings
+    _settings = None if settings is None else dict(DEFAULTS, **settings)
+    if _settings is None:
+        os.environ.pop(ENV_VAR, None)
+    else:
+        os.environ[ENV_VAR] = json.dumps(_settings)
+
+def settings():
+    return _settings
+
+def branches(has_reset, has_enable):
+    """Control branches of the register that a run should exercise"""
+    return (["reset"] if has_reset else []) + ["load"] + (["hold"] if has_enable else [])
+
+def total_bins(width, has_reset, has_enable):
+    """Rise and fall toggle of every data_out bit plus each branch"""
+    return 2 * width + len(branches(has_reset, has_enable))
+
+def declarations(width, has_reset, has_enable, settings):
+    """Parameters and state the coverage code below needs"""
+    return f"""
+    // Coverage: data_out bit toggles and reset/load/hold branches
+    parameter COVER_BINS = {total_bins(width, has_reset, has_enable)};
+    parameter COVER_TARGET = {int(settings['target'] * 100)};  // hundredths of a percent
+    parameter COVER_STALL = {int(settings['stall'])};
+    parameter COVER_WINDOW = {max(1, int(settings['window']))};
+    reg [WIDTH-1:0] cover_rise = 0;
+    reg [WIDTH-1:0] cover_fall = 0;
+    reg [WIDTH-1:0] cover_last;
+    reg cover_seen = 0;
+    reg cover_reset = 0;
+    reg cover_load = 0;
+    reg cover_hold = 0;
+    reg cover_stop = 0;
+    integer cover_count;
+    integer cover_best = 0;
+    integer cover_idle = 0;
+    integer cover_bit;"""
+
+def sample(has_reset, has_enable, cycle, depth, label="", indent="            "):
+    """Per-cycle coverage update; every COVER_WINDOW cycles print a COVER
+    line and set cover_stop once the target is met or coverage stalls
+
+    cycle is the Verilog expression for the number of cycles applied so
+    far and depth the one for the run length.
+    """
+    if has_reset and has_enable:
+        branch = ("if (!rst_n) cover_reset = 1;\nelse if (en) cover_load = 1;\n"
+                  "else cover_hold = 1;")
+    elif has_reset:
+        branch = "if (!rst_n) cover_reset = 1;\nelse cover_load = 1;"
+    elif has_enable:
+        branch = "if (en) cover_load = 1;\nelse cover_hold = 1;"
+    else:
+        branch = "cover_load = 1;"
+    hits = " + ".join(f"cover_{name}" for name in branches(has_reset, has_enable))
+    code = f"""if (^data_out !== 1'bx) begin
+    if (cover_seen) begin
+        cover_rise = cover_rise | (~cover_last & data_out);
+        cover_fall = cover_fall | (cover_last & ~data_out);
+    end
+    cover_last = data_out;
+    cover_seen = 1;
+end
+{branch}
+if (({cycle}) % COVER_WINDOW == 0 || {cycle} == {depth}) begin
+    cover_count = {hits};
+    for (cover_bit = 0; cover_bit < WIDTH; cover_bit = cover_bit + 1)
+        cover_count = cover_count + cover_rise[cover_bit] + cover_fall[cover_bit];
+    $display("{label}COVER %0d %0d %h %h %b", {cycle}, cover_count,
+             cover_rise, cover_fall, {{cover_reset, cover_load, cover_hold}});
+    if (cover_count > cover_best) begin
+        cover_best = cover_count;
+        cover_idle = 0;
+    end else
+        cover_idle = cover_idle + 1;
+    if (cover_count * 10000 >= COVER_TARGET * COVER_BINS ||
+        (COVER_STALL > 0 && cover_idle >= COVER_STALL))
+        cover_stop = 1;
+end"""
+    return "\n".join(indent + line for line in code.splitlines())
+
+def _bits(text, width):
+    value = int(text, 16) if re.fullmatch(r"[0-9a-fA-F]+", text) else 0
+    return [bit for bit in range(width) if not value >> bit & 1]
+
+def parse(stdout, width, has_reset, has_enable, settings, depth):
+    """Coverage report from the COVER lines a simulation printed, or None
+
+    `history` holds (cycle, covered) per window, so the report shows how
+    quickly coverage grew; `stopped` says why the run ended early
+    ("target" or "saturated"), or is None if it used every cycle.
+    """
+    samples = [match.groups() for match in COVER_RE.finditer(stdout or "")]
+    if not samples:
+        return None
+    cycle, covered, rise, fall, hits = samples[-1]
+    cycle, covered = int(cycle), int(covered)
+    total = total_bins(width, has_reset, has_enable)
+    percent = 100.0 * covered / total
+    history = [(int(s[0]), int(s[1])) for s in samples]
+    stopped = None
+    if cycle < depth:
+        stopped = "target" if percent >= settings['target'] else "saturated"
+    names = ("reset", "load", "hold")
+    missed = [name for name, hit in zip(names, hits)
+              if name in branches(has_reset, has_enable) and hit != "1"]
+    return {'cycles': cycle, 'covered': covered, 'bins': total,
+            'percent': round(percent, 2), 'stopped': stopped,
+            'missing_rise': _bits(rise, width), 'missing_fall': _bits(fall, width),
+            'missing_branches': missed, 'history': history}
+
+def describe(report):
+    """One-line summary of a coverage report"""
+    text = f"coverage {report['percent']:g}% ({report['covered']}/{report['bins']} bins)"
+    if report['stopped']:
+        text += f", stopped after {report['cycles']} cycles ({report['stopped']})"
+    gaps = []
+    if report['missing_branches']:
+        gaps.append("branches " + ", ".join(report['missing_branches']))
+    untoggled = sorted(set(report['missing_rise']) | set(report['missing_fall']))
+    if untoggled:
+        gaps.append(f"{len(untoggled)} untoggled bits")
+    return text + (f"; missing {'; '.join(gaps)}" if gaps else "")
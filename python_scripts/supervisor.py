@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import signal
+import selectors
+import threading
+import subprocess
+import tracing
+
+try:
+    import resource
+except ImportError:  # not available on Windows; limits are then not applied
+    resource = None
+
+ENV_VAR = "VERILOG_TOOL_LIMITS"
+
+# Per-stage limits: wall-clock seconds, CPU seconds, data memory bytes
+# and bytes kept per output stream. None disables a limit.
+DEFAULT_LIMITS = {
+    "compile": {"timeout": 60, "cpu": 60, "memory": 4 << 30, "output": 16 << 20},
+    "simulate": {"timeout": 300, "cpu": 300, "memory": 4 << 30, "output": 64 << 20},
+    "synthesize": {"timeout": 600, "cpu": 600, "memory": 8 << 30, "output": 64 << 20},
+    "lint": {"timeout": 60, "cpu": 60, "memory": 4 << 30, "output": 16 << 20},
+}
+FALLBACK_LIMITS = {"timeout": 600, "cpu": None, "memory": None, "output": 64 << 20}
+
+# Process exit statuses other than "ok" and "failed"
+TIMEOUT = "timeout"
+CPU_LIMIT = "cpu_limit"
+OUTPUT_LIMIT = "output_limit"
+CANCELLED = "cancelled"
+
+_limits = json.loads(os.environ.get(ENV_VAR) or "{}")
+_active = set()
+_lock = threading.Lock()
+_cancelled = threading.Event()
+
+class ToolResult:
+    """Outcome of a supervised run; compatible with subprocess.CompletedProcess
+
+    `status` is "ok", "failed" (non-zero exit), or the limit that stopped
+    the tool: TIMEOUT, CPU_LIMIT, OUTPUT_LIMIT or CANCELLED. Output
+    beyond the stream cap is dropped and `truncated` is set.
+    """
+
+    def __init__(self, args, returncode, stdout, stderr, status, elapsed, truncated=False):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.status = status
+        self.elapsed = elapsed
+        self.truncated = truncated
+
+    @property
+    def killed(self):
+        """True when a limit or cancellation stopped the tool"""
+        return self.status not in ("ok", "failed")
+
+    def describe(self):
+        """One-line reason for a killed run, for failure messages"""
+        if self.status == TIMEOUT:
+            return f"timed out after {self.elapsed:.1f}s"
+        if self.status == CPU_LIMIT:
+            return "exceeded its CPU time limit"
+        if self.status == OUTPUT_LIMIT:
+            return "flooded its output and was stopped"
+        if self.status == CANCELLED:
+            return "was cancelled"
+        return f"exited with code {self.returncode}"
+
+def configure(limits):
+    """Override limits per stage, e.g. {"simulate": {"timeout": 30}}
+
+    Exported through the environment so pool workers inherit it.
+    """
+    for stage, values in limits.items():
+        _limits.setdefault(stage, {}).update(values)
+    os.environ[ENV_VAR] = json.dumps(_limits)
+
+def parse_limit(text):
+    """Parse a "stage.field=value" (or "field=value" for every stage) flag"""
+    key, _, value = text.partition("=")
+    stage, _, field = key.rpartition(".")
+    if field not in FALLBACK_LIMITS or not value:
+        raise ValueError(f"Bad limit {text!r}, expected [stage.]"
+                         f"{'|'.join(FALLBACK_LIMITS)}=VALUE")
+    value = None if value.lower() == "none" else float(value)
+    stages = [stage] if stage else list(DEFAULT_LIMITS)
+    return {s: {field: value} for s in stages}
+
+def limits_for(stage, **overrides):
+    limits = dict(DEFAULT_LIMITS.get(stage, FALLBACK_LIMITS))
+    limits.update(_limits.get(stage, {}))
+    limits.update(overrides)
+    return limits
+
+def _apply_rlimits(pid, cpu, memory):
+    """Limit a freshly spawned tool from the parent
+
+    Done with prlimit after the spawn rather than in preexec_fn, which is
+    unsafe while other threads (the pipeline workers) are running.
+    """
+    if resource is None or not hasattr(resource, "prlimit"):
+        return
+    try:
+        if cpu:
+            resource.prlimit(pid, resource.RLIMIT_CPU, (int(cpu), int(cpu) + 1))
+        if memory:
+            # RLIMIT_DATA rather than RLIMIT_AS: the WebAssembly builds of
+            # Yosys reserve far more address space than they ever touch
+            resource.prlimit(pid, resource.RLIMIT_DATA, (int(memory), int(memory)))
+    except (ProcessLookupError, PermissionError):
+        pass  # the tool already exited
+
+def _kill(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    process.wait()
+
+def cancel():
+    """Kill every running tool; later runs return CANCELLED immediately"""
+    _cancelled.set()
+    with _lock:
+        processes = list(_active)
+    for process in processes:
+        _kill(process)
+
+def reset():
+    _cancelled.clear()
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def interrupt_on_sigterm():
+    """Treat SIGTERM like Ctrl-C, so tools are killed on either
+
+    Pool workers forked afterwards inherit the handler.
+    """
+    signal.signal(signal.SIGTERM, _interrupt)
+
+def run(cmd, stage, cwd=None, **overrides):
+    """Run a tool under the stage's limits and return a ToolResult
+
+    The tool gets its own process group, so a kill also reaches anything
+    it spawned. Output is read incrementally; hitting the wall-clock
+    timeout or the output cap kills the group, as does KeyboardInterrupt.
+    """
+    limits = limits_for(stage, **overrides)
+    start = time.perf_counter()
+    if _cancelled.is_set():
+        return ToolResult(cmd, -signal.SIGKILL, "", "", CANCELLED, 0.0)
+    process = subprocess.Popen(cmd, cwd=cwd, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               start_new_session=True)
+    _apply_rlimits(process.pid, limits["cpu"], limits["memory"])
+    with _lock:
+        _active.add(process)
+    cap = limits["output"]
+    deadline = start + limits["timeout"] if limits["timeout"] else None
+    output = {process.stdout: [], process.stderr: []}
+    kept = {process.stdout: 0, process.stderr: 0}
+    status = None
+    truncated = False
+    selector = selectors.DefaultSelector()
+    try:
+        for stream in output:
+            selector.register(stream, selectors.EVENT_READ)
+        while selector.get_map() and status is None:
+            wait = None if deadline is None else deadline - time.perf_counter()
+            if wait is not None and wait <= 0:
+                status = TIMEOUT
+                break
+            for key, _ in selector.select(wait):
+                chunk = os.read(key.fd, 1 << 16)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    continue
+                stream = key.fileobj
+                if cap is not None and kept[stream] + len(chunk) > cap:
+                    chunk = chunk[:max(0, int(cap) - kept[stream])]
+                    truncated = True
+                    status = OUTPUT_LIMIT
+                output[stream].append(chunk)
+                kept[stream] += len(chunk)
+        if status is None:
+            wait = None if deadline is None else max(0, deadline - time.perf_counter())
+            try:
+                process.wait(wait)
+            except subprocess.TimeoutExpired:
+                status = TIMEOUT
+        if status is not None or _cancelled.is_set():
+            _kill(process)
+    except KeyboardInterrupt:
+        cancel()
+        raise
+    except BaseException:
+        _kill(process)
+        raise
+    finally:
+        selector.close()
+        process.stdout.close()
+        process.stderr.close()
+        with _lock:
+            _active.discard(process)
+
+    if status is None:
+        if _cancelled.is_set() and process.returncode < 0:
+            status = CANCELLED
+        elif process.returncode == -signal.SIGXCPU:
+            status = CPU_LIMIT
+        else:
+            status = "ok" if process.returncode == 0 else "failed"
+    stdout = b"".join(output[process.stdout]).decode(errors="replace")
+    stderr = b"".join(output[process.stderr]).decode(errors="replace")
+    return ToolResult(cmd, process.returncode, stdout, stderr, status,
+                      time.perf_counter() - start, truncated)
+
+def run_tool(cmd, stage, design=None, cwd=None, **overrides):
+    """run() recorded as a tracing span"""
+    with tracing.span(stage, design, os.path.basename(cmd[0]), cmd=" ".join(cmd)) as s:
+        result = run(cmd, stage.split("_")[0], cwd, **overrides)
+        s.set(exit_code=result.returncode, status=result.status,
+              stdout_bytes=len(result.stdout), stderr_bytes=len(result.stderr))
+        return result
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import tracing
+import supervisor
+from batch_synth import BatchSynthesizer, BEGIN_MARKER, END_MARKER
+from selfcheck import SelfCheckPlan, MAX_REPORTED_MISMATCHES
+from synthesis_stats import parse_stat
+from netlist import load_netlist
+from gatesim import spot_check
+from verilog_generator import VerilogGenerator
+
+def parse_widths(text):
+    """Parse "1-64", "4,8,16" or "1-8,32" into a sorted list of widths"""
+    widths = set()
+    for part in text.split(","):
+        low, _, high = part.partition("-")
+        widths.update(range(int(low), int(high or low) + 1))
+    return sorted(widths)
+
+def configurations(widths, resets=(True, False), enables=(True, False)):
+    """Every (width, has_reset, has_enable) combination"""
+    return list(itertools.product(widths, resets, enables))
+
+def config_name(module_name, width, has_reset, has_enable):
+    """Name of one configuration, following generate_register_variant"""
+    return (f"{module_name}_w{width}" + ("_rst" if has_reset else "")
+            + ("_en" if has_enable else ""))
+
+def build_sweep_testbench(module_name, plans):
+    """One testbench that checks every configuration side by side
+
+    A parameterized checker module streams one configuration's $readmemh
+    vectors through a DUT instance with WIDTH/HAS_RESET/HAS_ENABLE
+    overridden, like the memfile testbench does for a single design. The
+    top module instantiates one checker per configuration on a shared
+    clock; DEPTH is a top-level parameter set with `iverilog -P`.
+    """
+    checks = []
+    for i, plan in enumerate(plans):
+        paths = plan.paths
+        checks.append(
+            f"    {module_name}_check #(.WIDTH({plan.width}), "
+            f".HAS_RESET({int(plan.has_reset)}), .HAS_ENABLE({int(plan.has_enable)}), "
+            f".DEPTH(DEPTH),\n"
+            f"        .CTRL_FILE(\"{paths['ctrl']}\"), .DATA_FILE(\"{paths['data']}\"),\n"
+            f"        .EXP_FILE(\"{paths['expected']}\"), "
+            f".REPORT_FILE(\"{paths['mismatch']}\"))\n"
+            f"        c{i} (.clk(clk), .done(done[{i}]));")
+
+    return f"""
+`timescale 1ns/1ps
+
+module {module_name}_check #(
+    parameter WIDTH = 8,
+    parameter HAS_RESET = 1,
+    parameter HAS_ENABLE = 1,
+    parameter DEPTH = 1,
+    parameter CTRL_FILE = "",
+    parameter DATA_FILE = "",
+    parameter EXP_FILE = "",
+    parameter REPORT_FILE = ""
+) (
+    input wire clk,
+    output reg done
+);
+    reg rst_n;
+    reg en;
+    reg [WIDTH-1:0] data_in;
+    wire [WIDTH-1:0] data_out;
+
+    // ctrl = {{valid, rst_n, en}} per cycle
+    reg [2:0] ctrl [0:DEPTH-1];
+    reg [WIDTH-1:0] data [0:DEPTH-1];
+    reg [WIDTH-1:0] expected [0:DEPTH-1];
+    integer i;
+    integer mismatches;
+    integer report;
+
+    {module_name} #(
+        .WIDTH(WIDTH),
+        .HAS_RESET(HAS_RESET),
+        .HAS_ENABLE(HAS_ENABLE)
+    ) uut (
+        .clk(clk),
+        .rst_n(rst_n),
+        .en(en),
+        .data_in(data_in),
+        .data_out(data_out)
+    );
+
+    initial begin
+        done = 0;
+        $readmemh(CTRL_FILE, ctrl);
+        $readmemh(DATA_FILE, data);
+        $readmemh(EXP_FILE, expected);
+        report = $fopen(REPORT_FILE, "w");
+        mismatches = 0;
+
+        for (i = 0; i < DEPTH; i = i + 1) begin
+            rst_n = ctrl[i][1];
+            en = ctrl[i][0];
+            data_in = data[i];
+            @(posedge clk);
+            #1;
+            if (ctrl[i][2] && data_out !== expected[i]) begin
+                mismatches = mismatches + 1;
+                if (mismatches <= {MAX_REPORTED_MISMATCHES})
+                    $fwrite(report, "%0d %h %h\\n", i, expected[i], data_out);
+            end
+        end
+
+        $fwrite(report, "DONE %0d %0d\\n", DEPTH, mismatches);
+        $fclose(report);
+        done = 1;
+    end
+endmodule
+
+module {module_name}_sweep_tb;
+    parameter DEPTH = 1;
+
+    reg clk;
+    wire [{len(plans) - 1}:0] done;
+
+{chr(10).join(checks)}
+
+    initial begin
+        clk = 0;
+        forever #5 clk = ~clk;
+    end
+
+    initial begin
+        wait (&done);
+        $display("SWEEP DONE {len(plans)}");
+        $finish;
+    end
+endmodule
+"""
+
+def sweep_script(source_path, module_name, configs, json_path):
+    """Yosys script that parses once and synthesizes every configuration
+
+    The parsed design is kept with `design -save` and reloaded before each
+    configuration, whose parameters are applied with chparam. Log
+    markers delimit each configuration's output like in batch_synth.
+    """
+    lines = [f"read_verilog {source_path}", "design -save sweep_base"]
+    for width, has_reset, has_enable in configs:
+        name = config_name(module_name, width, has_reset, has_enable)
+        lines.append("design -load sweep_base")
+        lines.append(f"log {BEGIN_MARKER} {name}")
+        lines.append(f"chparam -set WIDTH {width} -set HAS_RESET {int(has_reset)} "
+                     f"-set HAS_ENABLE {int(has_enable)} {module_name}")
+        lines.append(f"synth -top {module_name}")
+        lines.append(f"write_json {json_path(name)}")
+        lines.append("stat")
+        lines.append(f"log {END_MARKER} {name}")
+    return "; ".join(lines)
+
+def synthesize_group(source_path, module_name, work_dir, configs):
+    """Synthesize configurations in one Yosys session per attempt
+
+    Returns {config: {'ok', 'stat', 'json', 'status'}}. If Yosys stops on
+    a configuration, that one fails and the rest go into a new session.
+    """
+    splitter = BatchSynthesizer(work_dir)
+    results = {}
+    pending = list(configs)
+    while pending:
+        names = {config_name(module_name, *config): config for config in pending}
+        script = sweep_script(source_path, module_name, pending, splitter.json_path)
+        timeout = supervisor.limits_for("synthesize")["timeout"]
+        result = supervisor.run_tool(['yosys', '-p', script], "synthesize_sweep",
+                                     f"{len(pending)} configurations",
+                                     timeout=timeout and timeout * len(pending))
+        sections = splitter.split_output(result.stdout)
+        leftover = []
+        for name, config in names.items():
+            if name not in sections:
+                leftover.append(config)
+                continue
+            log_text, finished = sections[name]
+            results[config] = {'ok': finished,
+                               'stat': parse_stat(log_text) if finished else None,
+                               'json': splitter.json_path(name) if finished else None,
+                               'status': "ok" if finished else result.status}
+        if len(leftover) == len(pending) or result.status == supervisor.CANCELLED:
+            # Failed before the first configuration; nothing more to learn
+            for config in leftover:
+                results[config] = {'ok': False, 'stat': None, 'json': None,
+                                   'status': result.status,
+                                   'log': result.stdout + result.stderr}
+            break
+        pending = leftover
+    return results
+
+class ParameterSweep:
+    """Exhaustive (WIDTH, HAS_RESET, HAS_ENABLE) sweep of a parameterized register
+
+    Simulation is one iverilog compile and one vvp run for the whole
+    sweep: every configuration gets its own checker instance with the
+    parameters overridden. Synthesis parses the source once per Yosys
+    session and applies each configuration with chparam; with workers
+    > 1 the configurations are split over that many sessions.
+    """
+
+    def __init__(self, source_path, module_name="register_param",
+                 work_dir="synthesis_results/sweep", cycles=1000, seed=0):
+        self.source_path = source_path
+        self.module_name = module_name
+        self.work_dir = work_dir
+        self.cycles = cycles
+        self.seed = seed
+        os.makedirs(self.work_dir, exist_ok=True)
+
+    def plans(self, configs):
+        return [SelfCheckPlan(self.module_name, width, has_reset, has_enable,
+                              self.cycles,
+                              os.path.join(self.work_dir,
+                                           config_name(self.module_name, width,
+                                                       has_reset, has_enable)),
+                              self.seed)
+                for width, has_reset, has_enable in configs]
+
+    def simulate(self, configs):
+        """Simulate every configuration at once; returns {config: report}"""
+        plans = self.plans(configs)
+        with tracing.span("vectors", self.module_name, count=len(plans)):
+            for plan in plans:
+                plan.write_vectors()
+        testbench_file = os.path.join(self.work_dir, f"{self.module_name}_sweep_tb.v")
+        output_path = os.path.join(self.work_dir, f"{self.module_name}_sweep.vvp")
+        tracing.write_file(testbench_file, build_sweep_testbench(self.module_name, plans),
+                           "testbench", self.module_name)
+
+        cmd = ['iverilog', f"-P{self.module_name}_sweep_tb.DEPTH={self.cycles}",
+               '-o', output_path, self.source_path, testbench_file]
+        print(f"Running command: {' '.join(cmd)}")
+        result = supervisor.run_tool(cmd, "compile", self.module_name)
+        if result.returncode != 0:
+            print(f"Sweep compilation failed: "
+                  f"{result.describe() if result.killed else result.stderr}")
+            return {config: None for config in configs}
+
+        result = supervisor.run_tool(['vvp', output_path], "simulate", self.module_name)
+        if result.returncode != 0:
+            print(f"Sweep simulation failed: "
+                  f"{result.describe() if result.killed else result.stderr}")
+        # Finished checkers wrote their report even if the run was stopped
+        return {config: plan.check() for config, plan in zip(configs, plans)}
+
+    def synthesize(self, configs, workers=1):
+        """Synthesize every configuration; returns {config: outcome}"""
+        groups = [configs[i::workers] for i in range(min(workers, len(configs)))]
+        if len(groups) <= 1:
+            return synthesize_group(self.source_path, self.module_name,
+                                    self.work_dir, configs)
+        results = {}
+        with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+            for outcome in pool.map(synthesize_group, itertools.repeat(self.source_path),
+                                    itertools.repeat(self.module_name),
+                                    itertools.repeat(self.work_dir), groups):
+                results.update(outcome)
+        return results
+
+    def gate_check(self, config, json_file, lanes):
+        width, has_reset, has_enable = config
+        try:
+            report = spot_check(load_netlist(json_file), width, has_reset, has_enable,
+                                self.cycles, lanes, self.seed)
+        except (OSError, ValueError) as e:
+            print(f"Gate-level check skipped for {config_name(self.module_name, *config)}: {e}")
+            return None
+        return report['mismatches'] == 0
+
+    def run(self, configs, simulate=True, synthesize=True, workers=1, gate_lanes=1024):
+        """Simulate and synthesize configs; returns one result dict per config"""
+        results = {config: {'name': config_name(self.module_name, *config),
+                            'width': config[0], 'has_reset': config[1],
+                            'has_enable': config[2], 'simulation_ok': None,
+                            'check': None, 'synthesis_ok': None, 'stat': None,
+                            'gate_ok': None, 'status': None}
+                   for config in configs}
+        if simulate:
+            start = time.time()
+            for config, report in self.simulate(configs).items():
+                results[config]['check'] = report
+                results[config]['simulation_ok'] = bool(report) and report['mismatches'] == 0
+            print(f"Simulated {len(configs)} configurations in one compile "
+                  f"({time.time() - start:.2f}s)")
+        if synthesize:
+            start = time.time()
+            for config, outcome in self.synthesize(configs, workers).items():
+                results[config]['synthesis_ok'] = outcome['ok']
+                results[config]['stat'] = outcome['stat']
+                if outcome['status'] not in ("ok", "failed"):
+                    results[config]['status'] = outcome['status']
+                if outcome['ok'] and gate_lanes:
+                    results[config]['gate_ok'] = self.gate_check(config, outcome['json'],
+                                                                 gate_lanes)
+            print(f"Synthesized {len(configs)} configurations in "
+                  f"{min(workers, len(configs))} Yosys session(s) "
+                  f"({time.time() - start:.2f}s)")
+        return [results[config] for config in configs]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sweep the parameter space of a parameterized register")
+    parser.add_argument('--source', default=None,
+                        help="parameterized register source (default: generate "
+                             "verilog_files/<module>.v)")
+    parser.add_argument('--module', default="register_param")
+    parser.add_argument('--widths', default="1-64", help="e.g. 1-64 or 4,8,16,32")
+    parser.add_argument('--cycles', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                        help="Yosys sessions to split the configurations over")
+    parser.add_argument('--gate-lanes', type=int, default=1024,
+                        help="parallel lanes for the gate-level check (0 skips it)")
+    parser.add_argument('--no-sim', action='store_true')
+    parser.add_argument('--no-synth', action='store_true')
+    args = parser.parse_args()
+
+    source = args.source
+    if source is None:
+        source = VerilogGenerator().write_parameterized_register(args.module)
+        print(f"Wrote {source}")
+    configs = configurations(parse_widths(args.widths))
+    print(f"\n=== Sweeping {len(configs)} configurations of {args.module} ===")
+    start = time.time()
+    results = ParameterSweep(source, args.module, cycles=args.cycles,
+                             seed=args.seed).run(configs, not args.no_sim,
+                                                 not args.no_synth, args.workers,
+                                                 args.gate_lanes)
+
+    print("\n=== Sweep Summary ===")
+    marks = {True: '✓', False: '✗', None: '-'}
+    for result in results:
+        cells = result['stat']['cells'] if result['stat'] else None
+        print(f"{result['name']}: simulation {marks[result['simulation_ok']]}, "
+              f"synthesis {marks[result['synthesis_ok']]}"
+              + (f" ({cells} cells)" if cells is not None else "")
+              + ("" if result['gate_ok'] is None
+                 else f", gates {marks[result['gate_ok']]}")
+              + (f" <{result['status']}>" if result['status'] else ""))
+    failed = [r['name'] for r in results
+              if r['simulation_ok'] is False or r['synthesis_ok'] is False
+              or r['gate_ok'] is False]
+    print(f"{len(results) - len(failed)} of {len(results)} configurations passed "
+          f"in {time.time() - start:.2f}s")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import re
+
+STAT_FIELDS = {
+    "Number of wires": "wires",
+    "Number of wire bits": "wire_bits",
+    "Number of public wires": "public_wires",
+    "Number of public wire bits": "public_wire_bits",
+    "Number of memories": "memories",
+    "Number of memory bits": "memory_bits",
+    "Number of processes": "processes",
+    "Number of cells": "cells",
+}
+
+# Newer Yosys releases print the count first ("   11 wire bits")
+COUNT_FIELDS = {
+    "wires": "wires",
+    "wire bits": "wire_bits",
+    "public wires": "public_wires",
+    "public wire bits": "public_wire_bits",
+    "memories": "memories",
+    "memory bits": "memory_bits",
+    "processes": "processes",
+    "cells": "cells",
+    "ports": "ports",
+    "port bits": "port_bits",
+}
+
+def parse_stat_blocks(log_text):
+    """Parse every `stat` section of a Yosys log into a list of dicts"""
+    blocks = []
+    current = None
+    in_cells = False
+
+    for line in log_text.splitlines():
+        header = re.match(r'^=== (\S+) ===$', line.strip())
+        if header:
+            current = {'module': header.group(1), 'cell_types': {}}
+            for key in COUNT_FIELDS.values():
+                current[key] = 0
+            blocks.append(current)
+            in_cells = False
+            continue
+        if current is None:
+            continue
+
+        field = re.match(r'^\s+(Number of [\w ]+?):\s+(\d+)\s*$', line)
+        if field and field.group(1) in STAT_FIELDS:
+            current[STAT_FIELDS[field.group(1)]] = int(field.group(2))
+            in_cells = field.group(1) == "Number of cells"
+            continue
+
+        field = re.match(r'^\s+(\d+)\s+([a-z][a-z ]*?)\s*$', line)
+        if field and field.group(2) in COUNT_FIELDS:
+            current[COUNT_FIELDS[field.group(2)]] = int(field.group(1))
+            in_cells = field.group(2) == "cells"
+            continue
+
+        cell = re.match(r'^\s+(\$?[\w$]+)\s+(\d+)\s*$', line)
+        if in_cells and cell:
+            current['cell_types'][cell.group(1)] = int(cell.group(2))
+            continue
+
+        cell = re.match(r'^\s+(\d+)\s+(\$\S+)\s*$', line)
+        if in_cells and cell:
+            current['cell_types'][cell.group(2)] = int(cell.group(1))
+            continue
+
+        if line.strip() in ("", "|") or line.strip().startswith("+-"):
+            continue
+        if line.strip():
+            # Anything else ends the section
+            current = None
+            in_cells = False
+
+    return blocks
+
+def parse_stat(log_text, module_name=None):
+    """Return the last `stat` section of a Yosys log, or None
+
+    Yosys prints the statistics once inside `synth` and again for an
+    explicit `stat` command; the last section reflects the final netlist.
+    """
+    blocks = parse_stat_blocks(log_text)
+    if module_name is not None:
+        blocks = [b for b in blocks if b['module'] == module_name]
+    return blocks[-1] if blocks else None
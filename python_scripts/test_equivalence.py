@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from equivalence import source_hash
+
+INV = """module inv (input a, output y);
+    assign y = ~a;
+endmodule
+"""
+
+BUFFER = """module buffer (input a, output y);
+    assign y = a;
+endmodule
+"""
+
+def top(name, submodule):
+    return f"""module {name} (input clk, input data_in, output data_out);
+    wire n;
+    {submodule} u0 (.a(data_in), .y(n));
+    assign data_out = n;
+endmodule
+"""
+
+def test_renamed_design_hashes_equal():
+    assert source_hash(top("top_a", "inv") + INV) == source_hash(top("top_b", "inv") + INV)
+
+def test_instantiated_module_type_is_kept():
+    assert source_hash(top("top_a", "inv")) != source_hash(top("top_a", "buffer"))
+
+def test_dependency_contents_count():
+    identity = INV.replace("~a", "a")
+    assert source_hash(top("top_a", "inv") + INV) != source_hash(top("top_a", "inv") + identity)
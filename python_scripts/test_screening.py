@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from screening import repair, screen
+
+WRAPPER = """module wrapper (input clk, input [15:0] data_in, output [15:0] data_out);
+    register #(16) u0 (.clk(clk), .data_in(data_in), .data_out(data_out));
+    register #8 u1 (.clk(clk), .data_in(data_in[7:0]), .data_out());
+endmodule
+"""
+
+def test_parameter_override_is_not_a_delay():
+    code, repairs = repair(WRAPPER)
+    assert code == WRAPPER
+    assert repairs == []
+
+def test_parameter_override_passes_screening():
+    result = screen(WRAPPER, {})
+    assert result.ok, result.describe()
+    assert "#(16)" in result.code
+
+def test_statement_delays_are_removed():
+    code, repairs = repair("always @(posedge clk) #1 q <= #2 d;\nassign #5 y = a;\n")
+    assert "#" not in code
+    assert repairs == ["removed 3 delay control(s)"]
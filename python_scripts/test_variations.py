@@ -7,24 +7,51 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from python_scripts.verify_design import VerilogVerifier
 from python_scripts.llm_generator import VerilogGenerator
+from python_scripts.pipeline import VerificationPipeline
+from python_scripts.module_index import ModuleIndex
+from python_scripts.result_cache import content_key
+from python_scripts.incremental import IncrementalState, read_sources
 
-def test_all_variations():
+def test_all_variations(incremental=False):
+    """Check syntax and synthesis of every file in verilog_files/
+
+    With incremental, a file whose source, instantiated modules and tools
+    are unchanged since the last incremental run reuses its results.
+    """
     verifier = VerilogVerifier()
     
     # Get all Verilog files in the verilog_files directory
     verilog_files = [f for f in os.listdir('verilog_files') if f.endswith('.v')]
+    state = index = None
+    if incremental:
+        state = IncrementalState()
+        index = ModuleIndex()
+        index.refresh(verifier.verilog_dir)
     
     results = []
     for vfile in verilog_files:
+        digest = None
+        if state is not None:
+            digest = content_key('variations', read_sources(index, os.path.join(
+                verifier.verilog_dir, vfile)), tools=('iverilog', 'yosys'))
+            stored = state.lookup(vfile, 'variations', digest)
+            if stored is not None:
+                print(f"\n{vfile} is up to date")
+                results.append(stored)
+                continue
+
         print(f"\nTesting {vfile}...")
         syntax_ok = verifier.verify_syntax(vfile)
         synthesis_ok = verifier.verify_synthesis(vfile)
         
-        results.append({
+        result = {
             'file': vfile,
             'syntax_ok': syntax_ok,
             'synthesis_ok': synthesis_ok
-        })
+        }
+        if state is not None:
+            state.store(vfile, 'variations', digest, result)
+        results.append(result)
     
     return results
 
@@ -40,15 +67,24 @@ def main():
     - 8-bit data output
     """
     
-    print("Generating variations...")
-    generator.generate_variations(specification, num_variations=3)
-    
-    print("\nTesting all generated variations...")
-    results = test_all_variations()
+    verifier = VerilogVerifier()
+    os.makedirs(verifier.synthesis_dir, exist_ok=True)
+
+    # Each variation is checked and synthesized as soon as it is generated
+    print("Generating and testing variations...")
+    with open(os.path.join(verifier.synthesis_dir, "pipeline_results.jsonl"), 'w') as output:
+        pipeline = VerificationPipeline(generator, verifier, output=output)
+        results = list(pipeline.run(specification, num_variations=3))
+    if generator.cache is not None:
+        stats = generator.cache.stats()
+        print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses")
     
     # Print summary
     print("\n=== Test Results ===")
-    for result in results:
+    for result in sorted(results, key=lambda r: r['index']):
+        if not result['generated']:
+            print(f"\nVariation {result['index']}: generation failed")
+            continue
         print(f"\nFile: {result['file']}")
         print(f"Syntax Check: {'✓' if result['syntax_ok'] else '✗'}")
         print(f"Synthesis: {'✓' if result['synthesis_ok'] else '✗'}")
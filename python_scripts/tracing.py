@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import threading
+
+ENV_VAR = "VERILOG_TRACE"
+
+_enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+_spans = []
+_lock = threading.Lock()
+
+class _NullSpan:
+    """Stand-in returned by span() while tracing is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class Span:
+    """One timed operation; recorded when the with-block exits"""
+
+    def __init__(self, stage, name, design, args):
+        self.stage = stage
+        self.name = name
+        self.design = design
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.time()
+        self._clock = time.perf_counter()
+        return self
+
+    def set(self, **fields):
+        """Attach more fields to the span (exit code, byte counts, ...)"""
+        self.args.update(fields)
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._clock
+        if exc_type is not None:
+            self.args['error'] = repr(exc)
+        record = {'stage': self.stage, 'name': self.name, 'design': self.design,
+                  'start': self.start, 'duration': duration, 'pid': os.getpid(),
+                  'tid': threading.get_native_id(), 'args': self.args}
+        with _lock:
+            _spans.append(record)
+        return False
+
+def enable():
+    """Turn tracing on, here and in subprocesses started from now on"""
+    global _enabled
+    _enabled = True
+    os.environ[ENV_VAR] = "1"
+
+def disable():
+    global _enabled
+    _enabled = False
+    os.environ.pop(ENV_VAR, None)
+
+def enabled():
+    return _enabled
+
+def span(stage, design=None, name=None, **fields):
+    """Context manager timing a block; a shared no-op when tracing is off"""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(stage, name or stage, design, fields)
+
+def write_file(path, data, stage="write", design=None):
+    """Write text or bytes to path, recorded as a span when tracing"""
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    if not _enabled:
+        with open(path, mode) as f:
+            f.write(data)
+        return
+    with Span(stage, os.path.basename(path), design, {'path': path}) as s:
+        with open(path, mode) as f:
+            f.write(data)
+            s.set(bytes=f.tell())
+
+def drain():
+    """Remove and return the spans recorded in this process"""
+    with _lock:
+        spans = list(_spans)
+        _spans.clear()
+    return spans
+
+def merge(spans):
+    """Add spans recorded elsewhere (e.g. returned by a pool worker)"""
+    with _lock:
+        _spans.extend(spans)
+
+def spans():
+    with _lock:
+        return list(_spans)
+
+def export_chrome(path, records=None):
+    """Write spans as Chrome trace / Perfetto JSON (complete events)"""
+    records = spans() if records is None else records
+    events = []
+    for record in records:
+        args = dict(record['args'])
+        if record['design']:
+            args['design'] = record['design']
+        events.append({'name': record['name'], 'cat': record['stage'], 'ph': "X",
+                       'ts': record['start'] * 1e6, 'dur': record['duration'] * 1e6,
+                       'pid': record['pid'], 'tid': record['tid'], 'args': args})
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': "ms"}, f)
+
+def summary(records=None):
+    """Per-stage totals: {stage: {count, total, mean, max, failures, bytes}}"""
+    records = spans() if records is None else records
+    stages = {}
+    for record in records:
+        stat = stages.setdefault(record['stage'], {'count': 0, 'total': 0.0, 'max': 0.0,
+                                                   'failures': 0, 'bytes': 0})
+        args = record['args']
+        stat['count'] += 1
+        stat['total'] += record['duration']
+        stat['max'] = max(stat['max'], record['duration'])
+        stat['failures'] += bool(args.get('exit_code') or 'error' in args)
+        stat['bytes'] += (args.get('bytes', 0) + args.get('stdout_bytes', 0)
+                          + args.get('stderr_bytes', 0))
+    for stat in stages.values():
+        stat['mean'] = stat['total'] / stat['count']
+    return stages
+
+def print_summary(records=None):
+    stages = summary(records)
+    print(f"{'stage':<16} {'count':>6} {'total s':>9} {'mean ms':>9} {'max ms':>9} "
+          f"{'failed':>6} {'bytes':>10}")
+    for stage, stat in sorted(stages.items(), key=lambda item: -item[1]['total']):
+        print(f"{stage:<16} {stat['count']:>6} {stat['total']:>9.3f} "
+              f"{stat['mean'] * 1000:>9.1f} {stat['max'] * 1000:>9.1f} "
+              f"{stat['failures']:>6} {stat['bytes']:>10}")
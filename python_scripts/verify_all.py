@@ -1,63 +1,135 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
-import re
+import io
+import sys
+import time
+import argparse
+import contextlib
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from result_cache import ResultCache, content_key
+from batch_synth import BatchSynthesizer
+from regression import RegressionRunner
+from synthesis_stats import parse_stat
+from module_index import ModuleIndex
+from selfcheck import SelfCheckPlan, supports as selfcheck_supports
+from netlist import load_netlist
+from gatesim import spot_check
+from equivalence import source_hash, netlist_file_hash, equivalence_classes
+from qor_store import QoRStore
+from incremental import IncrementalState, read_sources, watch
+import tracing
+import supervisor
+import sim_coverage
+import waveform
+
+# The absolute verilog_dirs refresh_index() has scanned, os.pathsep separated
+INDEX_ENV = "VERILOG_INDEX_REFRESHED"
 
 class VerilogVerifier:
-    def __init__(self):
-        self.verilog_dir = "verilog_files"
+    def __init__(self, cache=None, index=None, cycles=1000, seed=0,
+                 stimulus="memfile", qor=None, run_id=None, keep_logs=True,
+                 verilog_dir="verilog_files"):
+        self.verilog_dir = verilog_dir
         self.testbench_dir = "testbenches"
         self.synthesis_dir = "synthesis_results"
+        self.cache = cache
+        self.index = index if index is not None else ModuleIndex()
+        self.cycles = cycles
+        self.seed = seed
+        self.stimulus = stimulus
+        self.qor = qor
+        self.run_id = run_id
+        self.keep_logs = keep_logs
+        self.plans = {}
+        self.check_reports = {}
+        self.synthesis_stats = {}
+        self.gate_reports = {}
+        self.tool_status = {}
+        self.waveform_reports = {}
+        self._indexed = False
         os.makedirs(self.testbench_dir, exist_ok=True)
         os.makedirs(self.synthesis_dir, exist_ok=True)
 
+    def module_info(self, verilog_file):
+        """Return the indexed header of the first module in a file, or None"""
+        return self.index.top_module(os.path.join(self.verilog_dir, verilog_file))
+
     def parse_module_ports(self, verilog_file):
         """Parse the module ports from Verilog file"""
-        with open(os.path.join(self.verilog_dir, verilog_file), 'r') as f:
-            content = f.read()
-            
-        # Extract module name and ports
-        module_match = re.search(r'module\s+(\w+)\s*\(([\s\S]*?)\);', content)
-        if not module_match:
+        module = self.module_info(verilog_file)
+        if not module:
             return None, []
-            
-        module_name = module_match.group(1)
-        ports_text = module_match.group(2)
-        
-        # Parse ports
-        ports = []
-        for line in ports_text.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('//'):
-                continue
-            
-            # Match port declarations
-            port_match = re.search(r'(input|output)\s+wire|reg\s*(\[\d+:\d+\])?\s*(\w+)', line)
-            if port_match:
-                ports.append(line.split()[-1].rstrip(','))
-                
-        return module_name, ports
+        return module['name'], [port['name'] for port in module['ports']]
+
+    def run_name(self, verilog_file):
+        """Name of the per-file testbench, vectors, reports and dump pipe
+
+        Keyed by the file stem rather than the declared module, since
+        several files (e.g. LLM variants) may all declare `register` and
+        run at the same time.
+        """
+        return os.path.splitext(os.path.basename(verilog_file))[0]
+
+    def build_testbench(self, verilog_file, prefix="", tag=None):
+        """Build the testbench text for a given Verilog file
+
+        Returns (module_name, testbench) or (None, None) if no module
+        header could be parsed. A prefix is prepended to the testbench and
+        DUT module names. With a tag, every output line is prefixed with
+        [tag] and the testbench sets `done` instead of calling $finish, so
+        it can run alongside others under a regression wrapper.
+
+        Registers with clk/data_in/data_out ports get a self-checking
+        testbench driven by self.cycles of random stimulus, either unrolled
+        inline or read from $readmemh vector files (self.stimulus); its
+        output is checked against the reference model by check_trace().
+        """
+        module = self.module_info(verilog_file)
+        if not module:
+            return None, None
+        module_name = module['name']
+        ports = {port['name']: port for port in module['ports']}
+
+        has_reset = 'rst_n' in ports
+        has_enable = 'en' in ports
 
-    def generate_testbench(self, verilog_file):
-        """Generate a testbench for a given Verilog file"""
-        module_name, ports = self.parse_module_ports(verilog_file)
-        if not module_name:
-            return None
-            
-        has_reset = 'rst' in ' '.join(ports)
-        has_enable = 'en' in ' '.join(ports)
-        
         # Find the data width
-        with open(os.path.join(self.verilog_dir, verilog_file), 'r') as f:
-            content = f.read()
-        width_match = re.search(r'\[(\d+):0\]', content)
-        width = int(width_match.group(1)) + 1 if width_match else 8
+        data_port = ports.get('data_in') or ports.get('data_out') or {}
+        width = data_port.get('width') or 8
+
+        self.plans.pop(verilog_file, None)
+        if self.cycles and selfcheck_supports(ports, data_port.get('width')):
+            base_path = os.path.join(self.synthesis_dir,
+                                     f"{prefix}{self.run_name(verilog_file)}")
+            plan = SelfCheckPlan(module_name, width, has_reset, has_enable,
+                                 self.cycles, base_path, self.seed, self.stimulus,
+                                 sim_coverage.settings())
+            self.plans[verilog_file] = plan
+            return module_name, self._add_dump(verilog_file, ports,
+                                               plan.testbench(prefix, tag), tag)
+
+        label = f"[{tag}] " if tag else ""
+        finish = f'$display("{label}DONE");\n        done = 1;' if tag else "$finish;"
+        done_decl = "\n    reg done = 0;" if tag else ""
+        # Only one $monitor can be active per simulation, so tagged
+        # testbenches sharing a regression run strobe on change instead
+        if tag:
+            monitor = f"""always @(data_in or data_out) begin
+        $strobe("{label}Time=%0t data_in=%h data_out=%h",
+                $time, data_in, data_out);
+    end"""
+        else:
+            monitor = """initial begin
+        $monitor("Time=%0t data_in=%h data_out=%h",
+                 $time, data_in, data_out);
+    end"""
 
         testbench = f"""
 `timescale 1ns/1ps
 
-module {module_name}_tb;
+module {prefix}{module_name}_tb;
     // Parameters
     parameter WIDTH = {width};
     
@@ -66,10 +138,10 @@ module {module_name}_tb;
     {"reg rst_n;" if has_reset else ""}
     {"reg en;" if has_enable else ""}
     reg [WIDTH-1:0] data_in;
-    wire [WIDTH-1:0] data_out;
+    wire [WIDTH-1:0] data_out;{done_decl}
     
     // Instantiate the module under test
-    {module_name} uut (
+    {prefix}{module_name} uut (
         .clk(clk),
         {".rst_n(rst_n)," if has_reset else ""}
         {".en(en)," if has_enable else ""}
@@ -110,105 +182,918 @@ module {module_name}_tb;
         #20;
         
         #100;
-        $finish;
+        {finish}
     end
     
     // Monitor changes
-    initial begin
-        $monitor("Time=%0t data_in=%h data_out=%h",
-                 $time, data_in, data_out);
-    end
+    {monitor}
 endmodule
 """
-        
-        testbench_file = os.path.join(self.testbench_dir, f"{module_name}_tb.v")
-        with open(testbench_file, 'w') as f:
-            f.write(testbench)
+        return module_name, self._add_dump(verilog_file, ports, testbench, tag)
+
+    def _add_dump(self, verilog_file, ports, testbench, tag=None):
+        """Add the VCD dump in waveform mode (not under regression tags)"""
+        if waveform.settings() is None or tag or 'clk' not in ports or 'data_out' not in ports:
+            return testbench
+        return waveform.add_dump(testbench, self._waveform_paths(verilog_file)[0])
+
+    def _waveform_paths(self, verilog_file):
+        """(dump pipe, failure window) paths of a file in waveform mode"""
+        name = self.run_name(verilog_file)
+        return (os.path.join(self.synthesis_dir, f"{name}_dump.vcd"),
+                os.path.join(self.synthesis_dir, f"{name}_failure.vcd.gz"))
+
+    def waveform_monitor(self, verilog_file):
+        """A WaveformMonitor for the file's testbench, or None if not dumping"""
+        module = self.module_info(verilog_file)
+        settings = waveform.settings()
+        if settings is None or not module:
+            return None
+        ports = {port['name'] for port in module['ports']}
+        if 'clk' not in ports or 'data_out' not in ports:
+            return None
+        dump_path, window_path = self._waveform_paths(verilog_file)
+        if os.path.exists(window_path):
+            os.remove(window_path)
+        return waveform.WaveformMonitor(dump_path, window_path, 'rst_n' in ports,
+                                        'en' in ports, before=settings['before'],
+                                        after=settings['after'])
+
+    def check_waveform(self, verilog_file, monitor):
+        """Finish a WaveformMonitor and report; returns False on a failed assertion"""
+        report = monitor.finish()
+        self.waveform_reports[verilog_file] = report
+        failure = report['first_failure']
+        if failure is None:
+            print(f"  Waveform: {report['checks']} clock-edge checks over "
+                  f"{report['timestamps']} timestamps, no failures")
+            return True
+        print(f"✗ Waveform assertion \"{failure['assertion']}\" failed at "
+              f"t={failure['time']} for {verilog_file}: expected {failure['expected']}, "
+              f"got {failure['actual']} ({report['failures']} failures in "
+              f"{report['checks']} checks)")
+        print(f"  Window around the first failure saved to {report['window']}")
+        return False
+
+    def generate_testbench(self, verilog_file):
+        """Generate a testbench for a given Verilog file"""
+        module_name, testbench = self.build_testbench(verilog_file)
+        if not module_name:
+            return None
+
+        testbench_file = os.path.join(self.testbench_dir,
+                                      f"{self.run_name(verilog_file)}_tb.v")
+        tracing.write_file(testbench_file, testbench, "testbench", verilog_file)
         return testbench_file
 
+    def check_trace(self, verilog_file, stdout=None):
+        """Compare a finished simulation's trace with the reference model
+
+        Returns the comparison report, or None for designs that ran the
+        plain (not self-checking) testbench. stdout is the simulator's
+        output, which carries the coverage samples when coverage is on.
+        """
+        plan = self.plans.get(verilog_file)
+        if plan is None:
+            return None
+        report = plan.check(stdout)
+        self.check_reports[verilog_file] = report
+        if report['mismatches']:
+            print(f"✗ {report['mismatches']} mismatches in {report['cycles']} cycles "
+                  f"for {verilog_file}, first: {report['first_mismatch']}")
+        return report
+
+    def _killed(self, verilog_file, stage, result):
+        """Report a tool run stopped by a supervisor limit; True if it was
+
+        Such runs are not cached, since a different limit may let them pass.
+        """
+        if not result.killed:
+            return False
+        self._add_status(verilog_file, f"{stage} {result.status}")
+        print(f"✗ {stage.capitalize()} of {verilog_file} {result.describe()}")
+        return True
+
+    def _add_status(self, verilog_file, status):
+        self.tool_status[verilog_file] = _join_status(self.tool_status.get(verilog_file),
+                                                      status)
+
+    def _read_source(self, verilog_file):
+        with open(os.path.join(self.verilog_dir, verilog_file), 'r') as f:
+            return f.read()
+
+    def dependencies(self, verilog_file):
+        """Paths of the other files whose modules verilog_file instantiates"""
+        if not self._indexed:
+            refreshed = os.environ.get(INDEX_ENV, "").split(os.pathsep)
+            if os.path.abspath(self.verilog_dir) not in refreshed:
+                self.index.refresh(self.verilog_dir)
+            self._indexed = True
+        return self.index.dependencies(os.path.join(self.verilog_dir, verilog_file))
+
+    def read_sources(self, verilog_file):
+        """Source of a file followed by its dependencies, as one string"""
+        self.dependencies(verilog_file)
+        return read_sources(self.index, os.path.join(self.verilog_dir, verilog_file))
+
     def verify_with_icarus(self, verilog_file):
         """Verify using Icarus Verilog"""
         try:
-            testbench_file = self.generate_testbench(verilog_file)
-            if not testbench_file:
+            tb_module, testbench = self.build_testbench(verilog_file)
+            if not tb_module:
                 print(f"Failed to generate testbench for {verilog_file}")
                 return False
-                
-            module_name = os.path.splitext(os.path.basename(verilog_file))[0]
+
+            module_name = self.run_name(verilog_file)
             output_path = os.path.join(self.synthesis_dir, f'{module_name}.vvp')
+            testbench_file = os.path.join(self.testbench_dir, f"{module_name}_tb.v")
+
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.key('simulate', self.read_sources(verilog_file),
+                                           testbench, tools=('iverilog', 'vvp'))
+                entry = self.cache.get(cache_key)
+                if entry is not None:
+                    if entry.get('check'):
+                        self.check_reports[verilog_file] = entry['check']
+                    if entry.get('waveform'):
+                        self.waveform_reports[verilog_file] = entry['waveform']
+                    mark, status = ('✓', 'passed') if entry['ok'] else ('✗', 'failed')
+                    print(f"{mark} Verification {status} for {verilog_file} (cached)")
+                    return entry['ok']
+
+            tracing.write_file(testbench_file, testbench, "testbench", verilog_file)
+            if verilog_file in self.plans:
+                with tracing.span("vectors", verilog_file):
+                    self.plans[verilog_file].write_vectors()
             
-            cmd = ['iverilog', '-o', output_path,
-                   os.path.join(self.verilog_dir, verilog_file),
-                   testbench_file]
+            cmd = (['iverilog', '-o', output_path,
+                    os.path.join(self.verilog_dir, verilog_file)]
+                   + self.dependencies(verilog_file) + [testbench_file])
             print(f"Running command: {' '.join(cmd)}")
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = supervisor.run_tool(cmd, "compile", verilog_file)
+            if self._killed(verilog_file, "compile", result):
+                return False
             if result.returncode != 0:
                 print(f"Compilation failed for {verilog_file}")
                 print(result.stderr)
+                if cache_key:
+                    self.cache.put(cache_key, {'ok': False}, [testbench_file])
                 return False
             
-            # Run simulation
-            result = subprocess.run(['vvp', output_path], 
-                                  capture_output=True, text=True)
+            # Run simulation, streaming its VCD through the checker in waveform mode
+            monitor = self.waveform_monitor(verilog_file)
+            waveform_ok = True
+            if monitor is not None:
+                monitor.start()
+            try:
+                result = supervisor.run_tool(['vvp', output_path], "simulate", verilog_file)
+            finally:
+                if monitor is not None:
+                    waveform_ok = self.check_waveform(verilog_file, monitor)
+            if self._killed(verilog_file, "simulation", result):
+                return False
+            if not waveform_ok:
+                report = self.waveform_reports[verilog_file]
+                if cache_key:
+                    self.cache.put(cache_key, {'ok': False, 'waveform': report},
+                                   [testbench_file, output_path, report['window']])
+                return False
             if result.returncode != 0:
                 print(f"Simulation failed for {verilog_file}")
                 print(result.stderr)
+                if cache_key:
+                    self.cache.put(cache_key, {'ok': False},
+                                   [testbench_file, output_path])
+                return False
+
+            # A clean exit is not enough: the trace must match the model
+            report = self.check_trace(verilog_file, result.stdout)
+            if report and report['mismatches']:
+                if cache_key:
+                    self.cache.put(cache_key, {'ok': False, 'check': report},
+                                   [testbench_file, output_path])
                 return False
                 
-            print(f"✓ Verification passed for {verilog_file}")
+            if report:
+                print(f"✓ Verification passed for {verilog_file} "
+                      f"({report['checked']} of {report['cycles']} cycles checked)")
+                if report.get('coverage'):
+                    print(f"  {sim_coverage.describe(report['coverage'])}")
+            else:
+                print(f"✓ Verification passed for {verilog_file}")
+            if cache_key:
+                self.cache.put(cache_key, {'ok': True, 'check': report,
+                                           'waveform': self.waveform_reports.get(verilog_file)},
+                               [testbench_file, output_path])
             return True
             
         except Exception as e:
             print(f"Error verifying {verilog_file}: {e}")
             return False
 
+    def top_name(self, verilog_file):
+        """Name of the module to synthesize, from the index or the file name"""
+        module = self.module_info(verilog_file)
+        if module:
+            return module['name']
+        return os.path.splitext(os.path.basename(verilog_file))[0]
+
+    def synthesis_script(self, verilog_file):
+        """Build the Yosys script used to synthesize a file"""
+        module_name = os.path.splitext(os.path.basename(verilog_file))[0]
+        dependencies = self.dependencies(verilog_file)
+        sources = [os.path.join(self.verilog_dir, verilog_file)] + dependencies
+        reads = "\n".join(f"                read_verilog {path};" for path in sources)
+        # Flatten hierarchical designs so the netlist checks see one module
+        flatten = " -flatten" if dependencies else ""
+        return f"""
+{reads}
+                synth -top {self.top_name(verilog_file)}{flatten};
+                write_json {os.path.join(self.synthesis_dir, module_name)}.json;
+                stat;
+            """
+
     def run_synthesis(self, verilog_file):
         """Run synthesis using Yosys"""
         try:
             module_name = os.path.splitext(os.path.basename(verilog_file))[0]
             log_file = os.path.join(self.synthesis_dir, f"{module_name}_synthesis.log")
+            json_file = os.path.join(self.synthesis_dir, f"{module_name}.json")
+            yosys_script = self.synthesis_script(verilog_file)
+
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.key('synthesize', self.read_sources(verilog_file),
+                                           yosys_script, tools=('yosys',))
+                entry = self.cache.get(cache_key)
+                if entry is not None:
+                    self.synthesis_stats[verilog_file] = entry.get('stat')
+                    self.record_synthesis(verilog_file, entry['ok'], entry.get('stat'),
+                                          cached=True)
+                    mark, status = ('✓', 'passed') if entry['ok'] else ('✗', 'failed')
+                    print(f"{mark} Synthesis {status} for {verilog_file} (cached)")
+                    return entry['ok']
             
-            yosys_script = f"""
-                read_verilog {os.path.join(self.verilog_dir, verilog_file)};
-                synth -top {module_name};
-                write_json {os.path.join(self.synthesis_dir, module_name)}.json;
-                stat;
-            """
-            
-            result = subprocess.run(['yosys', '-p', yosys_script], 
-                                  capture_output=True, text=True)
-            
-            with open(log_file, 'w') as f:
-                f.write(result.stdout)
+            result = supervisor.run_tool(['yosys', '-p', yosys_script], "synthesize",
+                                         verilog_file)
+            if self._killed(verilog_file, "synthesis", result):
+                self.record_synthesis(verilog_file, False, None, result.stdout)
+                return False
             
             if result.returncode != 0:
                 print(f"Synthesis failed for {verilog_file}")
                 print(result.stderr)
+                self.record_synthesis(verilog_file, False, None, result.stdout)
+                if cache_key:
+                    self.cache.put(cache_key, {'ok': False, 'stat': None}, [log_file])
                 return False
+
+            stat = parse_stat(result.stdout, self.top_name(verilog_file))
+            self.synthesis_stats[verilog_file] = stat
+            saved = self.record_synthesis(verilog_file, True, stat, result.stdout)
+            if cache_key:
+                self.cache.put(cache_key, {'ok': True, 'stat': stat},
+                               ([log_file] if saved else []) + [json_file])
             
             print(f"✓ Synthesis passed for {verilog_file}")
-            print(f"  Log saved to {log_file}")
+            if saved:
+                print(f"  Log saved to {log_file}")
             return True
             
         except Exception as e:
             print(f"Error in synthesis for {verilog_file}: {e}")
             return False
 
-def main():
+    def record_synthesis(self, verilog_file, ok, stat, log_text=None, cached=False):
+        """Keep the outcome of one synthesis run
+
+        The raw log is written to synthesis_results only for failures or
+        with keep_logs; with a QoR store the stat counts are recorded
+        under self.run_id (and a failed log is stored compressed).
+        Returns True if the log file was written.
+        """
+        module_name = os.path.splitext(os.path.basename(verilog_file))[0]
+        saved = log_text is not None and (self.keep_logs or not ok)
+        if saved:
+            log_file = os.path.join(self.synthesis_dir, f"{module_name}_synthesis.log")
+            tracing.write_file(log_file, log_text, "log", verilog_file)
+        if self.qor is not None:
+            self.qor.record(self.run_id, module_name, verilog_file,
+                            source_hash(self._read_source(verilog_file)), ok, stat,
+                            log_text, cached)
+        return saved
+
+    def gate_check(self, verilog_file, lanes=1024):
+        """Simulate the synthesized netlist against the reference model
+
+        Uses the bit-parallel gate simulator on the write_json output of
+        run_synthesis, so no extra compile or vvp run is needed. Returns
+        True/False, or None when the design or its cells are not covered.
+        """
+        module = self.module_info(verilog_file)
+        ports = {port['name']: port for port in module['ports']} if module else {}
+        width = (ports.get('data_in') or {}).get('width')
+        if not self.cycles or not selfcheck_supports(ports, width):
+            return None
+
+        module_name = os.path.splitext(os.path.basename(verilog_file))[0]
+        json_file = os.path.join(self.synthesis_dir, f"{module_name}.json")
+        try:
+            report = spot_check(load_netlist(json_file), width, 'rst_n' in ports,
+                                'en' in ports, self.cycles, lanes, self.seed)
+        except (OSError, ValueError) as e:
+            print(f"Gate-level check skipped for {verilog_file}: {e}")
+            return None
+
+        self.gate_reports[verilog_file] = report
+        if report['mismatches']:
+            print(f"✗ Gate-level mismatch for {verilog_file}: {report['mismatches']} "
+                  f"of {report['checked']} checks, first: {report['first_mismatch']}")
+            return False
+        print(f"✓ Gate-level check passed for {verilog_file} "
+              f"({report['checked']} checks over {lanes} lanes)")
+        return True
+
+    def netlist_hash(self, verilog_file):
+        """Canonical hash of the synthesized netlist, or None if unavailable"""
+        module_name = os.path.splitext(os.path.basename(verilog_file))[0]
+        try:
+            return netlist_file_hash(os.path.join(self.synthesis_dir, f"{module_name}.json"))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def run_synthesis_batch(self, verilog_files, chunk_size=16):
+        """Run synthesis for many files in shared Yosys sessions
+
+        Returns {verilog_file: passed}. Designs are grouped chunk_size at a
+        time into one Yosys process; a failing design only fails itself.
+        """
+        passed = {}
+        designs = []
+        pending = {}
+        for vfile in verilog_files:
+            module_name = os.path.splitext(os.path.basename(vfile))[0]
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.key('synthesize', self.read_sources(vfile),
+                                           self.synthesis_script(vfile),
+                                           tools=('yosys',))
+                entry = self.cache.get(cache_key)
+                if entry is not None:
+                    self.synthesis_stats[vfile] = entry.get('stat')
+                    self.record_synthesis(vfile, entry['ok'], entry.get('stat'), cached=True)
+                    mark, status = ('✓', 'passed') if entry['ok'] else ('✗', 'failed')
+                    print(f"{mark} Synthesis {status} for {vfile} (cached)")
+                    passed[vfile] = entry['ok']
+                    continue
+            sources = [os.path.join(self.verilog_dir, vfile)] + self.dependencies(vfile)
+            designs.append((module_name, sources, self.top_name(vfile)))
+            pending[module_name] = (vfile, cache_key)
+
+        synthesizer = BatchSynthesizer(self.synthesis_dir, chunk_size)
+        for module_name, outcome in synthesizer.run(designs).items():
+            vfile, cache_key = pending[module_name]
+            log_file = os.path.join(self.synthesis_dir, f"{module_name}_synthesis.log")
+            saved = self.record_synthesis(vfile, outcome['ok'], outcome['stat'],
+                                          outcome['log'])
+
+            passed[vfile] = outcome['ok']
+            if outcome.get('status') not in (None, "ok", "failed"):
+                self._add_status(vfile, f"synthesis {outcome['status']}")
+                print(f"✗ Synthesis of {vfile} stopped: {outcome['status']}")
+                continue
+            if not outcome['ok']:
+                print(f"Synthesis failed for {vfile}")
+                if cache_key:
+                    self.cache.put(cache_key, {'ok': False, 'stat': None}, [log_file])
+                continue
+
+            self.synthesis_stats[vfile] = outcome['stat']
+            if cache_key:
+                self.cache.put(cache_key, {'ok': True, 'stat': outcome['stat']},
+                               ([log_file] if saved else []) + [outcome['json']])
+            print(f"✓ Synthesis passed for {vfile}")
+            if saved:
+                print(f"  Log saved to {log_file}")
+
+        return passed
+
+def refresh_index(verilog_dir="verilog_files"):
+    """Bring the module index up to date once for a whole run
+
+    Verifiers in this process, and pool workers started after it, then
+    skip their own scan of verilog_dir; modules_in() still revalidates
+    every file a lookup actually reads.
+    """
+    index = ModuleIndex()
+    index.refresh(verilog_dir)
+    index.close()
+    refreshed = set(filter(None, os.environ.get(INDEX_ENV, "").split(os.pathsep)))
+    os.environ[INDEX_ENV] = os.pathsep.join(sorted(refreshed | {os.path.abspath(verilog_dir)}))
+
+def verify_file(verilog_file, cache_dir=None, synthesize=True, simulate=True,
+                cycles=1000, stimulus="memfile", gate_lanes=1024, run_id=None,
+                keep_logs=True, verilog_dir="verilog_files"):
+    """Simulate and synthesize one file, capturing its output
+
+    verilog_file is relative to verilog_dir. With a run_id, synthesis
+    results are recorded in the QoR store.
+    """
+    cache = ResultCache(cache_dir) if cache_dir else None
+    qor = QoRStore() if run_id else None
+    verifier = VerilogVerifier(cache=cache, cycles=cycles, stimulus=stimulus,
+                               qor=qor, run_id=run_id, keep_logs=keep_logs,
+                               verilog_dir=verilog_dir)
+    output = io.StringIO()
+    start = time.time()
+    simulation_ok = None
+    synthesis_ok = None
+    gate_ok = None
+    with contextlib.redirect_stdout(output):
+        print(f"Processing: {verilog_file}")
+        if simulate:
+            print("1. Running Icarus Verilog verification...")
+            simulation_ok = verifier.verify_with_icarus(verilog_file)
+
+        if synthesize:
+            print("\n2. Running Yosys synthesis...")
+            synthesis_ok = verifier.run_synthesis(verilog_file)
+            if synthesis_ok and gate_lanes:
+                gate_ok = verifier.gate_check(verilog_file, gate_lanes)
+
+    module = verifier.module_info(verilog_file)
+    return {
+        'file': verilog_file,
+        'module': module['name'] if module else None,
+        'ports': module['ports'] if module else [],
+        'simulation_ok': simulation_ok,
+        'check': verifier.check_reports.get(verilog_file),
+        'synthesis_ok': synthesis_ok,
+        'stat': verifier.synthesis_stats.get(verilog_file),
+        'gate_ok': gate_ok,
+        'gate_check': verifier.gate_reports.get(verilog_file),
+        'waveform': verifier.waveform_reports.get(verilog_file),
+        'netlist_hash': verifier.netlist_hash(verilog_file) if synthesis_ok else None,
+        'tool_status': verifier.tool_status.get(verilog_file),
+        'cache_hits': cache.hits if cache else 0,
+        'elapsed': time.time() - start,
+        'output': output.getvalue(),
+        'spans': tracing.drain()
+    }
+
+def synthesize_chunk(verilog_files, cache_dir=None, chunk_size=16, run_id=None,
+                     keep_logs=True):
+    """Synthesize a group of files in one batch, capturing the output"""
+    cache = ResultCache(cache_dir) if cache_dir else None
+    qor = QoRStore() if run_id else None
+    verifier = VerilogVerifier(cache=cache, qor=qor, run_id=run_id, keep_logs=keep_logs)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        print(f"Batch synthesis of {len(verilog_files)} files")
+        passed = verifier.run_synthesis_batch(verilog_files, chunk_size)
+
+    return {
+        'synthesis_ok': passed,
+        'stat': verifier.synthesis_stats,
+        'tool_status': verifier.tool_status,
+        'output': output.getvalue(),
+        'spans': tracing.drain()
+    }
+
+def verify_parallel(verilog_files, workers=None, cache_dir=None,
+                    synth_chunk_size=0, regression=False, cycles=1000,
+                    stimulus="memfile", gate_lanes=1024, run_id=None, keep_logs=True):
+    """Verify files across a process pool, one job per file
+
+    Each file's output is printed as a single block when its job finishes,
+    and the results come back in the order of verilog_files. With a
+    synth_chunk_size, synthesis runs as separate batch jobs of that many
+    files each instead of one Yosys process per file. With regression,
+    all files are simulated together in a single iverilog/vvp run first.
+    Per-file synthesis is followed by a gate-level spot check with
+    gate_lanes parallel lanes (0 skips it).
+    """
+    verilog_files = list(verilog_files)
+    refresh_index()
+    results = {}
+    synthesize = synth_chunk_size <= 0
+    simulated = {}
+    regression_status = {}
+
+    if regression:
+        print("Running combined regression simulation...")
+        runner = RegressionRunner(VerilogVerifier(cycles=cycles, stimulus=stimulus))
+        simulated = runner.run(verilog_files)
+        regression_status = runner.verifier.tool_status
+
+    if workers == 1:
+        for vfile in verilog_files:
+            results[vfile] = verify_file(vfile, cache_dir, synthesize,
+                                         not regression, cycles, stimulus,
+                                         gate_lanes, run_id, keep_logs)
+            print(results[vfile]['output'])
+        if not synthesize:
+            batch = synthesize_chunk(verilog_files, cache_dir, synth_chunk_size,
+                                     run_id, keep_logs)
+            print(batch['output'])
+            _merge_batch(results, batch)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool, _cancel_on_interrupt(pool):
+            futures = {pool.submit(verify_file, vfile, cache_dir, synthesize,
+                                   not regression, cycles, stimulus,
+                                   gate_lanes, run_id, keep_logs): vfile
+                       for vfile in verilog_files}
+            chunks = {}
+            if not synthesize:
+                for i in range(0, len(verilog_files), synth_chunk_size):
+                    chunk = verilog_files[i:i + synth_chunk_size]
+                    chunks[pool.submit(synthesize_chunk, chunk, cache_dir,
+                                       synth_chunk_size, run_id, keep_logs)] = chunk
+            for future in as_completed(futures):
+                vfile = futures[future]
+                try:
+                    results[vfile] = future.result()
+                except Exception as e:
+                    results[vfile] = {
+                        'file': vfile,
+                        'module': None,
+                        'ports': [],
+                        'simulation_ok': False,
+                        'check': None,
+                        'synthesis_ok': False,
+                        'stat': None,
+                        'gate_ok': None,
+                        'gate_check': None,
+                        'netlist_hash': None,
+                        'tool_status': None,
+                        'cache_hits': 0,
+                        'elapsed': 0.0,
+                        'output': f"Error verifying {vfile}: {e}\n"
+                    }
+                print(results[vfile]['output'])
+            for future in as_completed(chunks):
+                try:
+                    batch = future.result()
+                except Exception as e:
+                    chunk = chunks[future]
+                    batch = {
+                        'synthesis_ok': dict.fromkeys(chunk, False),
+                        'stat': {},
+                        'tool_status': {},
+                        'output': f"Error synthesizing {len(chunk)} files "
+                                  f"({', '.join(chunk)}): {e}\n"
+                    }
+                print(batch['output'])
+                _merge_batch(results, batch)
+
+    for vfile, ok in simulated.items():
+        results[vfile]['simulation_ok'] = ok
+        results[vfile]['check'] = runner.verifier.check_reports.get(vfile)
+        results[vfile]['tool_status'] = _join_status(regression_status.get(vfile),
+                                                     results[vfile].get('tool_status'))
+    for result in results.values():
+        tracing.merge(result.pop('spans', []))
+    return [results[vfile] for vfile in verilog_files]
+
+@contextlib.contextmanager
+def _cancel_on_interrupt(pool):
+    """Drop queued jobs on Ctrl-C instead of waiting for them to run"""
+    try:
+        yield
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+def _map(workers, func, items, *args):
+    """map func over items (with fixed trailing args), in a pool unless workers == 1"""
+    if workers == 1:
+        return [func(item, *args) for item in items]
+    with ProcessPoolExecutor(max_workers=workers) as pool, _cancel_on_interrupt(pool):
+        return list(pool.map(func, items, *(repeat(arg) for arg in args)))
+
+def verify_deduplicated(verilog_files, workers=None, cache_dir=None, cycles=1000,
+                        stimulus="memfile", gate_lanes=1024, run_id=None,
+                        keep_logs=True):
+    """Verify once per equivalence class and share the verdict
+
+    Files are first grouped by normalized source hash and one member of
+    each group is synthesized. Groups whose netlists hash the same are
+    merged, and only one member of each merged class is simulated. Every
+    member gets the class verdict, with 'equivalent_to' naming the file
+    that was actually verified.
+    """
+    verilog_files = list(verilog_files)
+    refresh_index()
     verifier = VerilogVerifier()
-    
-    verilog_files = [f for f in os.listdir("verilog_files") 
-                     if f.endswith('.v')]
-    
+    source_classes = equivalence_classes(
+        verilog_files, lambda vfile: source_hash(verifier.read_sources(vfile)))
+
+    synthesized = dict(zip(source_classes,
+                           _map(workers, verify_file, list(source_classes), cache_dir,
+                                True, False, cycles, stimulus, gate_lanes,
+                                run_id, keep_logs)))
+    for result in synthesized.values():
+        print(result['output'])
+
+    netlist_classes = equivalence_classes(
+        list(source_classes), lambda vfile: synthesized[vfile]['netlist_hash'])
+    simulated = dict(zip(netlist_classes,
+                         _map(workers, verify_file, list(netlist_classes), cache_dir,
+                              False, True, cycles, stimulus)))
+    for result in simulated.values():
+        print(result['output'])
+    for result in list(synthesized.values()) + list(simulated.values()):
+        tracing.merge(result.pop('spans', []))
+
+    results = {}
+    for sim_rep, synth_reps in netlist_classes.items():
+        for synth_rep in synth_reps:
+            for vfile in source_classes[synth_rep]:
+                module = verifier.module_info(vfile)
+                result = dict(synthesized[synth_rep],
+                              file=vfile,
+                              module=module['name'] if module else None,
+                              ports=module['ports'] if module else [],
+                              simulation_ok=simulated[sim_rep]['simulation_ok'],
+                              check=simulated[sim_rep]['check'],
+                              tool_status=_join_status(synthesized[synth_rep]['tool_status'],
+                                                       simulated[sim_rep]['tool_status']),
+                              elapsed=(synthesized[synth_rep]['elapsed'] +
+                                       simulated[sim_rep]['elapsed']),
+                              equivalent_to=None if vfile == sim_rep else sim_rep)
+                results[vfile] = result
+
+    print(f"{len(verilog_files)} files, {len(source_classes)} distinct sources, "
+          f"{len(netlist_classes)} distinct netlists")
+    return [results[vfile] for vfile in verilog_files]
+
+# Result fields produced by each stage, stored between incremental runs
+SIMULATION_FIELDS = ('simulation_ok', 'check')
+SYNTHESIS_FIELDS = ('synthesis_ok', 'stat', 'gate_ok', 'gate_check', 'netlist_hash')
+
+def stage_hashes(verifier, verilog_file, gate_lanes=1024):
+    """Input hashes of the simulate and synthesize stages of one file
+
+    Both cover the file and every file it instantiates modules from; the
+    simulate hash adds the generated testbench, the synthesize hash the
+    Yosys script and gate-check settings, each with its tool binaries.
+    """
+    sources = verifier.read_sources(verilog_file)
+    _, testbench = verifier.build_testbench(verilog_file)
+    simulate = content_key('simulate', sources, testbench or "",
+                           tools=('iverilog', 'vvp'))
+    synthesize = content_key('synthesize', sources, verifier.synthesis_script(verilog_file),
+                             f"{gate_lanes} {verifier.cycles} {verifier.seed}",
+                             tools=('yosys',))
+    return simulate, synthesize
+
+def _verify_stages(job, *args):
+    verilog_file, synthesize, simulate = job
+    return verify_file(verilog_file, args[0], synthesize, simulate, *args[1:])
+
+def verify_incremental(verilog_files, workers=None, cache_dir=None, cycles=1000,
+                       stimulus="memfile", gate_lanes=1024, run_id=None,
+                       keep_logs=True, state_path=".incremental_state.sqlite"):
+    """Rerun only the stages whose inputs changed since the last run
+
+    Stage input hashes are compared with the ones stored in the
+    IncrementalState; up-to-date stages reuse their stored result, so
+    editing one module reverifies it and the designs instantiating it.
+    Runs stopped by a supervisor limit are not recorded and rerun next time.
+    """
+    verilog_files = list(verilog_files)
+    refresh_index()
+    verifier = VerilogVerifier(cycles=cycles, stimulus=stimulus)
+    state = IncrementalState(state_path)
+    state.prune(verilog_files)
+    hashes = {vfile: stage_hashes(verifier, vfile, gate_lanes) for vfile in verilog_files}
+    stored = {vfile: (state.lookup(vfile, 'simulate', simulate),
+                      state.lookup(vfile, 'synthesize', synthesize))
+              for vfile, (simulate, synthesize) in hashes.items()}
+    jobs = [(vfile, synthesized is None, simulated is None)
+            for vfile, (simulated, synthesized) in stored.items()
+            if simulated is None or synthesized is None]
+    print(f"{len(verilog_files) - len(jobs)} of {len(verilog_files)} designs up to date, "
+          f"{len(jobs)} to verify")
+
+    fresh = dict(zip((job[0] for job in jobs),
+                     _map(workers, _verify_stages, jobs, cache_dir, cycles, stimulus,
+                          gate_lanes, run_id, keep_logs)))
+    results = []
+    for vfile in verilog_files:
+        (simulate, synthesize), (simulated, synthesized) = hashes[vfile], stored[vfile]
+        result = fresh.get(vfile)
+        if result is None:
+            module = verifier.module_info(vfile)
+            result = {'file': vfile,
+                      'module': module['name'] if module else None,
+                      'ports': module['ports'] if module else [],
+                      'tool_status': None, 'cache_hits': 0, 'elapsed': 0.0,
+                      'output': "", 'up_to_date': True}
+        else:
+            print(result['output'])
+            tracing.merge(result.pop('spans', []))
+        killed = result['tool_status'] or ""
+        for stage, digest, previous, fields, names in (
+                ('simulate', simulate, simulated, SIMULATION_FIELDS, ("compile", "simulation")),
+                ('synthesize', synthesize, synthesized, SYNTHESIS_FIELDS, ("synthesis",))):
+            if previous is not None:
+                result.update(previous)
+            elif not any(name in killed for name in names):
+                state.store(vfile, stage, digest, {field: result[field] for field in fields})
+        results.append(result)
+    state.close()
+    return results
+
+def print_summary(results, start):
+    print("=== Verification Summary ===")
+    for result in results:
+        if result.get('equivalent_to'):
+            note = f" [same as {result['equivalent_to']}]"
+        elif result.get('up_to_date'):
+            note = " (up to date)"
+        else:
+            note = f" ({result['elapsed']:.2f}s)"
+        print(f"{result['file']}: "
+              f"simulation {'✓' if result['simulation_ok'] else '✗'}, "
+              f"synthesis {'✓' if result['synthesis_ok'] else '✗'}"
+              + ("" if result.get('gate_ok') is None
+                 else f", gates {'✓' if result['gate_ok'] else '✗'}")
+              + (f", coverage {coverage['percent']:g}%"
+                 if (coverage := (result.get('check') or {}).get('coverage')) else "")
+              + (f" <{result['tool_status']}>" if result.get('tool_status') else "")
+              + note)
+    print(f"Total wall time: {time.time() - start:.2f}s")
+
+def _merge_batch(results, batch):
+    tracing.merge(batch.pop('spans', []))
+    for vfile, ok in batch['synthesis_ok'].items():
+        results[vfile]['synthesis_ok'] = ok
+        results[vfile]['stat'] = batch['stat'].get(vfile)
+        results[vfile]['tool_status'] = _join_status(results[vfile].get('tool_status'),
+                                                     batch['tool_status'].get(vfile))
+
+def _join_status(*statuses):
+    """Combine per-stage supervisor statuses into one note, or None"""
+    return ", ".join(status for status in statuses if status) or None
+
+def _verify_directory(args, cache_dir, run_id):
+    """Verify every .v file in verilog_files/ as the command line asks"""
+    verilog_files = sorted(f for f in os.listdir("verilog_files") if f.endswith('.v'))
+    if args.serve or args.local_workers:
+        from distributed import verify_distributed
+        return verify_distributed(verilog_files, address=args.serve,
+                                  local_workers=args.local_workers,
+                                  cycles=args.cycles, stimulus=args.stimulus,
+                                  gate_lanes=args.gate_lanes, run_id=run_id)
+    if args.dedup:
+        return verify_deduplicated(verilog_files, workers=args.workers,
+                                   cache_dir=cache_dir, cycles=args.cycles,
+                                   stimulus=args.stimulus,
+                                   gate_lanes=args.gate_lanes,
+                                   run_id=run_id, keep_logs=args.keep_logs)
+    if args.incremental:
+        return verify_incremental(verilog_files, workers=args.workers,
+                                  cache_dir=cache_dir, cycles=args.cycles,
+                                  stimulus=args.stimulus,
+                                  gate_lanes=args.gate_lanes,
+                                  run_id=run_id, keep_logs=args.keep_logs)
+    return verify_parallel(verilog_files, workers=args.workers,
+                           cache_dir=cache_dir,
+                           synth_chunk_size=args.synth_chunk_size,
+                           regression=args.regression,
+                           cycles=args.cycles,
+                           stimulus=args.stimulus,
+                           gate_lanes=args.gate_lanes,
+                           run_id=run_id, keep_logs=args.keep_logs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify all Verilog files")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(),
+                        help="number of parallel verification jobs")
+    parser.add_argument('--cache-dir', default=".verify_cache",
+                        help="directory of the result cache")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always rerun iverilog, vvp and yosys")
+    parser.add_argument('--synth-chunk-size', type=int, default=0,
+                        help="synthesize this many designs per Yosys process "
+                             "(0 runs one process per design)")
+    parser.add_argument('--regression', action='store_true',
+                        help="simulate all designs in one iverilog/vvp run")
+    parser.add_argument('--cycles', type=int, default=1000,
+                        help="random cycles per self-checking testbench "
+                             "(0 uses the plain smoke testbench)")
+    parser.add_argument('--stimulus', choices=("memfile", "inline"), default="memfile",
+                        help="read vectors with $readmemh or unroll them inline")
+    parser.add_argument('--gate-lanes', type=int, default=1024,
+                        help="parallel lanes for the gate-level check of each "
+                             "synthesized netlist (0 skips it)")
+    parser.add_argument('--dedup', action='store_true',
+                        help="verify one design per source/netlist equivalence class")
+    parser.add_argument('--keep-logs', action='store_true',
+                        help="write full Yosys logs for passing designs too "
+                             "(by default only failures keep their log)")
+    parser.add_argument('--no-qor', action='store_true',
+                        help="do not record synthesis results in the QoR store")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="record tool calls and file writes, write a Chrome "
+                             "trace (Perfetto) JSON to PATH and print a summary")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only rerun the stages whose inputs (sources, "
+                             "instantiated modules, testbench, tools) changed")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep polling verilog_files/ and reverify "
+                             "incrementally on every change")
+    parser.add_argument('--watch-interval', type=float, default=1.0,
+                        help="seconds between polls in --watch mode")
+    parser.add_argument('--limit', action='append', default=[],
+                        metavar='[STAGE.]FIELD=VALUE',
+                        help="override a tool limit, e.g. simulate.timeout=30 or "
+                             "output=1e6; fields are timeout and cpu (seconds), "
+                             "memory and output (bytes), 'none' disables one")
+    parser.add_argument('--waveform', action='store_true',
+                        help="stream each simulation's VCD through on-the-fly "
+                             "register assertions; the first failure is saved as "
+                             "a compressed window (synthesis_results/*_failure.vcd.gz)")
+    parser.add_argument('--waveform-window', type=int, default=waveform.DEFAULTS['before'],
+                        help="timestamps kept before the first failure "
+                             "(a quarter as many after it)")
+    parser.add_argument('--coverage-target', type=float, metavar='PCT',
+                        help="collect data_out toggle and reset/enable branch "
+                             "coverage and end each simulation once it reaches "
+                             "PCT percent (--cycles becomes the upper bound)")
+    parser.add_argument('--coverage-stall', type=int, default=sim_coverage.DEFAULTS['stall'],
+                        help="with --coverage-target, also stop after this many "
+                             "windows without new coverage (0 disables)")
+    parser.add_argument('--coverage-window', type=int,
+                        default=sim_coverage.DEFAULTS['window'],
+                        help="cycles between coverage samples")
+    parser.add_argument('--serve', metavar='HOST:PORT',
+                        help="hand the designs to distributed workers "
+                             "(python distributed.py worker http://HOST:PORT)")
+    parser.add_argument('--local-workers', type=int, default=0,
+                        help="start this many distributed workers on this machine")
+    args = parser.parse_args()
+    if args.dedup and (args.regression or args.synth_chunk_size):
+        parser.error("--dedup cannot be combined with --regression or --synth-chunk-size")
+    args.incremental = args.incremental or args.watch
+    if args.incremental and (args.dedup or args.regression or args.synth_chunk_size):
+        parser.error("--incremental/--watch cannot be combined with --dedup, "
+                     "--regression or --synth-chunk-size")
+    if (args.serve or args.local_workers) and (args.dedup or args.incremental
+                                               or args.regression or args.synth_chunk_size):
+        parser.error("--serve/--local-workers cannot be combined with --dedup, "
+                     "--incremental, --regression or --synth-chunk-size")
+    for text in args.limit:
+        try:
+            supervisor.configure(supervisor.parse_limit(text))
+        except ValueError as e:
+            parser.error(str(e))
+    supervisor.interrupt_on_sigterm()
+    if args.waveform:
+        waveform.configure({'before': args.waveform_window,
+                            'after': max(1, args.waveform_window // 4)})
+    if args.coverage_target is not None:
+        sim_coverage.configure({'target': args.coverage_target,
+                                'stall': args.coverage_stall,
+                                'window': args.coverage_window})
+
     print("\n=== Starting Verification Process ===")
-    for vfile in sorted(verilog_files):
-        print(f"\nProcessing: {vfile}")
-        print("1. Running Icarus Verilog verification...")
-        verifier.verify_with_icarus(vfile)
-        
-        print("\n2. Running Yosys synthesis...")
-        verifier.run_synthesis(vfile)
+    start = time.time()
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.trace:
+        tracing.enable()
+    run_id = None
+    if not args.no_qor:
+        store = QoRStore()
+        run_id = store.start_run()
+        store.close()
+        print(f"QoR run {run_id}")
+    results = []
+    try:
+        results = _verify_directory(args, cache_dir, run_id)
+        print_summary(results, start)
+        if args.watch:
+            print("\nWatching verilog_files/ for changes (Ctrl-C to stop)")
+            for changed in watch("verilog_files", args.watch_interval):
+                print(f"\n=== Changed: {', '.join(changed)} ===")
+                start = time.time()
+                results = _verify_directory(args, cache_dir, run_id)
+                print_summary(results, start)
+    except KeyboardInterrupt:
+        supervisor.cancel()
+        if not args.watch:
+            print("\nCancelled; running tools were killed")
+            sys.exit(130)
+        print("\nStopped watching")
+
+    if args.trace:
+        tracing.export_chrome(args.trace)
+        print(f"\n=== Trace Summary ({args.trace}) ===")
+        tracing.print_summary()
+    return results
 
 if __name__ == "__main__":
     main()
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
-import subprocess
 import os
 import sys
+from batch_synth import BatchSynthesizer
+from lint import Linter
+import tracing
+import supervisor
 
 class VerilogVerifier:
     def __init__(self):
@@ -10,40 +13,61 @@ class VerilogVerifier:
         self.synthesis_dir = "synthesis_results"
 
     def verify_syntax(self, verilog_file):
-        """Verify Verilog syntax using iverilog"""
-        cmd = ['iverilog', '-o', 'temp.out', f"{self.verilog_dir}/{verilog_file}"]
+        """Verify Verilog syntax using iverilog
+
+        Uses the lint-only null target from a scratch directory, so no
+        simulation image is written and concurrent checks do not collide.
+        """
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
+            ok, errors = Linter().check_file(f"{self.verilog_dir}/{verilog_file}")
+            if ok:
                 print(f"✓ Syntax verification passed for {verilog_file}")
                 return True
             else:
                 print(f"✗ Syntax verification failed for {verilog_file}")
-                print(f"Error: {result.stderr}")
+                print(f"Error: {errors}")
                 return False
         except Exception as e:
             print(f"Error running verification: {e}")
             return False
 
-    def verify_synthesis(self, verilog_file):
-        """Verify synthesis using Yosys"""
+    def verify_syntax_batch(self, verilog_files):
+        """Verify syntax of many files in as few iverilog runs as possible"""
+        paths = {f"{self.verilog_dir}/{vfile}": vfile for vfile in verilog_files}
+        passed = {}
+        for path, (ok, errors) in Linter().check_files(list(paths)).items():
+            vfile = paths[path]
+            passed[vfile] = ok
+            if ok:
+                print(f"✓ Syntax verification passed for {vfile}")
+            else:
+                print(f"✗ Syntax verification failed for {vfile}")
+                print(f"Error: {errors}")
+        return passed
+
+    def verify_synthesis(self, verilog_file, top="register"):
+        """Verify synthesis using Yosys
+
+        Pass top=None to let Yosys pick the top module. The netlist is
+        written per design so concurrent runs do not share an output file.
+        """
         synthesis_log = f"{self.synthesis_dir}/{verilog_file}_synthesis.log"
+        top_arg = f"-top {top}" if top else "-auto-top"
         
         # Create Yosys script
         yosys_script = f"""
         read_verilog {self.verilog_dir}/{verilog_file}
-        synth -top register
-        write_json {self.synthesis_dir}/output.json
+        synth {top_arg}
+        write_json {self.synthesis_dir}/{os.path.splitext(verilog_file)[0]}.json
         """
         
         try:
-            result = subprocess.run(['yosys', '-p', yosys_script], 
-                                  capture_output=True, text=True)
+            result = supervisor.run_tool(['yosys', '-p', yosys_script], "synthesize",
+                                         verilog_file)
             
             # Save synthesis log
             os.makedirs(self.synthesis_dir, exist_ok=True)
-            with open(synthesis_log, 'w') as f:
-                f.write(result.stdout)
+            tracing.write_file(synthesis_log, result.stdout, "log", verilog_file)
             
             if result.returncode == 0:
                 print(f"✓ Synthesis successful for {verilog_file}")
@@ -51,12 +75,32 @@ class VerilogVerifier:
                 return True
             else:
                 print(f"✗ Synthesis failed for {verilog_file}")
-                print(f"Error: {result.stderr}")
+                print(f"Error: {result.describe() if result.killed else result.stderr}")
                 return False
         except Exception as e:
             print(f"Error running synthesis: {e}")
             return False
 
+    def verify_synthesis_batch(self, verilog_files, chunk_size=16):
+        """Verify synthesis of many files using shared Yosys sessions"""
+        designs = [(os.path.splitext(vfile)[0], f"{self.verilog_dir}/{vfile}", None)
+                   for vfile in verilog_files]
+        outcomes = BatchSynthesizer(self.synthesis_dir, chunk_size).run(designs)
+
+        passed = {}
+        for vfile in verilog_files:
+            outcome = outcomes[os.path.splitext(vfile)[0]]
+            synthesis_log = f"{self.synthesis_dir}/{vfile}_synthesis.log"
+            tracing.write_file(synthesis_log, outcome['log'], "log", vfile)
+
+            passed[vfile] = outcome['ok']
+            if outcome['ok']:
+                print(f"✓ Synthesis successful for {vfile}")
+                print(f"  Log saved to {synthesis_log}")
+            else:
+                print(f"✗ Synthesis failed for {vfile}")
+        return passed
+
 def main():
     verifier = VerilogVerifier()
     
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 
-import subprocess
 import os
+from batch_synth import BatchSynthesizer
+from lint import Linter
+import tracing
+import supervisor
 
 class VerilogVerifier:
     def __init__(self):
@@ -9,12 +12,9 @@ class VerilogVerifier:
         self.synthesis_dir = "synthesis_results"
         
     def verify_compilation(self, verilog_file):
-        """Verify if the Verilog file compiles using iverilog"""
+        """Verify if the Verilog file compiles using iverilog (no output file)"""
         try:
-            result = subprocess.run(['iverilog', '-o', 'test.out', 
-                                   os.path.join(self.verilog_dir, verilog_file)],
-                                  capture_output=True, text=True)
-            return result.returncode == 0, result.stderr
+            return Linter().check_file(os.path.join(self.verilog_dir, verilog_file))
         except Exception as e:
             return False, str(e)
     
@@ -28,16 +28,34 @@ class VerilogVerifier:
             yosys_script += "synth -top test_reg; "
             yosys_script += "write_json synthetic.json"
             
-            result = subprocess.run(['yosys', '-p', yosys_script],
-                                  capture_output=True, text=True)
+            result = supervisor.run_tool(['yosys', '-p', yosys_script], "synthesize",
+                                         verilog_file)
             
-            with open(synthesis_log, 'w') as f:
-                f.write(result.stdout)
+            tracing.write_file(synthesis_log, result.stdout, "log", verilog_file)
                 
             return result.returncode == 0, synthesis_log
         except Exception as e:
             return False, str(e)
 
+    def run_synthesis_batch(self, verilog_files, chunk_size=16):
+        """Run synthesis for many files using shared Yosys sessions
+
+        Returns {verilog_file: (success, log_path)}.
+        """
+        designs = [(os.path.splitext(vfile)[0],
+                    os.path.join(self.verilog_dir, vfile), None)
+                   for vfile in verilog_files]
+        outcomes = BatchSynthesizer(self.synthesis_dir, chunk_size).run(designs)
+
+        results = {}
+        for vfile in verilog_files:
+            outcome = outcomes[os.path.splitext(vfile)[0]]
+            synthesis_log = os.path.join(self.synthesis_dir,
+                                         f"{os.path.splitext(vfile)[0]}_synthesis.log")
+            tracing.write_file(synthesis_log, outcome['log'], "log", vfile)
+            results[vfile] = (outcome['ok'], synthesis_log)
+        return results
+
 def main():
     verifier = VerilogVerifier()
     
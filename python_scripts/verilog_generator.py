@@ -3,6 +3,8 @@
 import os
 from datetime import datetime
 import random
+import itertools
+import tracing
 
 class VerilogGenerator:
     def __init__(self):
@@ -55,14 +57,78 @@ class VerilogGenerator:
         
         return module_name, "\n".join(code)
 
+    def generate_parameterized_register(self, module_name="register_param"):
+        """Generate one register module covering every variant
+
+        WIDTH, HAS_RESET and HAS_ENABLE are parameters; generate blocks
+        pick the reset and enable logic, so a single source can be
+        elaborated for any (width, reset, enable) combination. The rst_n
+        and en ports always exist and are ignored when disabled.
+        """
+        code = f"""module {module_name} #(
+    parameter WIDTH = 8,
+    parameter HAS_RESET = 1,
+    parameter HAS_ENABLE = 1
+) (
+    input wire clk,
+    input wire rst_n,
+    input wire en,
+    input wire [WIDTH-1:0] data_in,
+    output reg [WIDTH-1:0] data_out
+);
+
+    wire load;
+
+    generate
+        if (HAS_ENABLE) begin : g_enable
+            assign load = en;
+        end else begin : g_always_load
+            assign load = 1'b1;
+        end
+
+        if (HAS_RESET) begin : g_reset
+            always @(posedge clk) begin
+                if (!rst_n) begin
+                    data_out <= {{WIDTH{{1'b0}}}};
+                end else if (load) begin
+                    data_out <= data_in;
+                end
+            end
+        end else begin : g_no_reset
+            always @(posedge clk) begin
+                if (load) begin
+                    data_out <= data_in;
+                end
+            end
+        end
+    endgenerate
+
+endmodule
+"""
+        return module_name, code
+
+    def write_parameterized_register(self, module_name="register_param"):
+        """Write the parameterized register to output_dir; returns its path"""
+        module_name, verilog_code = self.generate_parameterized_register(module_name)
+        filepath = os.path.join(self.output_dir, f"{module_name}.v")
+        tracing.write_file(filepath, verilog_code, "generate", f"{module_name}.v")
+        return filepath
+
     def generate_variations(self, num_variations=3):
+        """Generate distinct register variants
+
+        Configurations are sampled without replacement, so no two
+        variations share a module (and file) name; at most one variation
+        per configuration is produced.
+        """
         variations = []
+        configurations = list(itertools.product([4, 8, 16, 32], [True, False], [True, False]))
+        if num_variations > len(configurations):
+            print(f"Only {len(configurations)} distinct configurations, "
+                  f"generating {len(configurations)} variations")
         
-        for i in range(num_variations):
-            width = random.choice([4, 8, 16, 32])
-            use_reset = random.choice([True, False])
-            use_enable = random.choice([True, False])
-            
+        for i, (width, use_reset, use_enable) in enumerate(
+                random.sample(configurations, min(num_variations, len(configurations)))):
             module_name, verilog_code = self.generate_register_variant(
                 width=width,
                 use_reset=use_reset,
@@ -73,8 +139,7 @@ class VerilogGenerator:
             filename = f"{module_name}.v"
             filepath = os.path.join(self.output_dir, filename)
             
-            with open(filepath, 'w') as f:
-                f.write(verilog_code)
+            tracing.write_file(filepath, verilog_code, "generate", filename)
             
             variations.append({
                 'filename': filename,
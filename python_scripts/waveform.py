@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import gzip
+import threading
+from collections import deque
+
+ENV_VAR = "VERILOG_WAVEFORM"
+
+# before/after: timestamps kept on each side of the first failing check
+DEFAULTS = {"before": 200, "after": 50}
+READ_SIZE = 1 << 16
+RELEASE_INTERVAL = 0.05
+
+_settings = json.loads(os.environ.get(ENV_VAR) or "null")
+
+def configure(settings):
+    """Enable waveform checking (None disables it)
+
+    settings override DEFAULTS; exported through the environment so pool
+    workers inherit it.
+    """
+    global _settings
+    _settings = None if settings is None else dict(DEFAULTS, **settings)
+    if _settings is None:
+        os.environ.pop(ENV_VAR, None)
+    else:
+        os.environ[ENV_VAR] = json.dumps(_settings)
+
+def settings():
+    return _settings
+
+def dump_block(dump_path, scope="uut"):
+    """Testbench lines that stream the DUT's signals as VCD to dump_path"""
+    return f"""
+    initial begin
+        $dumpfile("{dump_path}");
+        $dumpvars(0, {scope});
+    end
+"""
+
+def add_dump(testbench, dump_path, scope="uut"):
+    """Insert dump_block before the testbench's final endmodule"""
+    head, sep, tail = testbench.rpartition("endmodule")
+    return head + dump_block(dump_path, scope).lstrip("\n") + sep + tail
+
+def to_int(value):
+    """Integer value of a VCD bit string, None if it has x or z bits"""
+    if not value or any(bit not in "01" for bit in value):
+        return None
+    return int(value, 2)
+
+class VCDParser:
+    """Incremental VCD reader: feed() it bytes as they arrive
+
+    The header is kept verbatim until $enddefinitions. `signals` maps
+    each identifier code to its names ("scope.name"), `values` holds the
+    current value of every code as a bit string; changes are read one
+    per line, as Icarus writes them. on_time(time) is called when a
+    timestamp ends, after all of its changes were applied, and
+    on_change(code, value, line) for each change, with the raw line for
+    waveform windows. Only one partial line is buffered between feeds.
+    """
+
+    def __init__(self, on_time=None, on_change=None):
+        self.on_time = on_time
+        self.on_change = on_change
+        self.header = []
+        self.in_header = True
+        self.scope = []
+        self.signals = {}
+        self.widths = {}
+        self.values = {}
+        self.time = None
+        self.pending = b""
+
+    def feed(self, data):
+        lines = (self.pending + data).split(b"\n")
+        self.pending = lines.pop()
+        for line in lines:
+            self._line(line.decode(errors="replace").strip())
+
+    def close(self):
+        if self.pending:
+            self._line(self.pending.decode(errors="replace").strip())
+            self.pending = b""
+        if self.time is not None and self.on_time:
+            self.on_time(self.time)
+
+    def _line(self, line):
+        if not line:
+            return
+        if self.in_header:
+            self._header(line)
+        elif line[0] == "#":
+            if self.time is not None and self.on_time:
+                self.on_time(self.time)
+            self.time = int(line[1:])
+        elif line[0] in "bBrR":
+            value, code = line[1:].split()[:2]
+            self._set(code, value.lower(), line)
+        elif line[0] in "01xXzZ":
+            self._set(line[1:], line[0].lower(), line)
+        # anything else is $dumpvars / $dumpoff / $end / $comment and friends
+
+    def _header(self, line):
+        self.header.append(line)
+        words = line.split()
+        if words[0] == "$scope" and len(words) >= 3:
+            self.scope.append(words[2])
+        elif words[0] == "$upscope":
+            self.scope.pop()
+        elif words[0] == "$var" and len(words) >= 5:
+            code, name = words[3], words[4]
+            self.signals.setdefault(code, []).append(".".join(self.scope + [name]))
+            self.widths[code] = int(words[2])
+        elif words[0] == "$enddefinitions":
+            self.in_header = False
+
+    def _set(self, code, value, line):
+        width = self.widths.get(code, len(value))
+        if len(value) < width:
+            value = value.rjust(width, "0" if value[0] == "1" else value[0])
+        self.values[code] = value
+        if self.on_change:
+            self.on_change(code, value, line)
+
+class WaveformWindow:
+    """Bounded record of the last timestamps, frozen around a failure
+
+    Keeps the change lines of at most `before` timestamps plus a snapshot
+    of every value just before the oldest one, so a valid VCD can be
+    written from them at any time. After trigger(), `after` more
+    timestamps are recorded and then the window stops growing.
+    """
+
+    def __init__(self, before, after):
+        self.before = before
+        self.after = after
+        self.blocks = deque()
+        self.base = {}
+        self.remaining = None
+
+    def record(self, time, changes):
+        if self.remaining == 0:
+            return
+        self.blocks.append((time, changes))
+        if self.remaining is not None:
+            self.remaining -= 1
+        elif len(self.blocks) > self.before:
+            _, old = self.blocks.popleft()
+            for code, value, _ in old:
+                self.base[code] = value
+
+    def trigger(self):
+        if self.remaining is None:
+            self.remaining = self.after
+
+    def write(self, path, header):
+        """Write the window as a gzip-compressed VCD"""
+        with gzip.open(path, 'wt') as f:
+            f.write("\n".join(header) + "\n")
+            for i, (time, changes) in enumerate(self.blocks):
+                f.write(f"#{time}\n")
+                if i == 0:
+                    f.write("$dumpvars\n")
+                    for code, value in self.base.items():
+                        f.write(f"{value}{code}\n" if len(value) == 1
+                                else f"b{value} {code}\n")
+                    f.write("$end\n")
+                for _, _, line in changes:
+                    f.write(line + "\n")
+
+def register_assertions(has_reset, has_enable):
+    """Assertions for the register testbenches, checked at every rising clk
+
+    Each takes the inputs and data_out sampled before the edge and
+    returns (name, expected) for the value data_out must hold after it,
+    or None when it does not apply or an input is unknown.
+    """
+    def check(rst_n, en, data_in, data_out):
+        if has_reset and rst_n is None:
+            return None
+        if has_reset and rst_n == 0:
+            return "reset clears data_out", 0
+        if has_enable and en is None:
+            return None
+        if not has_enable or en == 1:
+            return ("load captures data_in", data_in) if data_in is not None else None
+        return ("hold keeps data_out", data_out) if data_out is not None else None
+    return check
+
+class WaveformMonitor:
+    """Check a simulation's VCD while it runs, through a named pipe
+
+    The simulator writes its VCD into a FIFO that a reader thread feeds
+    to VCDParser, so no dump ever reaches the disk. At every rising edge
+    of the DUT's clk the register assertion is evaluated; the first
+    failure freezes a WaveformWindow around it, which is written gzip
+    compressed to window_path. Memory is bounded by the window size.
+    Without os.mkfifo (Windows) the dump goes to a file, parsed after.
+    """
+
+    def __init__(self, dump_path, window_path, has_reset, has_enable, scope="uut",
+                 before=DEFAULTS["before"], after=DEFAULTS["after"]):
+        self.dump_path = dump_path
+        self.window_path = window_path
+        self.scope = scope
+        self.check = register_assertions(has_reset, has_enable)
+        self.window = WaveformWindow(before, after)
+        self.parser = VCDParser(self._on_time, self._on_change)
+        self.changes = []
+        self.codes = None
+        self.previous = None
+        self.checks = 0
+        self.failures = 0
+        self.first_failure = None
+        self.timestamps = 0
+        self.thread = None
+        self.error = None
+        self.streamed = hasattr(os, "mkfifo")
+
+    def start(self):
+        if os.path.exists(self.dump_path):
+            os.remove(self.dump_path)
+        if self.streamed:
+            os.mkfifo(self.dump_path)
+            self.thread = threading.Thread(target=self._read, daemon=True)
+            self.thread.start()
+        return self
+
+    def _read(self):
+        try:
+            with open(self.dump_path, 'rb') as f:
+                while True:
+                    data = f.read1(READ_SIZE)
+                    if not data:
+                        break
+                    self.parser.feed(data)
+            self.parser.close()
+        except Exception as e:
+            self.error = e
+
+    def _release(self):
+        """Unblock a reader still waiting for a writer that never came
+
+        Fails with ENXIO until the reader thread has reached open(), so
+        finish() repeats it until the thread is gone.
+        """
+        try:
+            fd = os.open(self.dump_path, os.O_WRONLY | os.O_NONBLOCK)
+            os.close(fd)
+        except OSError:
+            pass
+
+    def _port_codes(self):
+        """Identifier codes of the DUT's ports, by port name"""
+        codes = {}
+        for code, names in self.parser.signals.items():
+            for name in names:
+                scope, _, port = name.rpartition(".")
+                if scope.endswith(self.scope):
+                    codes.setdefault(port, code)
+        return codes
+
+    def _sample(self):
+        values = self.parser.values
+        return {port: values.get(code) for port, code in self.codes.items()}
+
+    def _on_change(self, code, value, line):
+        self.changes.append((code, value, line))
+
+    def _on_time(self, time):
+        self.timestamps += 1
+        self.window.record(time, self.changes)
+        self.changes = []
+        if self.codes is None:
+            self.codes = self._port_codes()
+        current = self._sample()
+        previous, self.previous = self.previous, current
+        if previous is None or 'clk' not in current or 'data_out' not in current:
+            return
+        if not (previous['clk'] == "0" and current['clk'] == "1"):
+            return
+        outcome = self.check(to_int(previous.get('rst_n')), to_int(previous.get('en')),
+                             to_int(previous.get('data_in')), to_int(previous['data_out']))
+        if outcome is None:
+            return
+        self.checks += 1
+        name, expected = outcome
+        actual = to_int(current['data_out'])
+        if actual == expected:
+            return
+        self.failures += 1
+        if self.first_failure is None:
+            self.first_failure = {'time': time, 'assertion': name,
+                                  'expected': f"{expected:x}",
+                                  'actual': current['data_out'] if actual is None
+                                  else f"{actual:x}"}
+            self.window.trigger()
+
+    def finish(self):
+        """Wait for the dump to end and return the waveform report"""
+        if self.streamed:
+            while self.thread.is_alive():
+                self._release()
+                self.thread.join(RELEASE_INTERVAL)
+            os.remove(self.dump_path)
+        elif os.path.exists(self.dump_path):
+            with open(self.dump_path, 'rb') as f:
+                while data := f.read(READ_SIZE):
+                    self.parser.feed(data)
+            self.parser.close()
+            os.remove(self.dump_path)
+        window = None
+        if self.first_failure is not None:
+            self.window.write(self.window_path, self.parser.header)
+            window = self.window_path
+        return {'timestamps': self.timestamps, 'checks': self.checks,
+                'failures': self.failures, 'first_failure': self.first_failure,
+                'window': window, 'error': str(self.error) if self.error else None}